@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 from eth_typing import Address
+from web3.types import TxReceipt
 
 from eigensdk.crypto.bls.attestation import G1Point, G2Point, Signature
 
@@ -65,3 +66,24 @@ class OperatorStateRetrieverOperator:
     operator: Address
     operator_id: bytes
     stake: int
+
+
+@dataclass
+class MulticallResult:
+    success: bool
+    # decoded return value, as ContractFunction.call() would return it
+    value: Any
+    # raw return data, the revert data of failed calls
+    return_data: bytes
+
+
+@dataclass
+class StakeUpdateChunk:
+    # quorums updated with their entire operator set by updateOperatorsForQuorum, empty
+    # for a subset of operators updated in all their quorums by updateOperators
+    quorum_numbers: List[int]
+    operators: List[Address]
+    tx_hash: Optional[bytes] = field(default=None)
+    receipt: Optional[TxReceipt] = field(default=None)
+    # set if the transaction could not be sent, was not included in time or reverted
+    error: Optional[Exception] = field(default=None)
@@ -12,6 +12,8 @@ from eigensdk._types import (
     OperatorStateRetrieverOperator,
 )
 from eigensdk.chainio import utils
+from eigensdk.chainio.logscan import LogScanner
+from eigensdk.chainio.multicall import Multicall
 from eigensdk.crypto.bls.attestation import G1Point, G2Point
 
 DEFAULT_QUERY_BLOCK_RANGE = 10_000
@@ -28,6 +30,8 @@ class AvsRegistryReader:
         stake_registry: Contract,
         logger: logging.Logger,
         eth_http_client: Web3,
+        multicall: Optional[Multicall] = None,
+        log_scanner: Optional[LogScanner] = None,
     ):
         self.logger: logging.Logger = logger
         self.bls_apk_registry_addr: Address = bls_apk_registry_addr
@@ -37,6 +41,10 @@ class AvsRegistryReader:
         self.operator_state_retriever: Contract = operator_state_retriever
         self.stake_registry: Contract = stake_registry
         self.eth_http_client: Web3 = eth_http_client
+        self.multicall: Multicall = multicall or Multicall(eth_http_client)
+        self.log_scanner: LogScanner = log_scanner or LogScanner(
+            eth_http_client, logger=logger
+        )
 
     def get_quorum_count(self) -> int:
         return self.registry_coordinator.functions.quorumCount().call()
@@ -126,16 +134,41 @@ class AvsRegistryReader:
     def get_operator_stake_in_quorums_of_operator_at_current_block(
         self, operator_id: bytes
     ) -> Dict[int, int]:
-        quorum_bitmap = self.registry_coordinator.functions.getCurrentQuorumBitmap(
-            operator_id
-        ).call()
-        quorums = utils.bitmap_to_quorum_ids(quorum_bitmap)
-        quorum_stakes: Dict[int, int] = {}
-        for quorum in quorums:
-            stake = self.stake_registry.functions.getCurrentStake(
-                operator_id, quorum
-            ).call()
-            quorum_stakes[quorum] = stake
+        return self.get_operator_stakes_in_quorums_of_operators_at_current_block(
+            [operator_id]
+        )[0]
+
+    def get_operator_stakes_in_quorums_of_operators_at_current_block(
+        self, operator_ids: List[bytes]
+    ) -> List[Dict[int, int]]:
+        # two multicalls pinned to the same block: the quorum bitmaps of all operators, then
+        # the current stake of every operator in each of its quorums
+        cur_block = self.eth_http_client.eth.block_number
+        quorum_bitmaps = self.multicall.aggregate_values(
+            [
+                self.registry_coordinator.functions.getCurrentQuorumBitmap(operator_id)
+                for operator_id in operator_ids
+            ],
+            cur_block,
+        )
+        operator_quorums = [
+            (operator_idx, quorum)
+            for operator_idx, quorum_bitmap in enumerate(quorum_bitmaps)
+            for quorum in utils.bitmap_to_quorum_ids(quorum_bitmap)
+        ]
+        stakes = self.multicall.aggregate_values(
+            [
+                self.stake_registry.functions.getCurrentStake(
+                    operator_ids[operator_idx], quorum
+                )
+                for operator_idx, quorum in operator_quorums
+            ],
+            cur_block,
+        )
+
+        quorum_stakes: List[Dict[int, int]] = [{} for _ in operator_ids]
+        for (operator_idx, quorum), stake in zip(operator_quorums, stakes):
+            quorum_stakes[operator_idx][quorum] = stake
         return quorum_stakes
 
     def get_check_signatures_indices(
@@ -174,6 +207,80 @@ class AvsRegistryReader:
         ).call()
         return operator_address
 
+    def get_operators_from_ids(
+        self, operator_ids: List[bytes], block_number: Optional[int] = None
+    ) -> List[Optional[Address]]:
+        # None for the ids whose lookup failed
+        results = self.multicall.aggregate(
+            [
+                self.registry_coordinator.functions.getOperatorFromId(operator_id)
+                for operator_id in operator_ids
+            ],
+            block_number,
+        )
+        return [result.value if result.success else None for result in results]
+
+    def get_operators_with_outdated_stakes(
+        self,
+        operators_per_quorum: List[List[Address]],
+        quorum_numbers: List[int],
+        block_number: Optional[int] = None,
+    ) -> List[List[Address]]:
+        # the operators of each quorum whose recorded stake differs from their current
+        # weight, i.e. whose stake would change if it was updated. an update records a
+        # weight below the quorum's minimum stake as 0. all reads are pinned to the same
+        # block.
+        if block_number is None:
+            block_number = self.eth_http_client.eth.block_number
+        operators = list(
+            dict.fromkeys(
+                operator
+                for quorum_operators in operators_per_quorum
+                for operator in quorum_operators
+            )
+        )
+        operator_ids = dict(
+            zip(
+                operators,
+                self.multicall.aggregate_values(
+                    [
+                        self.registry_coordinator.functions.getOperatorId(operator)
+                        for operator in operators
+                    ],
+                    block_number,
+                ),
+            )
+        )
+
+        calls = []
+        for quorum, quorum_operators in zip(quorum_numbers, operators_per_quorum):
+            calls.append(self.stake_registry.functions.minimumStakeForQuorum(quorum))
+            for operator in quorum_operators:
+                calls.append(
+                    self.stake_registry.functions.getCurrentStake(
+                        operator_ids[operator], quorum
+                    )
+                )
+                calls.append(
+                    self.stake_registry.functions.weightOfOperatorForQuorum(
+                        quorum, operator
+                    )
+                )
+        values = iter(self.multicall.aggregate_values(calls, block_number))
+
+        outdated: List[List[Address]] = []
+        for quorum_operators in operators_per_quorum:
+            quorum_outdated: List[Address] = []
+            minimum_stake = next(values)
+            for operator in quorum_operators:
+                stake, weight = next(values), next(values)
+                if weight < minimum_stake:
+                    weight = 0
+                if stake != weight:
+                    quorum_outdated.append(operator)
+            outdated.append(quorum_outdated)
+        return outdated
+
     def is_operator_registered(self, operator_address: Address) -> bool:
         operator_status = self.registry_coordinator.functions.getOperatorStatus(
             operator_address
@@ -192,33 +299,32 @@ class AvsRegistryReader:
 
         operator_pubkeys: List[OperatorPubkeys] = []
         operator_addresses: List[Address] = []
-        for i in range(start_block, stop_block + 1, block_range):
-            to_block: int = min(i + block_range - 1, stop_block)
-            pubkey_updates = (
-                self.bls_apk_registry.events.NewPubkeyRegistration.create_filter(
-                    fromBlock=i, toBlock=to_block, argument_filters={}
-                ).get_all_entries()
-            )
-            self.logger.debug(
-                "avsRegistryChainReader.query_existing_registered_operator_pubkeys",
-                extra={
-                    "numTransactionLogs": len(pubkey_updates),
-                    "fromBlock": i,
-                    "toBlock": to_block,
-                },
-            )
-            for update in pubkey_updates:
-                operator_addr = update["args"]["operator"]
-                pubkey_g1 = update["args"]["pubkeyG1"]
-                pubkey_g2 = update["args"]["pubkeyG2"]
-                operator_pubkeys.append(
-                    OperatorPubkeys(
-                        g1_pub_key=G1Point(pubkey_g1["X"], pubkey_g1["Y"]),
-                        g2_pub_key=G2Point(*pubkey_g2["X"], *pubkey_g2["Y"]),
-                    )
+        pubkey_updates = self.log_scanner.scan(
+            self.bls_apk_registry.events.NewPubkeyRegistration,
+            start_block,
+            stop_block,
+            block_range,
+        )
+        self.logger.debug(
+            "avsRegistryChainReader.query_existing_registered_operator_pubkeys",
+            extra={
+                "numTransactionLogs": len(pubkey_updates),
+                "fromBlock": start_block,
+                "toBlock": stop_block,
+            },
+        )
+        for update in pubkey_updates:
+            operator_addr = update["args"]["operator"]
+            pubkey_g1 = update["args"]["pubkeyG1"]
+            pubkey_g2 = update["args"]["pubkeyG2"]
+            operator_pubkeys.append(
+                OperatorPubkeys(
+                    g1_pub_key=G1Point(pubkey_g1["X"], pubkey_g1["Y"]),
+                    g2_pub_key=G2Point(*pubkey_g2["X"], *pubkey_g2["Y"]),
                 )
-                operator_addresses.append(operator_addr)
-        return operator_addresses, operator_pubkeys, to_block
+            )
+            operator_addresses.append(operator_addr)
+        return operator_addresses, operator_pubkeys, stop_block
 
     def query_existing_registered_operator_sockets(
         self,
@@ -230,25 +336,23 @@ class AvsRegistryReader:
             stop_block = self.eth_http_client.eth.block_number
 
         operator_id_to_socket_map: Dict[bytes, str] = {}
-        for i in range(start_block, stop_block + 1, block_range):
-            to_block = min(i + block_range - 1, stop_block)
-            socket_updates = (
-                self.registry_coordinator.events.OperatorSocketUpdate.create_filter(
-                    fromBlock=i, toBlock=to_block, argument_filters={}
-                ).get_all_entries()
-            )
-            num_socket_updates = 0
-            for update in socket_updates:
-                operator_id_to_socket_map[update["args"]["operatorId"]] = update[
-                    "args"
-                ]["socket"]
-                num_socket_updates += 1
-            self.logger.debug(
-                "avsRegistryChainReader.query_existing_registered_operator_sockets",
-                extra={
-                    "numTransactionLogs": num_socket_updates,
-                    "fromBlock": i,
-                    "toBlock": to_block,
-                },
-            )
-        return operator_id_to_socket_map, to_block
+        # logs are in block order, so the last update of an operator wins
+        socket_updates = self.log_scanner.scan(
+            self.registry_coordinator.events.OperatorSocketUpdate,
+            start_block,
+            stop_block,
+            block_range,
+        )
+        for update in socket_updates:
+            operator_id_to_socket_map[update["args"]["operatorId"]] = update["args"][
+                "socket"
+            ]
+        self.logger.debug(
+            "avsRegistryChainReader.query_existing_registered_operator_sockets",
+            extra={
+                "numTransactionLogs": len(socket_updates),
+                "fromBlock": start_block,
+                "toBlock": stop_block,
+            },
+        )
+        return operator_id_to_socket_map, stop_block
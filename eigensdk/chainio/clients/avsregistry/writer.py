@@ -1,19 +1,29 @@
 import logging
-from typing import List
+from typing import Callable, List, Optional, Tuple
 
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
 from eth_typing import Address
 from web3 import Web3
-from web3.contract.contract import Contract
+from web3.contract.contract import Contract, ContractFunction
 from web3.types import TxReceipt
 
+from eigensdk._types import StakeUpdateChunk
 from eigensdk.chainio import utils
-from eigensdk.crypto.bls.attestation import G1Point, KeyPair
+from eigensdk.crypto.bls.attestation import (
+    G1Point,
+    KeyPair,
+    g1_to_tupple,
+    g2_to_tupple,
+)
 
-from ...utils import send_transaction
+from ...txmgr import TxManager
 from ..elcontracts.reader import ELReader
+from .reader import AvsRegistryReader
 
+# gas limit of a single transaction of a chunked stake update, well below the block gas
+# limit so that several chunks can be included in the same block
+DEFAULT_MAX_GAS_PER_STAKE_UPDATE = 10_000_000
 
 class AvsRegistryWriter:
     def __init__(
@@ -27,6 +37,8 @@ class AvsRegistryWriter:
         logger: logging.Logger,
         eth_http_client: Web3,
         pk_wallet: LocalAccount,
+        tx_manager: Optional[TxManager] = None,
+        avs_registry_reader: Optional[AvsRegistryReader] = None,
     ):
         self.service_manager_addr: Address = service_manager_addr
         self.registry_coordinator: Contract = registry_coordinator
@@ -37,6 +49,11 @@ class AvsRegistryWriter:
         self.logger: logging.Logger = logger
         self.eth_http_client: Web3 = eth_http_client
         self.pk_wallet: LocalAccount = pk_wallet
+        # writers sharing a wallet should share its TxManager, so their nonces do not clash
+        self.tx_manager: TxManager = tx_manager or TxManager(
+            eth_http_client, pk_wallet, logger
+        )
+        self.avs_registry_reader: Optional[AvsRegistryReader] = avs_registry_reader
 
     def register_operator_in_quorum_with_avs_registry_coordinator(
         self,
@@ -68,24 +85,9 @@ class AvsRegistryWriter:
         )
 
         pubkey_reg_params = (
-            (
-                int(signed_msg.getX().getStr()),
-                int(signed_msg.getY().getStr()),
-            ),
-            (
-                int(bls_key_pair.pub_g1.getX().getStr()),
-                int(bls_key_pair.pub_g1.getY().getStr()),
-            ),
-            (
-                (
-                    int(bls_key_pair.pub_g2.getX().get_a().getStr()),
-                    int(bls_key_pair.pub_g2.getX().get_b().getStr()),
-                ),
-                (
-                    int(bls_key_pair.pub_g2.getY().get_a().getStr()),
-                    int(bls_key_pair.pub_g2.getY().get_b().getStr()),
-                ),
-            ),
+            g1_to_tupple(signed_msg),
+            g1_to_tupple(bls_key_pair.pub_g1),
+            g2_to_tupple(bls_key_pair.pub_g2),
         )
 
         msg_to_sign = self.el_reader.calculate_operator_avs_registration_digest_hash(
@@ -107,7 +109,7 @@ class AvsRegistryWriter:
             pubkey_reg_params,
             operator_signature_with_salt_and_expiry,
         )
-        receipt = send_transaction(func, self.pk_wallet, self.eth_http_client)
+        receipt = self.tx_manager.send_and_wait(func)
 
         self.logger.info(
             "Successfully registered operator with AVS registry coordinator",
@@ -133,7 +135,7 @@ class AvsRegistryWriter:
         func = self.registry_coordinator.functions.updateOperatorsForQuorum(
             operators_per_quorum, utils.nums_to_bytes(quorum_numbers)
         )
-        receipt = send_transaction(func, self.pk_wallet, self.eth_http_client)
+        receipt = self.tx_manager.send_and_wait(func)
 
         self.logger.info(
             "Successfully updated stakes for entire operator set",
@@ -144,6 +146,152 @@ class AvsRegistryWriter:
         )
         return receipt
 
+    def update_stakes_of_entire_operator_set_for_quorums_in_chunks(
+        self,
+        operators_per_quorum: List[List[Address]],
+        quorum_numbers: List[int],
+        max_gas_per_tx: int = DEFAULT_MAX_GAS_PER_STAKE_UPDATE,
+        skip_unchanged: bool = False,
+    ) -> List[StakeUpdateChunk]:
+        # like update_stakes_of_entire_operator_set_for_quorums, split in transactions of at
+        # most max_gas_per_tx gas that are sent with consecutive nonces without waiting for
+        # each other. quorums are grouped in updateOperatorsForQuorum calls, the operators
+        # of a quorum whose entire set does not fit in one transaction are updated by
+        # updateOperators calls on subsets instead, which do not update the quorum's update
+        # block number.
+        # with skip_unchanged, only the operators whose stake changed are updated, by
+        # updateOperators calls. the changes are read with the avs registry reader.
+        if self.pk_wallet is None:
+            raise ValueError("a wallet is required to send transactions")
+        self.logger.info(
+            "Updating stakes for entire operator set in chunks",
+            extra={"quorumNumbers": quorum_numbers, "skipUnchanged": skip_unchanged},
+        )
+
+        chunks: List[Tuple[StakeUpdateChunk, ContractFunction]] = []
+        subset_operators: List[Address] = []
+        if skip_unchanged:
+            if self.avs_registry_reader is None:
+                raise ValueError(
+                    "an AvsRegistryReader is required to skip unchanged stakes"
+                )
+            outdated = self.avs_registry_reader.get_operators_with_outdated_stakes(
+                operators_per_quorum, quorum_numbers
+            )
+            for operators in outdated:
+                subset_operators.extend(operators)
+        else:
+
+            def update_quorums(start: int, end: int) -> ContractFunction:
+                return self.registry_coordinator.functions.updateOperatorsForQuorum(
+                    operators_per_quorum[start:end],
+                    utils.nums_to_bytes(quorum_numbers[start:end]),
+                )
+
+            for start, end, fits in self.__split_by_gas(
+                len(quorum_numbers), update_quorums, max_gas_per_tx
+            ):
+                if not fits:
+                    subset_operators.extend(operators_per_quorum[start])
+                    continue
+                chunk = StakeUpdateChunk(
+                    quorum_numbers=quorum_numbers[start:end],
+                    operators=[
+                        operator
+                        for operators in operators_per_quorum[start:end]
+                        for operator in operators
+                    ],
+                )
+                chunks.append((chunk, update_quorums(start, end)))
+
+        # operators in several quorums are updated in all of them by one call
+        subset_operators = list(dict.fromkeys(subset_operators))
+
+        def update_operators(start: int, end: int) -> ContractFunction:
+            return self.registry_coordinator.functions.updateOperators(
+                subset_operators[start:end]
+            )
+
+        for start, end, _ in self.__split_by_gas(
+            len(subset_operators), update_operators, max_gas_per_tx
+        ):
+            chunk = StakeUpdateChunk(
+                quorum_numbers=[], operators=subset_operators[start:end]
+            )
+            chunks.append((chunk, update_operators(start, end)))
+
+        # all chunks are in flight before the first receipt is awaited
+        pending = []
+        for chunk, func in chunks:
+            try:
+                tx = self.tx_manager.send(func)
+            except Exception as e:
+                chunk.error = e
+                continue
+            chunk.tx_hash = tx.tx_hash
+            pending.append((chunk, tx))
+        for chunk, tx in pending:
+            try:
+                chunk.receipt = tx.receipt()
+            except Exception as e:
+                chunk.error = e
+                continue
+            if chunk.receipt["status"] == 0:
+                chunk.error = Exception(
+                    f"Transaction {chunk.receipt['transactionHash'].hex()} reverted"
+                )
+
+        for chunk, _ in chunks:
+            if chunk.error is not None:
+                self.logger.error(
+                    "Failed to update stakes of chunk",
+                    extra={
+                        "quorumNumbers": chunk.quorum_numbers,
+                        "operators": chunk.operators,
+                        "error": chunk.error,
+                    },
+                )
+            else:
+                self.logger.info(
+                    "Successfully updated stakes of chunk",
+                    extra={
+                        "txHash": chunk.receipt.transactionHash.hex(),
+                        "quorumNumbers": chunk.quorum_numbers,
+                        "operators": chunk.operators,
+                    },
+                )
+        return [chunk for chunk, _ in chunks]
+
+    def __split_by_gas(
+        self,
+        count: int,
+        make_func: Callable[[int, int], ContractFunction],
+        max_gas: int,
+    ) -> List[Tuple[int, int, bool]]:
+        # splits range(count) in the (start, end) ranges whose call make_func(start, end)
+        # needs at most max_gas, by halving the ranges that need more. a range the node
+        # fails to estimate, e.g. because it needs more than the block gas limit, does not
+        # fit either. single items that do not fit are returned with fits=False. the gas
+        # limits of each round of halving are estimated in one batch request, every range
+        # on its own, and are cached for sending.
+        ranges: List[Tuple[int, int, bool]] = []
+        pending = [(0, count)] if count else []
+        while pending:
+            gas_limits = self.tx_manager.gas_cache.estimate_each(
+                [make_func(start, end) for start, end in pending],
+                self.pk_wallet.address,
+            )
+            halves = []
+            for (start, end), gas_limit in zip(pending, gas_limits):
+                fits = gas_limit is not None and gas_limit <= max_gas
+                if fits or end - start == 1:
+                    ranges.append((start, end, fits))
+                else:
+                    middle = (start + end) // 2
+                    halves.extend([(start, middle), (middle, end)])
+            pending = halves
+        return sorted(ranges)
+
     def update_stakes_of_operator_subset_for_all_quorums(
         self, operators: List[Address]
     ) -> TxReceipt:
@@ -153,7 +301,7 @@ class AvsRegistryWriter:
         )
 
         func = self.registry_coordinator.functions.updateOperators(operators)
-        receipt = send_transaction(func, self.pk_wallet, self.eth_http_client)
+        receipt = self.tx_manager.send_and_wait(func)
 
         self.logger.info(
             "Successfully updated stakes of operator subset for all quorums",
@@ -170,7 +318,7 @@ class AvsRegistryWriter:
         func = self.registry_coordinator.functions.deregisterOperator(
             utils.nums_to_bytes(quorum_numbers)
         )
-        receipt = send_transaction(func, self.pk_wallet, self.eth_http_client)
+        receipt = self.tx_manager.send_and_wait(func)
 
         self.logger.info(
             "Successfully deregistered operator with the AVS's registry coordinator",
@@ -184,7 +332,7 @@ class AvsRegistryWriter:
             extra={"socket": socket},
         )
         func = self.registry_coordinator.functions.updateSocket(socket)
-        receipt = send_transaction(func, self.pk_wallet, self.eth_http_client)
+        receipt = self.tx_manager.send_and_wait(func)
 
         self.logger.info(
             "Successfully updated socket",
@@ -0,0 +1,168 @@
+import logging
+import unittest
+from eth_abi import decode
+from eth_account import Account
+from web3 import Web3
+from eigensdk.chainio.gascache import GasEstimateCache
+from eigensdk.chainio.txmgr import TxManager
+from eigensdk.chainio.txmgr_test import REGISTRY_COORDINATOR_ADDR, TxPoolStandIn
+from eigensdk.contracts import ABIs
+from .writer import AvsRegistryWriter
+
+UPDATE_OPERATORS_SELECTOR = Web3.keccak(text="updateOperators(address[])")[:4]
+
+
+class StakeUpdateStandIn(TxPoolStandIn):
+    # estimates 50000 gas per transaction plus 100000 gas per updated operator, like a node
+    # it rejects the estimates above the block gas limit. transactions revert if revert is set.
+    def __init__(self, block_gas_limit: int = 30_000_000) -> None:
+        super().__init__(auto_mine=True)
+        self.block_gas_limit = block_gas_limit
+        self.revert = False
+        self.estimates = []
+
+    def handle(self, method, params):
+        if method == "eth_sendRawTransaction":
+            tx_hash = super().handle(method, params)
+            if self.revert and tx_hash in self.mined:
+                self.mined[tx_hash] = (self.mined[tx_hash][0], 0)
+            return tx_hash
+        if method != "eth_estimateGas":
+            return super().handle(method, params)
+        data = bytes.fromhex(params[0]["data"][2:])
+        if data[:4] == UPDATE_OPERATORS_SELECTOR:
+            (operators,) = decode(["address[]"], data[4:])
+        else:
+            operators_per_quorum, _ = decode(["address[][]", "bytes"], data[4:])
+            operators = [o for operators in operators_per_quorum for o in operators]
+        self.estimates.append(len(operators))
+        gas = 50_000 + 100_000 * len(operators)
+        if gas > self.block_gas_limit:
+            return Exception("gas required exceeds allowance")
+        return hex(gas)
+
+
+class FakeAvsRegistryReader:
+    def __init__(self, outdated):
+        self.outdated = outdated
+
+    def get_operators_with_outdated_stakes(self, operators_per_quorum, quorum_numbers):
+        return self.outdated
+
+
+def operator(i: int) -> str:
+    return Web3.to_checksum_address(f"0x{i:040x}")
+
+
+class TestChunkedStakeUpdates(unittest.TestCase):
+    def setUp(self):
+        self.provider = StakeUpdateStandIn()
+        w3 = Web3(self.provider)
+        pk_wallet = Account.from_key("0x" + "01" * 32)
+        logger = logging.getLogger(__name__)
+        self.writer = AvsRegistryWriter(
+            service_manager_addr=None,
+            registry_coordinator=w3.eth.contract(
+                address=Web3.to_checksum_address(REGISTRY_COORDINATOR_ADDR),
+                abi=ABIs.REGISTRY_COORDINATOR,
+            ),
+            operator_state_retriever=None,
+            stake_registry=None,
+            bls_apk_registry=None,
+            el_reader=None,
+            logger=logger,
+            eth_http_client=w3,
+            pk_wallet=pk_wallet,
+            tx_manager=TxManager(
+                w3,
+                pk_wallet,
+                logger,
+                receipt_poll_interval=0.01,
+                gas_cache=GasEstimateCache(calldata_size_bucket=32),
+            ),
+        )
+        # the gas limit is 1.2 times the estimate, at most 7 operators per transaction
+        self.max_gas = 1_000_000
+
+    def test_large_quorums_are_split(self):
+        operators_per_quorum = [
+            [operator(i) for i in range(1, 4)],
+            [operator(i) for i in range(4, 6)],
+            [operator(i) for i in range(1, 13)],
+        ]
+        chunks = self.writer.update_stakes_of_entire_operator_set_for_quorums_in_chunks(
+            operators_per_quorum, [0, 1, 2], max_gas_per_tx=self.max_gas
+        )
+
+        self.assertEqual(
+            [(chunk.quorum_numbers, chunk.operators) for chunk in chunks],
+            [
+                ([0], operators_per_quorum[0]),
+                ([1], operators_per_quorum[1]),
+                ([], [operator(i) for i in range(1, 7)]),
+                ([], [operator(i) for i in range(7, 13)]),
+            ],
+        )
+        for chunk in chunks:
+            self.assertIsNone(chunk.error)
+            self.assertEqual(chunk.receipt["transactionHash"], chunk.tx_hash)
+        # the gas limits estimated while splitting are reused for sending, and the two
+        # halves of the last quorum are estimated separately
+        self.assertEqual(self.provider.estimates, [17, 3, 14, 2, 12, 12, 6, 6])
+        self.assertEqual(self.provider.nonce, 4)
+
+    def test_small_update_is_one_transaction(self):
+        chunks = self.writer.update_stakes_of_entire_operator_set_for_quorums_in_chunks(
+            [[operator(1)], [operator(1), operator(2)]],
+            [0, 1],
+            max_gas_per_tx=self.max_gas,
+        )
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].quorum_numbers, [0, 1])
+
+    def test_unchanged_operators_are_skipped(self):
+        self.writer.avs_registry_reader = FakeAvsRegistryReader(
+            [[operator(1)], [operator(1), operator(5)], []]
+        )
+        chunks = self.writer.update_stakes_of_entire_operator_set_for_quorums_in_chunks(
+            [[operator(i) for i in range(1, 4)]] * 3,
+            [0, 1, 2],
+            max_gas_per_tx=self.max_gas,
+            skip_unchanged=True,
+        )
+        self.assertEqual(
+            [(chunk.quorum_numbers, chunk.operators) for chunk in chunks],
+            [([], [operator(1), operator(5)])],
+        )
+        self.assertEqual(self.provider.estimates, [2])
+
+    def test_ranges_above_the_block_gas_limit_are_split(self):
+        """estimates the node rejects should split the range instead of failing"""
+
+        self.provider.block_gas_limit = 1_500_000
+        operators_per_quorum = [
+            [operator(i) for i in range(1, 21)],
+            [operator(i) for i in range(21, 23)],
+        ]
+        chunks = self.writer.update_stakes_of_entire_operator_set_for_quorums_in_chunks(
+            operators_per_quorum, [0, 1], max_gas_per_tx=self.max_gas
+        )
+
+        self.assertEqual(
+            [(chunk.quorum_numbers, chunk.operators) for chunk in chunks],
+            [([1], operators_per_quorum[1])]
+            + [
+                ([], [operator(i) for i in range(start, start + 5)])
+                for start in range(1, 21, 5)
+            ],
+        )
+        for chunk in chunks:
+            self.assertIsNone(chunk.error)
+
+    def test_reverted_chunk_has_error(self):
+        self.provider.revert = True
+        chunks = self.writer.update_stakes_of_entire_operator_set_for_quorums_in_chunks(
+            [[operator(1)]], [0], max_gas_per_tx=self.max_gas
+        )
+        self.assertEqual(chunks[0].receipt["status"], 0)
+        self.assertIn("reverted", str(chunks[0].error))
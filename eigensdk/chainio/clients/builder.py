@@ -4,8 +4,12 @@ from typing import Any, Tuple, Optional
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
 from eth_typing import Address
+from requests import Session
+from requests.adapters import HTTPAdapter
 from web3 import Web3
 
+from eigensdk.chainio.multicall import MULTICALL3_ADDRESS, Multicall
+from eigensdk.chainio.txmgr import TxManager
 from eigensdk.contracts import ABIs
 
 from .avsregistry import reader as avs_reader
@@ -13,6 +17,35 @@ from .avsregistry import writer as avs_writer
 from .elcontracts import reader as el_reader
 from .elcontracts import writer as el_writer
 
+# maximum number of connections kept open to the node, it should cover the concurrent
+# requests of the clients, e.g. the workers of the log scanner and the receipt watcher
+DEFAULT_HTTP_POOL_SIZE = 16
+
+# seconds to wait for a connection to the node and for a response
+DEFAULT_HTTP_CONNECT_TIMEOUT = 5.0
+DEFAULT_HTTP_READ_TIMEOUT = 30.0
+
+
+def new_eth_http_client(
+    eth_http_url: str,
+    pool_size: int = DEFAULT_HTTP_POOL_SIZE,
+    connect_timeout: float = DEFAULT_HTTP_CONNECT_TIMEOUT,
+    read_timeout: float = DEFAULT_HTTP_READ_TIMEOUT,
+) -> Web3:
+    # a Web3 client whose requests, from any thread, share one session and its pool of
+    # keep-alive connections, so they reuse warm TCP/TLS connections
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session = Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return Web3(
+        Web3.HTTPProvider(
+            eth_http_url,
+            request_kwargs={"timeout": (connect_timeout, read_timeout)},
+            session=session,
+        )
+    )
+
 
 class BuildAllConfig:
     def __init__(
@@ -22,17 +55,41 @@ class BuildAllConfig:
         operator_state_retriever_addr: Address,
         avs_name: str = '',
         prom_metrics_ip_port_address: str = '',
+        multicall_addr: Address = MULTICALL3_ADDRESS,
+        http_pool_size: int = DEFAULT_HTTP_POOL_SIZE,
+        http_connect_timeout: float = DEFAULT_HTTP_CONNECT_TIMEOUT,
+        http_read_timeout: float = DEFAULT_HTTP_READ_TIMEOUT,
     ):
         self.eth_http_url: str = eth_http_url
         self.registry_coordinator_addr: Address = registry_coordinator_addr
         self.operator_state_retriever_addr: Address = operator_state_retriever_addr
         self.avs_name: str = avs_name
         self.prom_metrics_ip_port_address: str = prom_metrics_ip_port_address
+        self.multicall_addr: Address = multicall_addr
+        self.http_pool_size: int = http_pool_size
+        self.http_connect_timeout: float = http_connect_timeout
+        self.http_read_timeout: float = http_read_timeout
+        self._eth_http_client: Optional[Web3] = None
+
+    @property
+    def eth_http_client(self) -> Web3:
+        # created on first use and shared by all the clients built from this config
+        if self._eth_http_client is None:
+            self._eth_http_client = new_eth_http_client(
+                self.eth_http_url,
+                self.http_pool_size,
+                self.http_connect_timeout,
+                self.http_read_timeout,
+            )
+        return self._eth_http_client
 
     def build_el_clients(
-        self, pk_wallet: LocalAccount, logger: logging.Logger
+        self,
+        pk_wallet: LocalAccount,
+        logger: logging.Logger,
+        tx_manager: Optional[TxManager] = None,
     ) -> Tuple[el_reader.ELReader, el_writer.ELWriter]:
-        eth_http_client = Web3(Web3.HTTPProvider(self.eth_http_url))
+        eth_http_client = self.eth_http_client
         registry_coordinator = eth_http_client.eth.contract(
             address=self.registry_coordinator_addr,
             abi=ABIs.REGISTRY_COORDINATOR,
@@ -85,6 +142,7 @@ class BuildAllConfig:
             avs_directory,
             logger,
             eth_http_client,
+            Multicall(eth_http_client, self.multicall_addr),
         )
 
         el_writer_instance = el_writer.ELWriter(
@@ -98,6 +156,7 @@ class BuildAllConfig:
             logger,
             eth_http_client,
             pk_wallet,
+            tx_manager,
         )
 
         return el_reader_instance, el_writer_instance
@@ -107,8 +166,9 @@ class BuildAllConfig:
         el_reader: el_reader.ELReader,
         logger: logging.Logger,
         pk_wallet: LocalAccount,
+        tx_manager: Optional[TxManager] = None,
     ) -> Tuple[avs_reader.AvsRegistryReader, avs_writer.AvsRegistryWriter]:
-        eth_http_client = Web3(Web3.HTTPProvider(self.eth_http_url))
+        eth_http_client = self.eth_http_client
         registry_coordinator = eth_http_client.eth.contract(
             address=self.registry_coordinator_addr,
             abi=ABIs.REGISTRY_COORDINATOR,
@@ -141,6 +201,7 @@ class BuildAllConfig:
             stake_registry,
             logger,
             eth_http_client,
+            Multicall(eth_http_client, self.multicall_addr),
         )
 
         avs_registry_writer = avs_writer.AvsRegistryWriter(
@@ -153,6 +214,8 @@ class BuildAllConfig:
             logger,
             eth_http_client,
             pk_wallet,
+            tx_manager,
+            avs_registry_reader,
         )
 
         return avs_registry_reader, avs_registry_writer
@@ -168,6 +231,7 @@ class Clients:
         eth_http_client: Web3,
         wallet: LocalAccount,
         metrics: Optional[Any],
+        tx_manager: Optional[TxManager] = None,
     ):
         self.avs_registry_reader = avs_registry_reader
         self.avs_registry_writer = avs_registry_writer
@@ -176,21 +240,25 @@ class Clients:
         self.eth_http_client = eth_http_client
         self.wallet = wallet
         self.metrics = metrics
+        self.tx_manager = tx_manager
 
 
 def build_all(
     config: BuildAllConfig, ecdsa_private_key: str = '', logger: logging.Logger = logging.getLogger(__name__)
 ) -> Clients:
-    eth_http_client = Web3(Web3.HTTPProvider(config.eth_http_url))
+    eth_http_client = config.eth_http_client
 
     pk_wallet: LocalAccount = Account.from_key(ecdsa_private_key) if ecdsa_private_key else None
 
-    el_reader, el_writer = config.build_el_clients(pk_wallet, logger)
+    # both writers send from the same wallet, they share one TxManager to track its nonce
+    tx_manager = TxManager(eth_http_client, pk_wallet, logger)
+
+    el_reader, el_writer = config.build_el_clients(pk_wallet, logger, tx_manager)
 
     (
         avs_registry_reader,
         avs_registry_writer,
-    ) = config.build_avs_registry_clients(el_reader, logger, pk_wallet)
+    ) = config.build_avs_registry_clients(el_reader, logger, pk_wallet, tx_manager)
 
     return Clients(
         avs_registry_reader=avs_registry_reader,
@@ -200,4 +268,5 @@ def build_all(
         eth_http_client=eth_http_client,
         wallet=pk_wallet,
         metrics=None,
+        tx_manager=tx_manager,
     )
@@ -0,0 +1,61 @@
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from .builder import BuildAllConfig
+
+
+class JsonRpcHandler(BaseHTTPRequestHandler):
+    # keep-alive JSON-RPC endpoint answering eth_blockNumber, it records the client port
+    # of every request
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.client_ports.append(self.client_address[1])
+        body = json.dumps(
+            {"jsonrpc": "2.0", "id": request["id"], "result": "0x10"}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestSharedEthHttpClient(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), JsonRpcHandler)
+        self.server.client_ports = []
+        thread = Thread(target=self.server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.shutdown)
+        self.config = BuildAllConfig(
+            f"http://127.0.0.1:{self.server.server_address[1]}",
+            registry_coordinator_addr="0x00000000000000000000000000000000000000c1",
+            operator_state_retriever_addr="0x00000000000000000000000000000000000000c2",
+            http_pool_size=4,
+            http_connect_timeout=1,
+            http_read_timeout=2,
+        )
+
+    def test_client_is_shared_and_pooled(self):
+        eth_http_client = self.config.eth_http_client
+        self.assertIs(self.config.eth_http_client, eth_http_client)
+        self.assertEqual(
+            eth_http_client.provider.get_request_kwargs()["timeout"], (1, 2)
+        )
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            block_numbers = list(
+                executor.map(lambda _: eth_http_client.eth.block_number, range(40))
+            )
+
+        self.assertEqual(block_numbers, [16] * 40)
+        # the connections are kept alive and reused by all threads
+        self.assertLessEqual(len(set(self.server.client_ports)), 4)
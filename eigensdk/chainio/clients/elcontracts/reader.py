@@ -1,11 +1,12 @@
 import logging
-from typing import Tuple
+from typing import Dict, List, Optional, Tuple
 
 from eth_typing import Address
 from web3 import Web3
 from web3.contract.contract import Contract
 
 from eigensdk._types import Operator
+from eigensdk.chainio.multicall import Multicall
 from eigensdk.contracts import ABIs
 
 
@@ -18,6 +19,7 @@ class ELReader:
         avs_directory: Contract,
         logger: logging.Logger,
         eth_http_client: Web3,
+        multicall: Optional[Multicall] = None,
     ):
         self.slasher: Contract = slasher
         self.delegation_manager: Contract = delegation_manager
@@ -25,6 +27,7 @@ class ELReader:
         self.avs_directory: Contract = avs_directory
         self.eth_http_client: Web3 = eth_http_client
         self.logger: logging.Logger = logger
+        self.multicall: Multicall = multicall or Multicall(eth_http_client)
 
     def is_operator_registered(self, operator_addr: Address) -> bool:
         return self.delegation_manager.functions.isOperator(operator_addr).call()
@@ -83,6 +86,35 @@ class ELReader:
             operator_addr, strategy_addr
         ).call()
 
+    def get_operators_shares_in_strategies(
+        self,
+        operator_addrs: List[Address],
+        strategy_addrs: List[Address],
+        block_number: Optional[int] = None,
+    ) -> Dict[Address, Dict[Address, int]]:
+        # shares of every operator in every strategy, read with one multicall
+        pairs = [
+            (operator_addr, strategy_addr)
+            for operator_addr in operator_addrs
+            for strategy_addr in strategy_addrs
+        ]
+        shares = self.multicall.aggregate_values(
+            [
+                self.delegation_manager.functions.operatorShares(
+                    operator_addr, strategy_addr
+                )
+                for operator_addr, strategy_addr in pairs
+            ],
+            block_number,
+        )
+
+        operators_shares: Dict[Address, Dict[Address, int]] = {
+            operator_addr: {} for operator_addr in operator_addrs
+        }
+        for (operator_addr, strategy_addr), share in zip(pairs, shares):
+            operators_shares[operator_addr][strategy_addr] = share
+        return operators_shares
+
     def calculate_delegation_approval_digest_hash(
         self,
         staker: Address,
@@ -1,5 +1,5 @@
 import logging
-from typing import Any
+from typing import Any, Optional
 
 from eth_account.signers.local import LocalAccount
 from eth_typing import Address
@@ -9,7 +9,7 @@ from web3.types import TxReceipt
 
 from eigensdk._types import Operator
 
-from ...utils import send_transaction
+from ...txmgr import TxManager
 from .reader import ELReader
 
 
@@ -25,6 +25,7 @@ class ELWriter:
         logger: logging.Logger,
         eth_http_client: Web3,
         pk_wallet: LocalAccount,
+        tx_manager: Optional[TxManager] = None,
     ):
         self.slasher: Contract = slasher
         self.delegation_manager: Contract = delegation_manager
@@ -35,6 +36,10 @@ class ELWriter:
         self.logger: logging.Logger = logger
         self.eth_http_client: Web3 = eth_http_client
         self.pk_wallet: Any = pk_wallet
+        # writers sharing a wallet should share its TxManager, so their nonces do not clash
+        self.tx_manager: TxManager = tx_manager or TxManager(
+            eth_http_client, pk_wallet, logger
+        )
 
     def register_as_operator(self, operator: Operator) -> TxReceipt:
         self.logger.info(f"Registering operator {operator.address} to EigenLayer")
@@ -50,7 +55,7 @@ class ELWriter:
         func = self.delegation_manager.functions.registerAsOperator(
             op_details, operator.metadata_url
         )
-        receipt = send_transaction(func, self.pk_wallet, self.eth_http_client)
+        receipt = self.tx_manager.send_and_wait(func)
 
         self.logger.info(
             "Transaction successfully included",
@@ -73,7 +78,7 @@ class ELWriter:
         }
         func = self.delegation_manager.functions.modifyOperatorDetails(op_details)
         try:
-            receipt = send_transaction(func, self.pk_wallet, self.eth_http_client)
+            receipt = self.tx_manager.send_and_wait(func)
         except Exception as e:
             self.logger.error(e)
             return None
@@ -89,7 +94,7 @@ class ELWriter:
         func = self.delegation_manager.functions.updateOperatorMetadataURI(
             operator.metadata_url
         )
-        receipt = send_transaction(func, self.pk_wallet, self.eth_http_client)
+        receipt = self.tx_manager.send_and_wait(func)
 
         self.logger.info(
             "Successfully updated operator metadata URI",
@@ -113,7 +118,7 @@ class ELWriter:
             self.strategy_manager_addr, amount
         )
         try:
-            send_transaction(approve_func, self.pk_wallet, self.eth_http_client)
+            self.tx_manager.send_and_wait(approve_func)
         except Exception as e:
             self.logger.error(e)
             return None
@@ -121,7 +126,7 @@ class ELWriter:
         deposit_func = self.strategy_manager.functions.depositIntoStrategy(
             strategy_addr, underlying_token_addr, amount
         )
-        receipt = send_transaction(deposit_func, self.pk_wallet, self.eth_http_client)
+        receipt = self.tx_manager.send_and_wait(deposit_func)
 
         self.logger.info(
             "Successfully deposited the token into the strategy",
@@ -0,0 +1,106 @@
+import logging
+import time
+from statistics import median_low
+from threading import Lock
+from typing import Dict, Optional
+
+from web3 import Web3
+from web3.types import TxParams
+
+# number of blocks whose priority fees are kept to compute the priority fee
+DEFAULT_FEE_HISTORY_BLOCKS = 20
+
+# seconds between two blocks, the fee history is refreshed at most once per block
+DEFAULT_BLOCK_TIME = 12.0
+
+
+class FeeOracle:
+    # FeeOracle computes the EIP-1559 fees of new transactions from a rolling cache of
+    # eth_feeHistory. the cache is refreshed at most once per block time, and a refresh
+    # only requests the blocks produced since the previous one.
+    # the priority fee is the median over the cached blocks of the given percentile of the
+    # priority fees paid in each block. the max fee leaves room for the base fee to grow
+    # for a few blocks: base_fee_multiplier * next base fee + priority fee.
+    # chains without EIP-1559 fall back to a legacy gas price, cached the same way.
+    def __init__(
+        self,
+        eth_http_client: Web3,
+        history_blocks: int = DEFAULT_FEE_HISTORY_BLOCKS,
+        priority_fee_percentile: float = 50.0,
+        base_fee_multiplier: float = 2.0,
+        min_priority_fee: int = 0,
+        block_time: float = DEFAULT_BLOCK_TIME,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.eth_http_client: Web3 = eth_http_client
+        self.history_blocks: int = history_blocks
+        self.priority_fee_percentile: float = priority_fee_percentile
+        self.base_fee_multiplier: float = base_fee_multiplier
+        self.min_priority_fee: int = min_priority_fee
+        self.block_time: float = block_time
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+
+        # block number -> priority fee at the percentile
+        self._priority_fees: Dict[int, int] = {}
+        self._next_base_fee: int = 0
+        self._newest_block: Optional[int] = None
+        self._gas_price: Optional[int] = None
+        self._refreshed_at: Optional[float] = None
+        self._lock: Lock = Lock()
+
+    def fee_params(self) -> TxParams:
+        # the fee fields of a new transaction, either maxFeePerGas and
+        # maxPriorityFeePerGas or gasPrice on chains without EIP-1559
+        with self._lock:
+            now = time.monotonic()
+            if self._refreshed_at is None or now - self._refreshed_at >= self.block_time:
+                self.__refresh(now)
+                self._refreshed_at = now
+
+            if self._gas_price is not None:
+                return {"gasPrice": self._gas_price}
+            priority_fee = max(
+                median_low(self._priority_fees.values()) if self._priority_fees else 0,
+                self.min_priority_fee,
+            )
+            return {
+                "maxPriorityFeePerGas": priority_fee,
+                "maxFeePerGas": int(self.base_fee_multiplier * self._next_base_fee)
+                + priority_fee,
+            }
+
+    def __refresh(self, now: float) -> None:
+        block_count = self.history_blocks
+        if self._newest_block is not None:
+            # only the blocks produced since the last refresh
+            elapsed_blocks = int((now - self._refreshed_at) / self.block_time) + 1
+            block_count = min(block_count, elapsed_blocks)
+
+        try:
+            fee_history = self.eth_http_client.eth.fee_history(
+                block_count, "latest", [self.priority_fee_percentile]
+            )
+        except Exception as e:
+            self.logger.warning(
+                "eth_feeHistory failed, falling back to the legacy gas price",
+                extra={"error": e},
+            )
+            fee_history = None
+        if not fee_history or not any(fee_history["baseFeePerGas"]):
+            # the chain does not support EIP-1559
+            self._gas_price = self.eth_http_client.eth.gas_price
+            return
+
+        self._gas_price = None
+        oldest_block = fee_history["oldestBlock"]
+        for i, rewards in enumerate(fee_history.get("reward") or []):
+            self._priority_fees[oldest_block + i] = rewards[0]
+        # baseFeePerGas has one more entry than the blocks, the base fee of the next block
+        self._newest_block = oldest_block + len(fee_history["baseFeePerGas"]) - 2
+        self._next_base_fee = fee_history["baseFeePerGas"][-1]
+        for block_number in [
+            b
+            for b in self._priority_fees
+            if b <= self._newest_block - self.history_blocks
+        ]:
+            del self._priority_fees[block_number]
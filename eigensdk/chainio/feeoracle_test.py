@@ -0,0 +1,83 @@
+import unittest
+from unittest import mock
+from web3 import Web3
+from .feeoracle import FeeOracle
+from .rpc_standin_test import JSONRPCStandIn
+
+
+class FeeHistoryStandIn(JSONRPCStandIn):
+    # in-process stand-in for a node serving eth_feeHistory over a chain whose blocks pay
+    # a priority fee of block number gwei
+    def __init__(self, head: int, base_fee: int = 10**10) -> None:
+        super().__init__()
+        self.head = head
+        self.base_fee = base_fee
+
+    def handle(self, method, params):
+        if method == "eth_gasPrice":
+            return hex(3 * 10**9)
+        if method != "eth_feeHistory":
+            return super().handle(method, params)
+        block_count = int(params[0], 16)
+        oldest_block = self.head - block_count + 1
+        return {
+            "oldestBlock": hex(oldest_block),
+            "baseFeePerGas": [hex(self.base_fee)] * (block_count + 1),
+            "gasUsedRatio": [0.5] * block_count,
+            "reward": [[hex(b * 10**9)] for b in range(oldest_block, self.head + 1)],
+        }
+
+
+class TestFeeOracle(unittest.TestCase):
+    def setUp(self):
+        self.provider = FeeHistoryStandIn(head=100)
+        self.oracle = FeeOracle(
+            Web3(self.provider), history_blocks=5, priority_fee_percentile=40
+        )
+        self.now = 1000.0
+        patcher = mock.patch("time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fee_history_requests(self):
+        return [p for m, p in self.provider.requests if m == "eth_feeHistory"]
+
+    def test_fees_from_history(self):
+        self.assertEqual(
+            self.oracle.fee_params(),
+            {
+                # median of blocks 96..100
+                "maxPriorityFeePerGas": 98 * 10**9,
+                "maxFeePerGas": 2 * 10**10 + 98 * 10**9,
+            },
+        )
+        self.assertEqual(self.fee_history_requests(), [(hex(5), "latest", [40])])
+
+    def test_history_is_refreshed_once_per_block(self):
+        self.oracle.fee_params()
+        self.now += 5
+        self.oracle.fee_params()
+        self.assertEqual(len(self.fee_history_requests()), 1)
+
+        # two blocks later only the new blocks are requested
+        self.now += 20
+        self.provider.head = 102
+        self.provider.base_fee = 2 * 10**10
+        self.assertEqual(
+            self.oracle.fee_params(),
+            {
+                # median of blocks 98..102
+                "maxPriorityFeePerGas": 100 * 10**9,
+                "maxFeePerGas": 4 * 10**10 + 100 * 10**9,
+            },
+        )
+        self.assertEqual(self.fee_history_requests()[-1][0], hex(3))
+        self.assertEqual(sorted(self.oracle._priority_fees), list(range(98, 103)))
+
+    def test_legacy_chain(self):
+        self.provider.base_fee = 0
+        self.assertEqual(self.oracle.fee_params(), {"gasPrice": 3 * 10**9})
+        self.oracle.fee_params()
+        self.assertEqual(
+            [m for m, _ in self.provider.requests], ["eth_feeHistory", "eth_gasPrice"]
+        )
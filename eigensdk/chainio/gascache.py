@@ -0,0 +1,153 @@
+import math
+import time
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from eth_typing import Address
+from web3.contract.contract import ContractFunction
+
+from .utils import encode_call_data
+
+# seconds a gas estimate is reused for
+DEFAULT_GAS_ESTIMATE_TTL = 60.0
+
+# the cached gas limit is the estimate times this multiplier, it covers the calls of the
+# same bucket with a larger payload or a slightly different state
+DEFAULT_GAS_SAFETY_MULTIPLIER = 1.2
+
+# calldata sizes are bucketed by this many bytes, 8 abi words
+DEFAULT_CALLDATA_SIZE_BUCKET = 256
+
+# (contract address, function selector, calldata size bucket)
+GasEstimateKey = Tuple[str, bytes, int]
+
+
+class GasEstimateCache:
+    # GasEstimateCache reuses the gas estimates of calls to the same function with a
+    # calldata of similar size, as sent periodically by keepers. the estimates missing from
+    # the cache are sent in one JSON-RPC batch request. a transaction that reverts
+    # invalidates the estimate it was sent with.
+    def __init__(
+        self,
+        ttl: float = DEFAULT_GAS_ESTIMATE_TTL,
+        safety_multiplier: float = DEFAULT_GAS_SAFETY_MULTIPLIER,
+        calldata_size_bucket: int = DEFAULT_CALLDATA_SIZE_BUCKET,
+    ):
+        self.ttl: float = ttl
+        self.safety_multiplier: float = safety_multiplier
+        self.calldata_size_bucket: int = calldata_size_bucket
+        # key -> (gas limit, expiry)
+        self._gas_limits: Dict[GasEstimateKey, Tuple[int, float]] = {}
+        self._lock: Lock = Lock()
+
+    def key(self, func: ContractFunction) -> GasEstimateKey:
+        data = encode_call_data(func)
+        return (func.address, bytes(data[:4]), len(data) // self.calldata_size_bucket)
+
+    def estimate(self, func: ContractFunction, sender: Address) -> int:
+        return self.estimate_many([func], sender)[0]
+
+    def estimate_many(
+        self, funcs: Sequence[ContractFunction], sender: Address
+    ) -> List[int]:
+        # returns the gas limit of every call. calls sharing a key are estimated once
+        keys = [self.key(func) for func in funcs]
+        gas_limits: List[Optional[int]] = [self.__get(key) for key in keys]
+
+        missing: Dict[GasEstimateKey, ContractFunction] = {}
+        for key, func, gas_limit in zip(keys, funcs, gas_limits):
+            if gas_limit is None:
+                missing.setdefault(key, func)
+        if missing:
+            try:
+                estimates = self.__estimate_gas(list(missing.values()), sender)
+            except Exception as e:
+                raise Exception(f"Gas estimation failed: {e}")
+            estimated: Dict[GasEstimateKey, int] = {}
+            for key, estimate in zip(missing, estimates):
+                estimated[key] = math.ceil(estimate * self.safety_multiplier)
+                self.__put(key, estimated[key])
+            gas_limits = [
+                gas_limit if gas_limit is not None else estimated[key]
+                for key, gas_limit in zip(keys, gas_limits)
+            ]
+        return gas_limits
+
+    def estimate_each(
+        self, funcs: Sequence[ContractFunction], sender: Address
+    ) -> List[Optional[int]]:
+        # returns the gas limit of every call, or None for the calls the node failed to
+        # estimate, e.g. because they need more gas than the block gas limit. unlike
+        # estimate_many, every call is estimated even if its key is cached or shared with
+        # another call, so calls of the same bucket with a different payload are told
+        # apart. the largest gas limit of each key is cached.
+        funcs = list(funcs)
+        estimates: Optional[List[Optional[int]]] = None
+        if len(funcs) > 1:
+            try:
+                estimates = self.__estimate_gas(funcs, sender)
+            except Exception:
+                # a single failed estimate fails the whole batch request
+                pass
+        if estimates is None:
+            estimates = [self.__try_estimate_gas(func, sender) for func in funcs]
+
+        gas_limits: List[Optional[int]] = []
+        largest: Dict[GasEstimateKey, int] = {}
+        for func, estimate in zip(funcs, estimates):
+            if estimate is None:
+                gas_limits.append(None)
+                continue
+            gas_limit = math.ceil(estimate * self.safety_multiplier)
+            gas_limits.append(gas_limit)
+            key = self.key(func)
+            largest[key] = max(largest.get(key, 0), gas_limit)
+        for key, gas_limit in largest.items():
+            self.__put(key, gas_limit)
+        return gas_limits
+
+    def invalidate(self, key: GasEstimateKey) -> None:
+        with self._lock:
+            self._gas_limits.pop(key, None)
+
+    def __estimate_gas(
+        self, funcs: List[ContractFunction], sender: Address
+    ) -> List[int]:
+        if len(funcs) == 1:
+            return [funcs[0].estimate_gas({"from": sender})]
+        w3 = funcs[0].w3
+        with w3.batch_requests() as batch:
+            for func in funcs:
+                batch.add(
+                    w3.eth.estimate_gas(
+                        {
+                            "from": sender,
+                            "to": func.address,
+                            "data": encode_call_data(func),
+                        }
+                    )
+                )
+            return batch.execute()
+
+    def __try_estimate_gas(
+        self, func: ContractFunction, sender: Address
+    ) -> Optional[int]:
+        try:
+            return func.estimate_gas({"from": sender})
+        except Exception:
+            return None
+
+    def __get(self, key: GasEstimateKey) -> Optional[int]:
+        with self._lock:
+            cached = self._gas_limits.get(key)
+            if cached is None:
+                return None
+            gas_limit, expiry = cached
+            if time.monotonic() >= expiry:
+                del self._gas_limits[key]
+                return None
+            return gas_limit
+
+    def __put(self, key: GasEstimateKey, gas_limit: int) -> None:
+        with self._lock:
+            self._gas_limits[key] = (gas_limit, time.monotonic() + self.ttl)
@@ -0,0 +1,83 @@
+import unittest
+from unittest import mock
+from web3 import Web3
+from eigensdk.contracts import ABIs
+from .gascache import GasEstimateCache
+from .rpc_standin_test import JSONRPCStandIn
+
+REGISTRY_COORDINATOR_ADDR = "0x00000000000000000000000000000000000000c1"
+SENDER = Web3.to_checksum_address("0x00000000000000000000000000000000000000a1")
+
+
+class EstimateGasStandIn(JSONRPCStandIn):
+    # in-process stand-in for a node estimating 1000 gas per calldata byte
+    def handle(self, method, params):
+        if method == "eth_chainId":
+            return "0x7a69"
+        if method != "eth_estimateGas":
+            return super().handle(method, params)
+        data = params[0]["data"]
+        return hex(1000 * (len(data) // 2 - 1))
+
+    def estimates(self) -> list:
+        # number of estimates of every round trip that requested any
+        return [
+            methods.count("eth_estimateGas")
+            for methods in self.round_trips
+            if "eth_estimateGas" in methods
+        ]
+
+
+class TestGasEstimateCache(unittest.TestCase):
+    def setUp(self):
+        self.provider = EstimateGasStandIn()
+        w3 = Web3(self.provider)
+        self.registry_coordinator = w3.eth.contract(
+            address=Web3.to_checksum_address(REGISTRY_COORDINATOR_ADDR),
+            abi=ABIs.REGISTRY_COORDINATOR,
+        )
+        self.cache = GasEstimateCache(ttl=60, safety_multiplier=1.5)
+        self.now = 1000.0
+        patcher = mock.patch("time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def update_operators(self, count: int):
+        return self.registry_coordinator.functions.updateOperators(
+            [Web3.to_checksum_address(f"0x{i + 1:040x}") for i in range(count)]
+        )
+
+    def test_estimates_are_reused_within_a_bucket(self):
+        # 4 + 64 + 32 * count calldata bytes
+        gas = self.cache.estimate(self.update_operators(2), SENDER)
+        self.assertEqual(gas, 1.5 * 1000 * 132)
+        self.assertEqual(self.cache.estimate(self.update_operators(3), SENDER), gas)
+        self.assertEqual(self.provider.estimates(), [1])
+
+        # a larger payload falls in another bucket
+        self.assertEqual(
+            self.cache.estimate(self.update_operators(8), SENDER), 1.5 * 1000 * 324
+        )
+        self.assertEqual(self.provider.estimates(), [1, 1])
+
+    def test_estimates_expire_and_are_invalidated(self):
+        func = self.update_operators(2)
+        self.cache.estimate(func, SENDER)
+        self.now += 61
+        self.cache.estimate(func, SENDER)
+        self.cache.invalidate(self.cache.key(func))
+        self.cache.estimate(func, SENDER)
+        self.assertEqual(self.provider.estimates(), [1, 1, 1])
+
+    def test_missing_estimates_are_batched(self):
+        self.cache.estimate(self.update_operators(2), SENDER)
+        gas_limits = self.cache.estimate_many(
+            [self.update_operators(n) for n in (1, 8, 9, 16, 3)], SENDER
+        )
+
+        self.assertEqual(
+            gas_limits,
+            [1.5 * 1000 * n for n in (132, 324, 324, 580, 132)],
+        )
+        # the buckets of 8 and 16 operators are estimated in one batch request
+        self.assertEqual(self.provider.estimates(), [1, 2])
@@ -0,0 +1,129 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+from eth_utils.abi import event_abi_to_log_topic
+from web3 import Web3
+from web3.contract.contract import ContractEvent
+from web3.types import EventData, LogReceipt
+
+DEFAULT_LOG_SCAN_WORKERS = 4
+DEFAULT_LOG_SCAN_BLOCK_RANGE = 10_000
+DEFAULT_LOG_SCAN_MAX_BLOCK_RANGE = 1_000_000
+# windows returning fewer logs than this are considered sparse and the window is grown
+DEFAULT_LOG_SCAN_TARGET_LOGS = 1_000
+
+# error messages nodes and providers use to reject eth_getLogs requests with too many results
+_RANGE_TOO_LARGE_ERRORS = (
+    "more than",
+    "too many",
+    "limit exceeded",
+    "response size",
+    "range is too large",
+    "range too large",
+    "block range",
+    "query timeout",
+)
+
+
+def _is_range_too_large(e: Exception) -> bool:
+    if isinstance(e.args[0] if e.args else None, dict):
+        error = e.args[0]
+        if error.get("code") == -32005:
+            return True
+        message = str(error.get("message", ""))
+    else:
+        message = str(e)
+    message = message.lower()
+    return any(pattern in message for pattern in _RANGE_TOO_LARGE_ERRORS)
+
+
+class LogScanner:
+    # LogScanner fetches the logs of an event over a block range with eth_getLogs, without
+    # installing filters. Windows are fetched concurrently by a bounded worker pool, grown on
+    # sparse ranges and split when the node rejects them for returning too many results.
+    def __init__(
+        self,
+        eth_http_client: Web3,
+        max_workers: int = DEFAULT_LOG_SCAN_WORKERS,
+        block_range: int = DEFAULT_LOG_SCAN_BLOCK_RANGE,
+        max_block_range: int = DEFAULT_LOG_SCAN_MAX_BLOCK_RANGE,
+        target_logs_per_window: int = DEFAULT_LOG_SCAN_TARGET_LOGS,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.eth_http_client: Web3 = eth_http_client
+        self.max_workers: int = max_workers
+        self.block_range: int = block_range
+        self.max_block_range: int = max_block_range
+        self.target_logs_per_window: int = target_logs_per_window
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+
+    def scan(
+        self,
+        event: ContractEvent,
+        from_block: int,
+        to_block: int,
+        block_range: Optional[int] = None,
+    ) -> List[EventData]:
+        # returns the decoded logs of from_block..to_block (inclusive) in block order
+        if from_block > to_block:
+            return []
+
+        params = {
+            "address": event.address,
+            "topics": [Web3.to_hex(event_abi_to_log_topic(event.abi))],
+        }
+        window = min(block_range or self.block_range, self.max_block_range)
+        # smallest window size the node rejected, the window never grows back to it so that
+        # providers with a hard block range cap do not reject every other request
+        rejected_window = self.max_block_range + 1
+        next_block = from_block
+        # windows that were split and still have to be fetched, before any new window
+        retry_windows: List[Tuple[int, int]] = []
+        results: Dict[int, List[LogReceipt]] = {}
+        in_flight: Dict[Future, Tuple[int, int]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while next_block <= to_block or retry_windows or in_flight:
+                while len(in_flight) < self.max_workers and (
+                    retry_windows or next_block <= to_block
+                ):
+                    if retry_windows:
+                        start, end = retry_windows.pop()
+                    else:
+                        start, end = next_block, min(next_block + window - 1, to_block)
+                        next_block = end + 1
+                    future = executor.submit(
+                        self.eth_http_client.eth.get_logs,
+                        {**params, "fromBlock": start, "toBlock": end},
+                    )
+                    in_flight[future] = (start, end)
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, end = in_flight.pop(future)
+                    try:
+                        logs = future.result()
+                    except Exception as e:
+                        if end == start or not _is_range_too_large(e):
+                            raise
+                        # split the rejected window and continue with smaller ones
+                        mid = (start + end) // 2
+                        retry_windows.append((mid + 1, end))
+                        retry_windows.append((start, mid))
+                        rejected_window = min(rejected_window, end - start + 1)
+                        window = max(1, min(window, end - start + 1) // 2)
+                        self.logger.debug(
+                            f"eth_getLogs rejected blocks {start}-{end}, window shrunk to {window}"
+                        )
+                        continue
+
+                    results[start] = logs
+                    if len(logs) < self.target_logs_per_window // 2:
+                        grown_window = min(window * 2, self.max_block_range)
+                        if grown_window < rejected_window:
+                            window = grown_window
+
+        logs = [log for start in sorted(results) for log in results[start]]
+        logs.sort(key=lambda log: (log["blockNumber"], log["logIndex"]))
+        return [event.process_log(log) for log in logs]
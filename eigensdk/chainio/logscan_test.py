@@ -0,0 +1,161 @@
+import random
+import time
+import unittest
+from eth_abi import encode
+from web3 import Web3
+from eigensdk.contracts import ABIs
+from .logscan import LogScanner
+from .rpc_standin_test import JSONRPCStandIn, RPCError
+
+REGISTRY_COORDINATOR_ADDR = "0x00000000000000000000000000000000000000c1"
+SOCKET_UPDATE_TOPIC = Web3.keccak(text="OperatorSocketUpdate(bytes32,string)")
+
+
+class GetLogsStandIn(JSONRPCStandIn):
+    # in-process stand-in for a node that serves eth_getLogs and rejects requests matching
+    # more than max_results logs, like most hosted providers do. requests spanning more than
+    # max_block_range blocks are rejected as well if it is set.
+    concurrent = True
+
+    def __init__(self, logs: list, max_results: int, max_block_range: int = None) -> None:
+        super().__init__()
+        self.logs = logs
+        self.max_results = max_results
+        self.max_block_range = max_block_range
+
+    def block_ranges(self) -> list:
+        # block ranges of the eth_getLogs requests, in request order
+        with self.lock:
+            return [
+                (int(params[0]["fromBlock"], 16), int(params[0]["toBlock"], 16))
+                for method, params in self.requests
+                if method == "eth_getLogs"
+            ]
+
+    def handle(self, method, params):
+        if method != "eth_getLogs":
+            return super().handle(method, params)
+        from_block = int(params[0]["fromBlock"], 16)
+        to_block = int(params[0]["toBlock"], 16)
+        # completion order of concurrent requests should not matter
+        time.sleep(random.random() / 1000)
+        if self.max_block_range and to_block - from_block + 1 > self.max_block_range:
+            return RPCError("block range is too large", code=-32600)
+
+        logs = [
+            log
+            for log in self.logs
+            if from_block <= int(log["blockNumber"], 16) <= to_block
+        ]
+        if len(logs) > self.max_results:
+            return RPCError(
+                f"query returned more than {self.max_results} results", code=-32005
+            )
+        return logs
+
+
+def socket_update_log(block_number: int, log_index: int, socket: str) -> dict:
+    return {
+        "address": Web3.to_checksum_address(REGISTRY_COORDINATOR_ADDR),
+        "topics": [
+            Web3.to_hex(SOCKET_UPDATE_TOPIC),
+            "0x" + f"{block_number:064x}",
+        ],
+        "data": "0x" + encode(["string"], [socket]).hex(),
+        "blockNumber": hex(block_number),
+        "logIndex": hex(log_index),
+        "transactionIndex": "0x0",
+        "transactionHash": "0x" + f"{block_number * 10 + log_index:064x}",
+        "blockHash": "0x" + f"{block_number:064x}",
+        "removed": False,
+    }
+
+
+class TestLogScanner(unittest.TestCase):
+    def setUp(self):
+        # dense cluster around block 5000, sparse elsewhere
+        self.blocks = sorted(
+            {random.Random(i).randrange(0, 20_000) for i in range(10)}
+            | set(range(5000, 5030))
+        )
+        logs = []
+        for block_number in self.blocks:
+            for log_index in range(2):
+                logs.append(
+                    socket_update_log(
+                        block_number, log_index, f"host-{block_number}:{log_index}"
+                    )
+                )
+        self.provider = GetLogsStandIn(logs, max_results=8)
+        w3 = Web3(self.provider)
+        self.registry_coordinator = w3.eth.contract(
+            address=Web3.to_checksum_address(REGISTRY_COORDINATOR_ADDR),
+            abi=ABIs.REGISTRY_COORDINATOR,
+        )
+        self.scanner = LogScanner(
+            w3, max_workers=4, block_range=1000, target_logs_per_window=8
+        )
+
+    def test_logs_are_complete_and_in_block_order(self):
+        updates = self.scanner.scan(
+            self.registry_coordinator.events.OperatorSocketUpdate, 0, 19_999
+        )
+
+        self.assertEqual(
+            [update["args"]["socket"] for update in updates],
+            [
+                f"host-{block_number}:{log_index}"
+                for block_number in self.blocks
+                for log_index in range(2)
+            ],
+        )
+        # every block was requested exactly once by an accepted request
+        accepted = sorted(
+            (start, end)
+            for start, end in self.provider.block_ranges()
+            if sum(start <= b <= end for b in self.blocks) * 2 <= 8
+        )
+        self.assertEqual(accepted[0][0], 0)
+        self.assertEqual(accepted[-1][1], 19_999)
+        for (_, end), (start, _) in zip(accepted, accepted[1:]):
+            self.assertEqual(start, end + 1)
+
+    def test_sparse_ranges_grow_the_window(self):
+        updates = self.scanner.scan(
+            self.registry_coordinator.events.OperatorSocketUpdate, 10_000, 19_999
+        )
+
+        self.assertEqual(
+            len(updates), 2 * sum(10_000 <= b <= 19_999 for b in self.blocks)
+        )
+        self.assertLess(len(self.provider.block_ranges()), 10)
+
+    def test_empty_range(self):
+        self.assertEqual(
+            self.scanner.scan(
+                self.registry_coordinator.events.OperatorSocketUpdate, 10, 9
+            ),
+            [],
+        )
+        self.assertEqual(self.provider.block_ranges(), [])
+
+    def test_window_stays_below_a_rejected_range(self):
+        """a provider capping the block range should not reject every other request"""
+
+        self.provider.max_results = 1_000
+        self.provider.max_block_range = 2_500
+        # one worker, so the windows are requested in order
+        self.scanner.max_workers = 1
+        updates = self.scanner.scan(
+            self.registry_coordinator.events.OperatorSocketUpdate, 0, 19_999
+        )
+
+        self.assertEqual(len(updates), 2 * len(self.blocks))
+        self.assertEqual(
+            [end - start + 1 for start, end in self.provider.block_ranges()[:5]],
+            [1000, 2000, 4000, 2000, 2000],
+        )
+        # the window stays below the rejected size
+        self.assertEqual(
+            {end - start + 1 for start, end in self.provider.block_ranges()[5:-1]}, {2000}
+        )
@@ -0,0 +1,120 @@
+from typing import Any, List, Optional, Sequence
+
+from eth_typing import Address
+from eth_utils.abi import get_abi_output_types
+from web3 import Web3
+from web3.contract.contract import Contract, ContractFunction
+from web3.types import BlockIdentifier
+
+from eigensdk._types import MulticallResult
+from eigensdk.contracts import ABIs
+
+from .utils import decode_return_data, encode_call_data
+
+# Multicall3 is deployed at the same address on mainnet, the testnets and most L2s
+MULTICALL3_ADDRESS = "0xcA11bde05779ba9821c4F4706fE7bB2A4Da4A4C1"
+
+# number of calls sent in one aggregate3 eth_call, larger batches are split
+DEFAULT_MULTICALL_BATCH_SIZE = 500
+
+
+class Multicall:
+    # on chains without code at multicall_addr, e.g. a plain local devnet, the calls are
+    # sent one by one instead
+    def __init__(
+        self,
+        eth_http_client: Web3,
+        multicall_addr: Address = MULTICALL3_ADDRESS,
+        batch_size: int = DEFAULT_MULTICALL_BATCH_SIZE,
+    ):
+        self.eth_http_client: Web3 = eth_http_client
+        self.batch_size: int = batch_size
+        self.multicall: Contract = eth_http_client.eth.contract(
+            address=Web3.to_checksum_address(multicall_addr), abi=ABIs.MULTICALL3
+        )
+        # whether Multicall3 is deployed, None until it is checked
+        self._deployed: Optional[bool] = None
+
+    def aggregate(
+        self,
+        calls: Sequence[ContractFunction],
+        block_identifier: Optional[BlockIdentifier] = None,
+        allow_failure: bool = True,
+    ) -> List[MulticallResult]:
+        # runs many view calls in as few eth_calls as possible. every batch is pinned to the
+        # same block, so the results are consistent even if the calls are split.
+        if not calls:
+            return []
+        if block_identifier is None:
+            block_identifier = self.eth_http_client.eth.block_number
+        if not self.deployed:
+            return [
+                self.__call(call, block_identifier, allow_failure) for call in calls
+            ]
+
+        results: List[MulticallResult] = []
+        for i in range(0, len(calls), self.batch_size):
+            batch = calls[i : i + self.batch_size]
+            return_data = self.multicall.functions.aggregate3(
+                [
+                    (call.address, allow_failure, encode_call_data(call))
+                    for call in batch
+                ]
+            ).call(block_identifier=block_identifier)
+            for call, (success, data) in zip(batch, return_data):
+                results.append(self.__decode_result(call, success, data))
+        return results
+
+    @property
+    def deployed(self) -> bool:
+        # whether there is code at the Multicall3 address, read once
+        if self._deployed is None:
+            code = self.eth_http_client.eth.get_code(self.multicall.address)
+            self._deployed = len(code) > 0
+        return self._deployed
+
+    def aggregate_values(
+        self,
+        calls: Sequence[ContractFunction],
+        block_identifier: Optional[BlockIdentifier] = None,
+    ) -> List[Any]:
+        # like aggregate, but returns the decoded values and raises if any call failed
+        results = self.aggregate(calls, block_identifier)
+        for call, result in zip(calls, results):
+            if not result.success:
+                raise ValueError(
+                    f"Multicall to {call.fn_name} at {call.address} failed: 0x{result.return_data.hex()}"
+                )
+        return [result.value for result in results]
+
+    def __call(
+        self,
+        call: ContractFunction,
+        block_identifier: BlockIdentifier,
+        allow_failure: bool,
+    ) -> MulticallResult:
+        try:
+            return_data = self.eth_http_client.eth.call(
+                {"to": call.address, "data": encode_call_data(call)}, block_identifier
+            )
+        except Exception:
+            if not allow_failure:
+                raise
+            return MulticallResult(success=False, value=None, return_data=b"")
+        return self.__decode_result(call, True, return_data)
+
+    def __decode_result(
+        self, call: ContractFunction, success: bool, return_data: bytes
+    ) -> MulticallResult:
+        if not success:
+            return MulticallResult(success=False, value=None, return_data=return_data)
+        output_types = get_abi_output_types(call.abi)
+        try:
+            normalized = decode_return_data(
+                self.eth_http_client, output_types, return_data
+            )
+        except Exception:
+            # e.g. empty return data of a call to an address without code
+            return MulticallResult(success=False, value=None, return_data=return_data)
+        value = normalized[0] if len(normalized) == 1 else list(normalized)
+        return MulticallResult(success=True, value=value, return_data=return_data)
@@ -0,0 +1,152 @@
+import logging
+import unittest
+from eth_abi import decode, encode
+from web3 import Web3
+from eigensdk.chainio.clients.elcontracts.reader import ELReader
+from eigensdk.contracts import ABIs
+from .multicall import MULTICALL3_ADDRESS, Multicall
+from .rpc_standin_test import JSONRPCStandIn, RPCError
+
+DELEGATION_MANAGER_ADDR = "0x00000000000000000000000000000000000000d1"
+
+
+class Multicall3StandIn(JSONRPCStandIn):
+    # in-process stand-in for a node with Multicall3 deployed, unless deployed is False.
+    # calls are served by python handlers keyed by (target, selector), unknown ones revert.
+    def __init__(
+        self, handlers: dict, block_number: int = 100, deployed: bool = True
+    ) -> None:
+        super().__init__()
+        self.handlers = handlers
+        self.block_number = block_number
+        self.deployed = deployed
+        self.eth_calls = []
+
+    def handle(self, method, params):
+        if method == "eth_blockNumber":
+            return hex(self.block_number)
+        if method == "eth_chainId":
+            return "0x7a69"
+        if method == "eth_getCode":
+            assert params[0].lower() == MULTICALL3_ADDRESS.lower()
+            return "0x60" if self.deployed else "0x"
+        if method != "eth_call":
+            return super().handle(method, params)
+
+        transaction, block_identifier = params
+        self.eth_calls.append(block_identifier)
+        data = bytes.fromhex(transaction["data"][2:])
+        if transaction["to"].lower() != MULTICALL3_ADDRESS.lower():
+            assert not self.deployed
+            handler = self.handlers.get((transaction["to"].lower(), data[:4]))
+            if handler is None:
+                return RPCError("execution reverted", code=3)
+            return "0x" + handler(data[4:]).hex()
+        (calls,) = decode(["(address,bool,bytes)[]"], data[4:])
+        results = []
+        for target, allow_failure, call_data in calls:
+            handler = self.handlers.get((target.lower(), call_data[:4]))
+            if handler is None:
+                if not allow_failure:
+                    return RPCError("execution reverted", code=3)
+                results.append((False, b""))
+                continue
+            results.append((True, handler(call_data[4:])))
+        return "0x" + encode(["(bool,bytes)[]"], [results]).hex()
+
+
+def operator_shares_handler(args: bytes) -> bytes:
+    operator, strategy = decode(["address", "address"], args)
+    return encode(["uint256"], [int(operator, 16) * 1000 + int(strategy, 16)])
+
+
+class TestMulticall(unittest.TestCase):
+    def setUp(self):
+        self.selector = Web3.keccak(text="operatorShares(address,address)")[:4]
+        self.provider = Multicall3StandIn(
+            {(DELEGATION_MANAGER_ADDR, self.selector): operator_shares_handler}
+        )
+        self.w3 = Web3(self.provider)
+        self.delegation_manager = self.w3.eth.contract(
+            address=Web3.to_checksum_address(DELEGATION_MANAGER_ADDR),
+            abi=ABIs.DELEGATION_MANAGER,
+        )
+        self.operators = [Web3.to_checksum_address(f"0x{i:040x}") for i in (1, 2)]
+        self.strategies = [Web3.to_checksum_address(f"0x{i:040x}") for i in (7, 8, 9)]
+
+    def test_batches_are_pinned_to_one_block(self):
+        """calls split over several eth_calls should all read the same block"""
+
+        multicall = Multicall(self.w3, batch_size=2)
+        calls = [
+            self.delegation_manager.functions.operatorShares(operator, strategy)
+            for operator in self.operators
+            for strategy in self.strategies
+        ]
+
+        values = multicall.aggregate_values(calls)
+
+        self.assertEqual(values, [1007, 1008, 1009, 2007, 2008, 2009])
+        self.assertEqual(len(self.provider.eth_calls), 3)
+        self.assertEqual(set(self.provider.eth_calls), {hex(100)})
+
+    def test_failed_calls(self):
+        multicall = Multicall(self.w3)
+        calls = [
+            self.delegation_manager.functions.operatorShares(
+                self.operators[0], self.strategies[0]
+            ),
+            # not served by the stand-in, so it reverts
+            self.delegation_manager.functions.isOperator(self.operators[0]),
+        ]
+
+        results = multicall.aggregate(calls, block_identifier=42)
+        self.assertEqual(
+            [(result.success, result.value) for result in results],
+            [(True, 1007), (False, None)],
+        )
+        self.assertEqual(self.provider.eth_calls, [hex(42)])
+        with self.assertRaises(ValueError):
+            multicall.aggregate_values(calls)
+
+    def test_calls_without_multicall3(self):
+        """calls should be sent one by one where Multicall3 is not deployed"""
+
+        self.provider.deployed = False
+        multicall = Multicall(self.w3)
+        calls = [
+            self.delegation_manager.functions.operatorShares(operator, strategy)
+            for operator in self.operators
+            for strategy in self.strategies[:2]
+        ]
+        calls.append(self.delegation_manager.functions.isOperator(self.operators[0]))
+
+        results = multicall.aggregate(calls, block_identifier=42)
+        self.assertEqual(
+            [(result.success, result.value) for result in results],
+            [(True, 1007), (True, 1008), (True, 2007), (True, 2008), (False, None)],
+        )
+        self.assertEqual(self.provider.eth_calls, [hex(42)] * 5)
+        with self.assertRaises(ValueError):
+            multicall.aggregate_values(calls)
+
+    def test_el_reader_bulk_shares(self):
+        el_reader = ELReader(
+            None,
+            self.delegation_manager,
+            None,
+            None,
+            logging.getLogger(__name__),
+            self.w3,
+        )
+
+        shares = el_reader.get_operators_shares_in_strategies(
+            self.operators, self.strategies
+        )
+
+        self.assertEqual(len(self.provider.eth_calls), 1)
+        self.assertEqual(shares[self.operators[1]][self.strategies[2]], 2009)
+        self.assertEqual(
+            {operator: len(s) for operator, s in shares.items()},
+            {operator: 3 for operator in self.operators},
+        )
@@ -0,0 +1,65 @@
+import threading
+from collections import Counter
+from web3.providers.base import JSONBaseProvider
+
+
+class RPCError(Exception):
+    # error answered with the given JSON-RPC error code
+    def __init__(self, message: str, code: int = -32000) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class JSONRPCStandIn(JSONBaseProvider):
+    # in-process stand-in for a node serving single and batch JSON-RPC requests. subclasses
+    # answer the requests in handle, which returns the result of a request or an exception
+    # to answer it with an error. every request is recorded in requests and the methods of
+    # every round trip to the node in round_trips.
+    #
+    # handle runs under lock so stand-ins can keep state without locking, the ones whose
+    # handle is thread safe set concurrent to let the client's requests overlap.
+    concurrent = False
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests = []
+        self.round_trips = []
+        self.lock = threading.RLock()
+
+    @property
+    def calls(self) -> Counter:
+        # number of requests by method
+        with self.lock:
+            return Counter(method for method, _ in self.requests)
+
+    def handle(self, method, params):
+        raise NotImplementedError(method)
+
+    def respond(self, method, params) -> dict:
+        with self.lock:
+            self.requests.append((method, params))
+        if self.concurrent:
+            result = self.handle(method, params)
+        else:
+            with self.lock:
+                result = self.handle(method, params)
+        if isinstance(result, Exception):
+            return {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "error": {
+                    "code": getattr(result, "code", -32000),
+                    "message": str(result),
+                },
+            }
+        return {"jsonrpc": "2.0", "id": 1, "result": result}
+
+    def make_request(self, method, params):
+        with self.lock:
+            self.round_trips.append([method])
+        return self.respond(method, params)
+
+    def make_batch_request(self, requests):
+        with self.lock:
+            self.round_trips.append([method for method, _ in requests])
+        return [self.respond(method, params) for method, params in requests]
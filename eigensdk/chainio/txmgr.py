@@ -0,0 +1,244 @@
+import logging
+import time
+from concurrent.futures import Future
+from threading import Lock, Thread
+from typing import Dict, List, Optional, Sequence
+
+from eth_account.signers.local import LocalAccount
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.contract.contract import ContractFunction
+from web3.exceptions import TimeExhausted, TransactionNotFound
+from web3.types import TxParams, TxReceipt
+
+from .feeoracle import FeeOracle
+from .gascache import GasEstimateCache, GasEstimateKey
+
+# seconds between two polls of the receipts of the pending transactions
+DEFAULT_RECEIPT_POLL_INTERVAL = 0.5
+
+# seconds to wait for the receipt of a transaction, same as wait_for_transaction_receipt
+DEFAULT_RECEIPT_TIMEOUT = 120
+
+
+class PendingTransaction:
+    # handle of a transaction sent by TxManager, the future is resolved with its receipt
+    # by the receipt watcher or fails with TimeExhausted if it is not included in time.
+    # the receipt of a reverted transaction resolves the future as well, with status 0.
+    def __init__(
+        self,
+        tx_hash: HexBytes,
+        nonce: int,
+        deadline: float,
+        gas_key: Optional[GasEstimateKey] = None,
+    ):
+        self.tx_hash: HexBytes = tx_hash
+        self.nonce: int = nonce
+        self.deadline: float = deadline
+        # key of the gas estimate the transaction was sent with
+        self.gas_key: Optional[GasEstimateKey] = gas_key
+        self.future: Future = Future()
+
+    def receipt(self, timeout: Optional[float] = None) -> TxReceipt:
+        return self.future.result(timeout)
+
+    def reverted(self, timeout: Optional[float] = None) -> bool:
+        # waits for the receipt like receipt()
+        return self.receipt(timeout)["status"] == 0
+
+    def done(self) -> bool:
+        return self.future.done()
+
+
+class SendManyError(Exception):
+    # raised by TxManager.send_many when a transaction could not be sent. the transactions
+    # sent before it are in flight and watched as usual, their handles are in sent. the
+    # error of the failed transaction is the cause.
+    def __init__(self, sent: List[PendingTransaction], error: Exception):
+        super().__init__(f"Sent {len(sent)} transactions before an error: {error}")
+        self.sent: List[PendingTransaction] = sent
+        self.error: Exception = error
+
+
+class TxManager:
+    # TxManager sends the transactions of one wallet without waiting for the previous ones
+    # to be included. nonces are assigned locally, so many transactions can be in flight at
+    # once, and the chain id is fetched once. the receipts of all pending transactions are
+    # polled by a single background thread, which resolves the PendingTransaction futures.
+    def __init__(
+        self,
+        eth_http_client: Web3,
+        pk_wallet: Optional[LocalAccount],
+        logger: Optional[logging.Logger] = None,
+        receipt_poll_interval: float = DEFAULT_RECEIPT_POLL_INTERVAL,
+        receipt_timeout: float = DEFAULT_RECEIPT_TIMEOUT,
+        fee_oracle: Optional[FeeOracle] = None,
+        gas_cache: Optional[GasEstimateCache] = None,
+    ):
+        self.eth_http_client: Web3 = eth_http_client
+        self.pk_wallet: Optional[LocalAccount] = pk_wallet
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self.receipt_poll_interval: float = receipt_poll_interval
+        self.receipt_timeout: float = receipt_timeout
+        self.fee_oracle: FeeOracle = fee_oracle or FeeOracle(
+            eth_http_client, logger=self.logger
+        )
+        self.gas_cache: GasEstimateCache = gas_cache or GasEstimateCache()
+
+        self._chain_id: Optional[int] = None
+        # next nonce to use, None until it is read from the node
+        self._nonce: Optional[int] = None
+        self._nonce_lock: Lock = Lock()
+
+        self._pending: Dict[HexBytes, PendingTransaction] = {}
+        self._pending_lock: Lock = Lock()
+        self._watcher: Optional[Thread] = None
+
+    @property
+    def chain_id(self) -> int:
+        if self._chain_id is None:
+            self._chain_id = self.eth_http_client.eth.chain_id
+        return self._chain_id
+
+    def send(self, func: ContractFunction) -> PendingTransaction:
+        # signs and sends the transaction and returns as soon as the node accepted it
+        if self.pk_wallet is None:
+            raise ValueError("a wallet is required to send transactions")
+
+        gas_limit = self.gas_cache.estimate(func, self.pk_wallet.address)
+        return self.__send(func, gas_limit, self.fee_oracle.fee_params())
+
+    def send_many(self, funcs: Sequence[ContractFunction]) -> List[PendingTransaction]:
+        # sends the transactions in order of nonce, their gas is estimated in one
+        # batch request. the transactions are independent, later ones do not wait for the
+        # previous ones to be included, so they must not depend on each other's effects.
+        # if a transaction can not be sent, the later ones are not sent and SendManyError
+        # carries the handles of the earlier ones.
+        if self.pk_wallet is None:
+            raise ValueError("a wallet is required to send transactions")
+
+        gas_limits = self.gas_cache.estimate_many(funcs, self.pk_wallet.address)
+        fee_params = self.fee_oracle.fee_params()
+        sent: List[PendingTransaction] = []
+        for func, gas_limit in zip(funcs, gas_limits):
+            try:
+                sent.append(self.__send(func, gas_limit, fee_params))
+            except Exception as e:
+                raise SendManyError(sent, e) from e
+        return sent
+
+    def __send(
+        self, func: ContractFunction, gas_limit: int, fee_params: TxParams
+    ) -> PendingTransaction:
+        # the lock is held until the node accepted the transaction, so the nonces reach the
+        # node in order and a rejected transaction does not leave a gap
+        with self._nonce_lock:
+            nonce = self.__next_nonce()
+            tx = func.build_transaction(
+                {
+                    "from": self.pk_wallet.address,
+                    "gas": gas_limit,
+                    "nonce": nonce,
+                    "chainId": self.chain_id,
+                    **fee_params,
+                }
+            )
+            signed_tx = self.eth_http_client.eth.account.sign_transaction(
+                tx, private_key=self.pk_wallet.key
+            )
+            try:
+                tx_hash = self.eth_http_client.eth.send_raw_transaction(
+                    signed_tx.raw_transaction
+                )
+            except Exception:
+                # the local nonce may be stale, e.g. the wallet was used by another
+                # process, read it again from the node for the next transaction
+                self._nonce = None
+                raise
+            self._nonce = nonce + 1
+
+        pending = PendingTransaction(
+            tx_hash,
+            nonce,
+            time.monotonic() + self.receipt_timeout,
+            self.gas_cache.key(func),
+        )
+        self.__watch(pending)
+        return pending
+
+    def send_and_wait(self, func: ContractFunction) -> TxReceipt:
+        return self.send(func).receipt()
+
+    def reset_nonce(self) -> None:
+        # makes the next transaction read the nonce from the node again
+        with self._nonce_lock:
+            self._nonce = None
+
+    def __next_nonce(self) -> int:
+        if self._nonce is None:
+            # pending also counts the transactions of the wallet still in the mempool
+            self._nonce = self.eth_http_client.eth.get_transaction_count(
+                self.pk_wallet.address, "pending"
+            )
+        return self._nonce
+
+    def __watch(self, pending: PendingTransaction) -> None:
+        with self._pending_lock:
+            self._pending[pending.tx_hash] = pending
+            # the watcher exits once nothing is pending and is started again on demand
+            if self._watcher is None:
+                self._watcher = Thread(target=self.__watch_receipts, daemon=True)
+                self._watcher.start()
+
+    def __watch_receipts(self) -> None:
+        while True:
+            time.sleep(self.receipt_poll_interval)
+            with self._pending_lock:
+                if not self._pending:
+                    self._watcher = None
+                    return
+                pending: List[PendingTransaction] = list(self._pending.values())
+
+            for tx in pending:
+                try:
+                    receipt = self.eth_http_client.eth.get_transaction_receipt(
+                        tx.tx_hash
+                    )
+                except Exception as e:
+                    # node errors are retried on the next poll like a missing receipt,
+                    # until the deadline has passed
+                    if time.monotonic() < tx.deadline:
+                        if not isinstance(e, TransactionNotFound):
+                            self.logger.warning(
+                                "Failed to get transaction receipt",
+                                extra={
+                                    "txHash": HexBytes(tx.tx_hash).to_0x_hex(),
+                                    "error": e,
+                                },
+                            )
+                        continue
+                    self.__resolve(
+                        tx,
+                        error=TimeExhausted(
+                            f"Transaction {HexBytes(tx.tx_hash).to_0x_hex()} is not in "
+                            f"the chain after {self.receipt_timeout} seconds"
+                        ),
+                    )
+                else:
+                    self.__resolve(tx, receipt=receipt)
+
+    def __resolve(
+        self,
+        tx: PendingTransaction,
+        receipt: Optional[TxReceipt] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        with self._pending_lock:
+            del self._pending[tx.tx_hash]
+        if receipt is not None and receipt["status"] == 0 and tx.gas_key is not None:
+            # the cached estimate may be too low or stale, estimate again next time
+            self.gas_cache.invalidate(tx.gas_key)
+        if error is not None:
+            tx.future.set_exception(error)
+        else:
+            tx.future.set_result(receipt)
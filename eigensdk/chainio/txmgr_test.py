@@ -0,0 +1,187 @@
+import unittest
+from eth_account import Account
+from web3 import Web3
+from web3.exceptions import TimeExhausted, Web3RPCError
+from eigensdk.contracts import ABIs
+from .rpc_standin_test import JSONRPCStandIn
+from .txmgr import SendManyError, TxManager
+
+REGISTRY_COORDINATOR_ADDR = "0x00000000000000000000000000000000000000c1"
+
+
+class TxPoolStandIn(JSONRPCStandIn):
+    # in-process stand-in for a node accepting raw transactions. transactions stay in the
+    # pool until the test mines them, unless auto_mine is set.
+    def __init__(self, nonce: int = 0, auto_mine: bool = False) -> None:
+        super().__init__()
+        self.nonce = nonce
+        self.auto_mine = auto_mine
+        self.pool = []
+        self.mined = {}
+        self.reject_next = False
+
+    def mine(self, status: int = 1) -> None:
+        with self.lock:
+            for tx_hash in self.pool:
+                self.mined[tx_hash] = (len(self.mined), status)
+            self.nonce += len(self.pool)
+            self.pool = []
+
+    def handle(self, method, params):
+        if method == "eth_chainId":
+            return "0x7a69"
+        if method == "eth_estimateGas":
+            return hex(50_000)
+        if method == "eth_feeHistory":
+            return {
+                "oldestBlock": "0x10",
+                "baseFeePerGas": [hex(10**9)] * 2,
+                "gasUsedRatio": [0.5],
+                "reward": [[hex(10**8)]],
+            }
+        if method == "eth_getTransactionCount":
+            assert params[1] == "pending"
+            return hex(self.nonce + len(self.pool))
+        if method == "eth_sendRawTransaction":
+            if self.reject_next:
+                self.reject_next = False
+                return Exception("nonce too low")
+            tx_hash = Web3.to_hex(Web3.keccak(hexstr=params[0]))
+            self.pool.append(tx_hash)
+            if self.auto_mine:
+                self.mined[tx_hash] = (len(self.mined), 1)
+                self.nonce += 1
+                self.pool.remove(tx_hash)
+            return tx_hash
+        if method == "eth_getTransactionReceipt":
+            if params[0] not in self.mined:
+                return None
+            return {
+                "transactionHash": params[0],
+                "transactionIndex": hex(self.mined[params[0]][0]),
+                "blockHash": "0x" + "11" * 32,
+                "blockNumber": "0x10",
+                "from": "0x" + "00" * 20,
+                "to": REGISTRY_COORDINATOR_ADDR,
+                "cumulativeGasUsed": hex(50_000),
+                "gasUsed": hex(50_000),
+                "effectiveGasPrice": hex(10**9),
+                "contractAddress": None,
+                "logs": [],
+                "logsBloom": "0x" + "00" * 256,
+                "status": hex(self.mined[params[0]][1]),
+                "type": "0x2",
+            }
+        return super().handle(method, params)
+
+
+class TestTxManager(unittest.TestCase):
+    def setUp(self):
+        self.provider = TxPoolStandIn(nonce=7)
+        w3 = Web3(self.provider)
+        self.registry_coordinator = w3.eth.contract(
+            address=Web3.to_checksum_address(REGISTRY_COORDINATOR_ADDR),
+            abi=ABIs.REGISTRY_COORDINATOR,
+        )
+        self.tx_manager = TxManager(
+            w3,
+            Account.from_key("0x" + "01" * 32),
+            receipt_poll_interval=0.01,
+            receipt_timeout=5,
+        )
+
+    def update_socket(self, socket: str):
+        return self.registry_coordinator.functions.updateSocket(socket)
+
+    def test_transactions_are_pipelined(self):
+        """many transactions should be in flight at once with consecutive nonces"""
+
+        pending = [
+            self.tx_manager.send(self.update_socket(f"host:{i}")) for i in range(5)
+        ]
+
+        self.assertEqual([tx.nonce for tx in pending], list(range(7, 12)))
+        self.assertEqual(len(self.provider.pool), 5)
+        self.assertFalse(any(tx.done() for tx in pending))
+        self.assertEqual(self.provider.calls["eth_getTransactionCount"], 1)
+        self.assertEqual(self.provider.calls["eth_feeHistory"], 1)
+
+        self.provider.mine()
+        receipts = [tx.receipt(timeout=5) for tx in pending]
+        self.assertEqual(
+            [receipt["transactionHash"] for receipt in receipts],
+            [tx.tx_hash for tx in pending],
+        )
+        self.assertEqual(self.tx_manager._pending, {})
+
+        # the watcher is started again for later transactions
+        tx = self.tx_manager.send(self.update_socket("host:5"))
+        self.assertEqual(tx.nonce, 12)
+        self.provider.mine()
+        self.assertEqual(tx.receipt(timeout=5)["status"], 1)
+
+    def test_rejected_transaction_resyncs_nonce(self):
+        self.tx_manager.send(self.update_socket("host:0"))
+        self.provider.reject_next = True
+        with self.assertRaises(Web3RPCError):
+            self.tx_manager.send(self.update_socket("host:1"))
+
+        tx = self.tx_manager.send(self.update_socket("host:1"))
+        self.assertEqual(tx.nonce, 8)
+        self.assertEqual(self.provider.calls["eth_getTransactionCount"], 2)
+
+    def test_receipt_timeout(self):
+        self.tx_manager.receipt_timeout = 0.05
+        tx = self.tx_manager.send(self.update_socket("host:0"))
+        with self.assertRaises(TimeExhausted):
+            tx.receipt(timeout=5)
+
+    def test_receipt_timeout_when_the_node_fails(self):
+        """persistent node errors should not keep a transaction pending forever"""
+
+        handle = self.provider.handle
+
+        def fail_receipts(method, params):
+            if method == "eth_getTransactionReceipt":
+                return Exception("service unavailable")
+            return handle(method, params)
+
+        self.provider.handle = fail_receipts
+        self.tx_manager.receipt_timeout = 0.05
+        tx = self.tx_manager.send(self.update_socket("host:0"))
+        with self.assertRaises(TimeExhausted):
+            tx.receipt(timeout=5)
+
+    def test_reverted_transaction_invalidates_gas_estimate(self):
+        func = self.update_socket("host:0")
+        tx = self.tx_manager.send(func)
+        self.tx_manager.send(self.update_socket("host:1"))
+        self.assertEqual(self.provider.calls["eth_estimateGas"], 1)
+
+        self.provider.mine(status=0)
+        self.assertEqual(tx.receipt(timeout=5)["status"], 0)
+        self.assertTrue(tx.reverted(timeout=5))
+        self.tx_manager.send(func)
+        self.assertEqual(self.provider.calls["eth_estimateGas"], 2)
+
+    def test_send_many_keeps_the_sent_transactions(self):
+        """a rejected transaction should not lose the handles of the ones sent before"""
+
+        handle = self.provider.handle
+
+        def reject_third(method, params):
+            if method == "eth_sendRawTransaction" and len(self.provider.pool) == 2:
+                self.provider.reject_next = True
+            return handle(method, params)
+
+        self.provider.handle = reject_third
+        with self.assertRaises(SendManyError) as cm:
+            self.tx_manager.send_many(
+                [self.update_socket(f"host:{i}") for i in range(4)]
+            )
+
+        self.assertIsInstance(cm.exception.error, Web3RPCError)
+        self.assertEqual([tx.nonce for tx in cm.exception.sent], [7, 8])
+        self.provider.mine()
+        for tx in cm.exception.sent:
+            self.assertFalse(tx.reverted(timeout=5))
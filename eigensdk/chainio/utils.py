@@ -1,6 +1,8 @@
-from typing import List
+from typing import Any, List, Sequence
 
+from eth_abi.grammar import TupleType, parse
 from eth_account.signers.local import LocalAccount
+from hexbytes import HexBytes
 from web3 import Web3
 from web3.contract.contract import ContractFunction
 # from web3.middleware.geth_poa import geth_poa_middleware
@@ -19,9 +21,44 @@ def bitmap_to_quorum_ids(bitmap: int) -> List[int]:
     return quorum_ids
 
 
+def encode_call_data(func: ContractFunction) -> HexBytes:
+    # calldata of a contract function call, from its selector and the arguments web3
+    # bound to it
+    return HexBytes(func.selector) + func.w3.codec.encode(
+        func.argument_types, func.arguments
+    )
+
+
+def decode_return_data(
+    eth_http_client: Web3, output_types: Sequence[str], return_data: bytes
+) -> List[Any]:
+    # decodes the return data of a call like ContractFunction.call does: addresses are
+    # checksummed and arrays are returned as lists
+    decoded = eth_http_client.codec.decode(output_types, return_data)
+    return [
+        _normalize_return_value(parse(output_type), value)
+        for output_type, value in zip(output_types, decoded)
+    ]
+
+
+def _normalize_return_value(abi_type, value: Any) -> Any:
+    if abi_type.is_array:
+        return [_normalize_return_value(abi_type.item_type, item) for item in value]
+    if isinstance(abi_type, TupleType):
+        return tuple(
+            _normalize_return_value(component, item)
+            for component, item in zip(abi_type.components, value)
+        )
+    if abi_type.base == "address":
+        return Web3.to_checksum_address(value)
+    return value
+
+
 def send_transaction(
     func: ContractFunction, pk_wallet: LocalAccount, eth_http_client: Web3
 ) -> TxReceipt:
+    # sends one transaction and waits for its receipt. the nonce and chain id are read
+    # for every call, use TxManager to keep many transactions of a wallet in flight.
     # try:
     #     eth_http_client.middleware_onion.inject(geth_poa_middleware, layer=0)
     # except Exception:
@@ -4,6 +4,59 @@ from eth_account import Account
 from mcl import G1, G2, GT, Fr, Fp
 from eigensdk.crypto.bn256 import utils as bn256Utils
 
+# sizes of the binary point encodings. compressed encodings are mcl's own serialization
+# (x and the sign of y), uncompressed encodings are the 32 byte big endian affine
+# coordinates in the order of the BN254.G1Point / BN254.G2Point solidity structs
+G1_COMPRESSED_SIZE = 32
+G1_UNCOMPRESSED_SIZE = 64
+G2_COMPRESSED_SIZE = 64
+G2_UNCOMPRESSED_SIZE = 128
+
+
+def _fp_to_bytes(fp: Fp) -> bytes:
+    # mcl serializes field elements as 32 little endian bytes
+    return fp.serialize()[::-1]
+
+
+def _g1_coordinates(p: G1) -> list:
+    # 32 byte big endian affine coordinates x, y, read from the serialized field elements
+    # of the normalized point. the point at infinity has zero coordinates.
+    if p.isZero():
+        return [bytes(32)] * 2
+    p = p.normalize()
+    return [_fp_to_bytes(p.getX()), _fp_to_bytes(p.getY())]
+
+
+def _g2_coordinates(p: G2) -> list:
+    # same as _g1_coordinates, in the order x.a, x.b, y.a, y.b
+    if p.isZero():
+        return [bytes(32)] * 4
+    p = p.normalize()
+    x, y = p.getX(), p.getY()
+    return [_fp_to_bytes(c) for c in (x.get_a(), x.get_b(), y.get_a(), y.get_b())]
+
+
+def _deserialize(cls, base, data: bytes):
+    point = cls.__new__(cls)
+    base.__init__(point)
+    try:
+        point.deserialize(bytes(data))
+    except Exception as e:
+        raise ValueError(f"Invalid point encoding: {e}")
+    return point
+
+
+def _check_round_trip(cls, base, point, data: bytes, to_bytes, compressed: bool):
+    # the binding ignores the return codes of deserialize and setStr, an invalid or
+    # non-canonical encoding leaves a point that does not encode back to the same bytes.
+    # coordinates are also checked against the curve: the compressed encoding only keeps
+    # x, decoding it recovers y from the curve equation.
+    if to_bytes(point, compressed) != bytes(data) or (
+        not compressed and _deserialize(cls, base, point.serialize()) != point
+    ):
+        raise ValueError("Invalid point encoding, not the encoding of a curve point")
+    return point
+
 
 def new_fp_element(v: int) -> Fp:
     fp = Fp()
@@ -27,6 +80,21 @@ class G1Point(G1):
     def verify_equivalence(self, a: "G2Point"):
         return bn256Utils.check_g1_and_g2_discrete_log_equality(self, a)
 
+    def to_bytes(self, compressed: bool = True) -> bytes:
+        return g1_to_bytes(self, compressed)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        if len(data) == G1_COMPRESSED_SIZE:
+            point = _deserialize(cls, G1, data)
+            return _check_round_trip(cls, G1, point, data, g1_to_bytes, True)
+        if len(data) == G1_UNCOMPRESSED_SIZE:
+            point = cls(
+                int.from_bytes(data[:32], "big"), int.from_bytes(data[32:], "big")
+            )
+            return _check_round_trip(cls, G1, point, data, g1_to_bytes, False)
+        raise ValueError(f"Invalid G1 point encoding length {len(data)}")
+
 def new_g1_point(x: int, y: int) -> G1Point:
     res = G1Point(x, y)
     if x == 0 and y == 0:
@@ -51,6 +119,21 @@ class G2Point(G2):
     def sub(self, a: "G2Point"):
         return self - a
 
+    def to_bytes(self, compressed: bool = True) -> bytes:
+        return g2_to_bytes(self, compressed)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        if len(data) == G2_COMPRESSED_SIZE:
+            point = _deserialize(cls, G2, data)
+            return _check_round_trip(cls, G2, point, data, g2_to_bytes, True)
+        if len(data) == G2_UNCOMPRESSED_SIZE:
+            point = cls(
+                *(int.from_bytes(data[i : i + 32], "big") for i in range(0, 128, 32))
+            )
+            return _check_round_trip(cls, G2, point, data, g2_to_bytes, False)
+        raise ValueError(f"Invalid G2 point encoding length {len(data)}")
+
 def new_g2_point(xa: int, xb: int, ya: int, yb: int) -> G2Point:
     return G2Point(xa, xb, ya, yb)
 
@@ -66,14 +149,15 @@ class GTPoint(GT):
 class Signature(G1Point):
     @staticmethod
     def from_g1_point(p: G1Point) -> "Signature":
-        x = int(p.getX().getStr())
-        y = int(p.getY().getStr())
-        return Signature(x, y)
+        # mcl points are ctypes structures, the point is copied as is without printing and
+        # parsing its coordinates
+        return Signature.from_buffer_copy(p)
 
     def to_json(self) -> dict:
+        x, y = g1_to_tupple(self)
         return {
-            'X': int(self.getX().getStr()),
-            'Y': int(self.getY().getStr()),
+            'X': x,
+            'Y': y,
         }
 
     def from_json(_json: dict) -> "Signature":
@@ -143,18 +227,28 @@ class KeyPair:
         return KeyPair(PrivateKey(bytes(private_key)))
 
     def sign_message(self, msg_bytes: bytes) -> Signature:
-        h = bn256Utils.map_to_curve(msg_bytes)
+        h = bn256Utils.map_to_curve_cached(msg_bytes)
         return self.sign_hashed_to_curve_message(h)
 
     def sign_hashed_to_curve_message(self, msg_map_point: G1Point) -> Signature:
-        sig = (msg_map_point * self.priv_key).normalize()
-        return Signature.from_g1_point(sig)
+        return Signature.from_g1_point(msg_map_point * self.priv_key)
+
+    def sign_many(self, messages: list) -> list:
+        # signs every message, mapping each distinct message to the curve once
+        msg_map_points = {}
+        signatures = []
+        for msg_bytes in messages:
+            key = bytes(msg_bytes)
+            if key not in msg_map_points:
+                msg_map_points[key] = bn256Utils.map_to_curve_cached(key)
+            signatures.append(self.sign_hashed_to_curve_message(msg_map_points[key]))
+        return signatures
 
     def get_pub_g1(self) -> G1Point:
-        return bn256Utils.mul_by_generator_g1(self)
+        return self.pub_g1
 
     def get_pub_g2(self) -> G2Point:
-        return bn256Utils.mul_by_generator_g2(self.priv_key)
+        return self.pub_g2
 
 
 def new_key_pair(priv_key: PrivateKey) -> KeyPair:
@@ -169,13 +263,46 @@ def gen_random_bls_keys() -> KeyPair:
     return KeyPair()
 
 def g1_to_tupple(g1):
-    return (int(g1.getX().getStr()), int(g1.getY().getStr()))
+    x, y = (int.from_bytes(c, "big") for c in _g1_coordinates(g1))
+    return (x, y)
 
 def g2_to_tupple(g2):
-    return ((
-        int(g2.getX().get_a().getStr()),
-        int(g2.getX().get_b().getStr()),
-    ), (
-        int(g2.getY().get_a().getStr()),
-        int(g2.getY().get_b().getStr()),
-    ))
+    xa, xb, ya, yb = (int.from_bytes(c, "big") for c in _g2_coordinates(g2))
+    return ((xa, xb), (ya, yb))
+
+def g1_to_bytes(p: G1, compressed: bool = True) -> bytes:
+    if compressed:
+        return p.serialize()
+    return b"".join(_g1_coordinates(p))
+
+def g2_to_bytes(p: G2, compressed: bool = True) -> bytes:
+    if compressed:
+        return p.serialize()
+    xa, xb, ya, yb = _g2_coordinates(p)
+    # BN254.G2Point holds the imaginary part of each coordinate first
+    return xb + xa + yb + ya
+
+# batch encodings are the concatenation of the encodings of the points
+def g1_points_to_bytes(points: list, compressed: bool = True) -> bytes:
+    return b"".join(g1_to_bytes(p, compressed) for p in points)
+
+def g2_points_to_bytes(points: list, compressed: bool = True) -> bytes:
+    return b"".join(g2_to_bytes(p, compressed) for p in points)
+
+def _split(data: bytes, size: int) -> list:
+    if len(data) % size:
+        raise ValueError(f"Encoding length {len(data)} is not a multiple of {size}")
+    view = memoryview(data)
+    return [view[i : i + size] for i in range(0, len(data), size)]
+
+def g1_points_from_bytes(data: bytes, compressed: bool = True) -> list:
+    size = G1_COMPRESSED_SIZE if compressed else G1_UNCOMPRESSED_SIZE
+    return [G1Point.from_bytes(chunk) for chunk in _split(data, size)]
+
+def g2_points_from_bytes(data: bytes, compressed: bool = True) -> list:
+    size = G2_COMPRESSED_SIZE if compressed else G2_UNCOMPRESSED_SIZE
+    return [G2Point.from_bytes(chunk) for chunk in _split(data, size)]
+
+def signatures_from_bytes(data: bytes, compressed: bool = True) -> list:
+    size = G1_COMPRESSED_SIZE if compressed else G1_UNCOMPRESSED_SIZE
+    return [Signature.from_bytes(chunk) for chunk in _split(data, size)]
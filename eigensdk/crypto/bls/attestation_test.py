@@ -1,5 +1,7 @@
 import unittest
+from eigensdk.crypto.bls import attestation
 from eigensdk.crypto.bls.attestation import KeyPair, PrivateKey
+from eigensdk.crypto.bn256 import utils as bn256Utils
 
 
 class TestAttestation(unittest.TestCase):
@@ -25,3 +27,114 @@ class TestAttestation(unittest.TestCase):
         key_pair.save_to_file(path_to_save, password)
         kp2 = KeyPair.read_from_file(path_to_save, password)
         self.assertEqual(priv_key_str, kp2.priv_key.get_str())
+
+    def test_pub_keys_match_generator_multiples(self):
+        """public keys should be the private key times the shared generators"""
+
+        key_pair = KeyPair.from_string("0123456789abcdef")
+        self.assertEqual(
+            key_pair.get_pub_g1(), bn256Utils.get_g1_generator() * key_pair.priv_key
+        )
+        self.assertEqual(
+            key_pair.get_pub_g2(), bn256Utils.get_g2_generator() * key_pair.priv_key
+        )
+        # the getters return copies, mutating one leaves the shared generators intact
+        g1 = bn256Utils.get_g1_generator()
+        self.assertIsNot(g1, bn256Utils.get_g1_generator())
+        g1.setStr(b"0")
+        self.assertEqual(
+            key_pair.get_pub_g1(), bn256Utils.get_g1_generator() * key_pair.priv_key
+        )
+        self.assertTrue(
+            bn256Utils.check_g1_and_g2_discrete_log_equality(
+                key_pair.pub_g1, key_pair.pub_g2
+            )
+        )
+
+    def test_binary_encodings_round_trip(self):
+        """points should survive compressed and uncompressed binary encodings"""
+
+        key_pair = KeyPair.from_string("0123456789abcdef")
+        sig = key_pair.sign_message(b"\x01" * 32)
+        for compressed, g1_size, g2_size in ((True, 32, 64), (False, 64, 128)):
+            g1 = attestation.g1_to_bytes(key_pair.pub_g1, compressed)
+            g2 = attestation.g2_to_bytes(key_pair.pub_g2, compressed)
+            self.assertEqual((len(g1), len(g2)), (g1_size, g2_size))
+            self.assertEqual(attestation.G1Point.from_bytes(g1), key_pair.pub_g1)
+            self.assertEqual(attestation.G2Point.from_bytes(g2), key_pair.pub_g2)
+
+            sigs = [sig, -sig, attestation.new_zero_signature()]
+            decoded = attestation.signatures_from_bytes(
+                attestation.g1_points_to_bytes(sigs, compressed), compressed
+            )
+            self.assertEqual(decoded, sigs)
+            self.assertIsInstance(decoded[0], attestation.Signature)
+            self.assertEqual(
+                attestation.g2_points_from_bytes(
+                    attestation.g2_points_to_bytes([key_pair.pub_g2] * 2, compressed),
+                    compressed,
+                ),
+                [key_pair.pub_g2] * 2,
+            )
+
+    def test_uncompressed_encoding_is_abi_layout(self):
+        """uncompressed encodings should hold the coordinates of the solidity structs"""
+
+        key_pair = KeyPair.from_string("0123456789abcdef")
+        x, y = attestation.g1_to_tupple(key_pair.pub_g1)
+        self.assertEqual(x, int(key_pair.pub_g1.getX().getStr()))
+        self.assertEqual(
+            attestation.g1_to_bytes(key_pair.pub_g1, compressed=False),
+            x.to_bytes(32, "big") + y.to_bytes(32, "big"),
+        )
+        (xa, xb), (ya, yb) = attestation.g2_to_tupple(key_pair.pub_g2)
+        self.assertEqual(xb, int(key_pair.pub_g2.getX().get_b().getStr()))
+        self.assertEqual(
+            attestation.g2_to_bytes(key_pair.pub_g2, compressed=False),
+            b"".join(c.to_bytes(32, "big") for c in (xb, xa, yb, ya)),
+        )
+        with self.assertRaises(ValueError):
+            attestation.G1Point.from_bytes(b"\x00" * 33)
+
+    def test_invalid_encodings_are_rejected(self):
+        """encodings that do not decode to the same point should raise"""
+
+        key_pair = KeyPair.from_string("0123456789abcdef")
+        # x^3 + 3 has no square root in F_p for x = 4
+        not_on_curve = (4).to_bytes(32, "big")
+        # x = p + 1 is not a canonical field element
+        non_canonical = (bn256Utils._FP_MODULUS + 1).to_bytes(32, "big")
+        for data in (not_on_curve, non_canonical):
+            with self.assertRaises(ValueError):
+                attestation.G1Point.from_bytes(data)
+        with self.assertRaises(ValueError):
+            attestation.G1Point.from_bytes(not_on_curve + (1).to_bytes(32, "big"))
+        g2 = bytearray(attestation.g2_to_bytes(key_pair.pub_g2, compressed=False))
+        g2[-1] ^= 1
+        with self.assertRaises(ValueError):
+            attestation.G2Point.from_bytes(bytes(g2))
+
+    def test_sign_many(self):
+        """batch signing should match signing each message"""
+
+        key_pair = KeyPair.from_string("0123456789abcdef")
+        messages = [b"\x01" * 32, b"\x02" * 32, b"\x01" * 32]
+        signatures = key_pair.sign_many(messages)
+
+        self.assertEqual(signatures, [key_pair.sign_message(m) for m in messages])
+        for signature, message in zip(signatures, messages):
+            self.assertIsInstance(signature, attestation.Signature)
+            self.assertTrue(signature.verify(key_pair.pub_g2, message))
+        self.assertEqual(
+            attestation.Signature.from_g1_point(signatures[0]), signatures[0]
+        )
+
+    def test_signature_is_the_product_of_the_message_point(self):
+        key_pair = KeyPair.from_string("0123456789abcdef")
+        msg_bytes = b"\x01" * 32
+        msg_map_point = bn256Utils.map_to_curve_cached(msg_bytes)
+
+        signature = key_pair.sign_hashed_to_curve_message(msg_map_point)
+        self.assertIsInstance(signature, attestation.Signature)
+        self.assertEqual(signature, msg_map_point * key_pair.priv_key)
+        self.assertTrue(signature.verify(key_pair.pub_g2, msg_bytes))
@@ -1,3 +1,9 @@
+import ctypes
+import secrets
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
 from mcl import G1, G2, GT, Fr
 
 # modulus for the underlying field F_p of the elliptic curve
@@ -12,39 +18,202 @@ _G2_XB = 0x1800deef121f1e76426a00665e5c4479674322d4f75edadd46debd5cd992f6ed
 _G2_YA = 0x090689d0585ff075ec9e99ad690c3395bc4b313370b38ef355acdadcd122975b
 _G2_YB = 0x12c85ea5db8c6deb4aab71808dcb408fe3d1e7690c43d37b4ce6cc0166fa7daa
 
+# (p + 1) / 4, since p = 3 mod 4 beta^((p + 1) / 4) is a square root of beta when one exists
+_SQRT_EXPONENT = 0xc19139cb84c680a6e14116da060561765e05aa45a1c72a34f082305b61f3f52
+
+# bit length of the random coefficients used by batch verification. a forged
+# signature passes a batch check with probability at most 2^-_BATCH_SCALAR_BITS
+_BATCH_SCALAR_BITS = 128
+
+# default number of message digests kept by the hash-to-curve cache
+_MAP_TO_CURVE_CACHE_SIZE = 1024
+
 def __addmod(a, b, m):
   return (a + b) % m
 
 def __mulmod(a, b, m):
   return(a * b) % m
 
-def __expmod(a, b, m):
-  result = 1
-  base = a
-  _b = b
-  while _b > 0:
-    # Check the least significant bit (LSB) of b
-    if _b & 1:
-      result = (result * base) % m
-    # Right shift b by 1 (effectively dividing by 2, discarding the remainder)
-    _b >>= 1
-    # Square the base for the next iteration (efficient for repeated multiplication)
-    base = (base * base) % m
-  return result
-
 def __g1_point(x: int, y: int) -> G1:
   res = G1()
   res.setStr(f"1 {x} {y}".encode("utf-8"))
   return res
 
+class HashToCurveCache:
+  # bounded LRU cache of message digest -> G1 point. every operator signs the same task
+  # digest, so the try-and-increment mapping only needs to run once per task.
+  # cached points are shared between callers and must not be mutated in place.
+  def __init__(self, maxsize: int = _MAP_TO_CURVE_CACHE_SIZE):
+    self.maxsize = maxsize
+    self.hits = 0
+    self.misses = 0
+    self._points: 'OrderedDict[bytes, G1]' = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, msg_bytes: bytes) -> G1:
+    key = bytes(msg_bytes)
+    with self._lock:
+      point = self._points.get(key)
+      if point is not None:
+        self._points.move_to_end(key)
+        self.hits += 1
+        return point
+      self.misses += 1
+
+    point = map_to_curve(key)
+    with self._lock:
+      self._points[key] = point
+      self._points.move_to_end(key)
+      while len(self._points) > self.maxsize:
+        self._points.popitem(last=False)
+    return point
+
+  def clear(self) -> None:
+    with self._lock:
+      self._points.clear()
+      self.hits = 0
+      self.misses = 0
+
+  def __len__(self) -> int:
+    return len(self._points)
+
+map_to_curve_cache = HashToCurveCache()
+
+def map_to_curve_cached(msg_bytes: bytes) -> G1:
+  return map_to_curve_cache.get(msg_bytes)
+
+def __load_native_pairing() -> Optional[ctypes.CDLL]:
+  # the mcl binding only wraps the full pairing. the shared library it loads also exports
+  # the miller loop and the final exponentiation, which are bound here directly.
+  try:
+    from mcl import hook
+  except ImportError:
+    return None
+  for lib in vars(hook).values():
+    if not isinstance(lib, ctypes.CDLL):
+      continue
+    try:
+      lib.mclBn_millerLoop
+      lib.mclBn_finalExp
+      lib.mclBnGT_mul
+      lib.mclBnGT_isOne
+    except AttributeError:
+      continue
+    for fn in (lib.mclBn_millerLoop, lib.mclBn_finalExp, lib.mclBnGT_mul):
+      fn.restype = None
+    lib.mclBnGT_isOne.restype = ctypes.c_int
+    return lib
+  return None
+
+_NATIVE_PAIRING = __load_native_pairing()
+
+def __fold_pairs(pairs: Sequence[Tuple[G1, G2]]) -> List[Tuple[G1, G2]]:
+  # e(a, b) * e(c, b) == e(a + c, b), so pairs sharing a G2 point are merged, then pairs
+  # sharing a G1 point. pairs with a zero point are dropped since e(0, b) == e(a, 0) == 1
+  by_g2: List[Tuple[G1, G2]] = []
+  for g1, g2 in pairs:
+    for i, (f1, f2) in enumerate(by_g2):
+      if f2 == g2:
+        by_g2[i] = (f1 + g1, f2)
+        break
+    else:
+      by_g2.append((g1, g2))
+
+  by_g1: List[Tuple[G1, G2]] = []
+  for g1, g2 in by_g2:
+    if g1.isZero():
+      continue
+    for i, (f1, f2) in enumerate(by_g1):
+      if f1 == g1:
+        by_g1[i] = (f1, f2 + g2)
+        break
+    else:
+      by_g1.append((g1, g2))
+  return [(g1, g2) for g1, g2 in by_g1 if not g2.isZero()]
+
+def multi_pairing_check(pairs: Sequence[Tuple[G1, G2]]) -> bool:
+  # checks e(a_1, b_1) * ... * e(a_n, b_n) == 1 with one miller loop per pair
+  # and a single final exponentiation
+  if not pairs:
+    return True
+  if _NATIVE_PAIRING is None:
+    # the binding only compares full pairings, so the pairs are folded down to at most two
+    folded = __fold_pairs(pairs)
+    if not folded:
+      return True
+    if len(folded) == 1:
+      # the pairing is non-degenerate, e(a, b) != 1 for non-zero a and b
+      return False
+    if len(folded) == 2:
+      # e(a_1, b_1) * e(a_2, b_2) == 1  <=>  e(a_1, b_1) == e(-a_2, b_2)
+      return GT.pairing(folded[0][0], folded[0][1]) == GT.pairing(-folded[1][0], folded[1][1])
+    raise ValueError(
+      "Checking more than two pairs without a shared point needs the native miller loop"
+    )
+
+  product = GT()
+  for i, (g1, g2) in enumerate(pairs):
+    if i == 0:
+      _NATIVE_PAIRING.mclBn_millerLoop(ctypes.byref(product), ctypes.byref(g1), ctypes.byref(g2))
+      continue
+    ml = GT()
+    _NATIVE_PAIRING.mclBn_millerLoop(ctypes.byref(ml), ctypes.byref(g1), ctypes.byref(g2))
+    _NATIVE_PAIRING.mclBnGT_mul(ctypes.byref(product), ctypes.byref(product), ctypes.byref(ml))
+  result = GT()
+  _NATIVE_PAIRING.mclBn_finalExp(ctypes.byref(result), ctypes.byref(product))
+  return _NATIVE_PAIRING.mclBnGT_isOne(ctypes.byref(result)) == 1
+
 def verify_sig(sig: G1, pub_key: G2, msg_bytes: bytes, ) -> bool:
-  G2 = get_g2_generator()
-  msg_point = map_to_curve(msg_bytes)
-  
-  gt1 = GT.pairing(msg_point, pub_key)
-  gt2 = GT.pairing(sig, G2)
+  msg_point = map_to_curve_cached(msg_bytes)
+
+  # e(H(m), pk) == e(sig, G2)  <=>  e(H(m), pk) * e(-sig, G2) == 1
+  return multi_pairing_check([(msg_point, pub_key), (-sig, _G2_GENERATOR)])
+
+def __random_scalar() -> Fr:
+  r = Fr()
+  r.setStr(f"{secrets.randbits(_BATCH_SCALAR_BITS) | 1}".encode("utf-8"), 10)
+  return r
+
+def __verify_sig_batch_on_point(sigs: List[G1], pub_keys: List[G2], msg_point: G1) -> bool:
+  # random linear combination of the individual checks e(sig_i, G2) == e(H(m), pk_i):
+  # e(sum(r_i * sig_i), G2) == e(H(m), sum(r_i * pk_i))
+  agg_sig = G1()
+  agg_pub_key = G2()
+  for sig, pub_key in zip(sigs, pub_keys):
+    r = __random_scalar()
+    agg_sig = agg_sig + sig * r
+    agg_pub_key = agg_pub_key + pub_key * r
+
+  return multi_pairing_check([(msg_point, agg_pub_key), (-agg_sig, _G2_GENERATOR)])
+
+def verify_sig_batch(sigs: List[G1], pub_keys: List[G2], msg_bytes: bytes) -> bool:
+  if len(sigs) != len(pub_keys):
+    raise ValueError("Number of signatures and public keys must match")
+  if not sigs:
+    return True
+  return __verify_sig_batch_on_point(sigs, pub_keys, map_to_curve_cached(msg_bytes))
+
+def find_invalid_sigs(sigs: List[G1], pub_keys: List[G2], msg_bytes: bytes) -> List[int]:
+  if len(sigs) != len(pub_keys):
+    raise ValueError("Number of signatures and public keys must match")
+  msg_point = map_to_curve_cached(msg_bytes)
 
-  return gt1 == gt2
+  # bisect failing batches down to the individual bad signatures
+  invalid = []
+  ranges = [(0, len(sigs))]
+  while ranges:
+    start, end = ranges.pop()
+    if start == end:
+      continue
+    if __verify_sig_batch_on_point(sigs[start:end], pub_keys[start:end], msg_point):
+      continue
+    if end - start == 1:
+      invalid.append(start)
+      continue
+    mid = (start + end) // 2
+    ranges.append((mid, end))
+    ranges.append((start, mid))
+  return sorted(invalid)
 
 def map_to_curve(_x: bytes) -> G1:
   beta = 0
@@ -63,29 +232,38 @@ def __find_y_from_x(x: int) -> 'tuple[int, int]':
   beta = __addmod(__mulmod(__mulmod(x, x, _FP_MODULUS), x, _FP_MODULUS), 3, _FP_MODULUS)
   # y^2 = x^3 + b
   # this acts like: y = sqrt(beta) = beta^((p+1) / 4)
-  y = __expmod(beta, 0xc19139cb84c680a6e14116da060561765e05aa45a1c72a34f082305b61f3f52, _FP_MODULUS)
+  y = pow(beta, _SQRT_EXPONENT, _FP_MODULUS)
   return (beta, y)
 
 def check_g1_and_g2_discrete_log_equality(p1: G1, p2: G2) -> bool:
-  G1 = get_g1_generator()
-  G2 = get_g2_generator()
-  
-  gt1 = GT.pairing(p1, G2)
-  gt2 = GT.pairing(G1, p2)
-  return gt1 == gt2
+  # e(p1, G2) == e(G1, p2)  <=>  e(p1, G2) * e(-G1, p2) == 1
+  return multi_pairing_check([(p1, _G2_GENERATOR), (-_G1_GENERATOR, p2)])
 
-def get_g1_generator() -> G1:
+def __new_g1_generator() -> G1:
   g1 = G1()
   g1.setStr(b"1 1 2")
   return g1
 
-def get_g2_generator() -> G2:
+def __new_g2_generator() -> G2:
   g2 = G2()
   g2.setStr(f"1 {_G2_XB} {_G2_XA} {_G2_YB} {_G2_YA}".encode("utf-8"))
   return g2
 
+# the generators are parsed once and shared by this module. group operations always return
+# new points, they must never be mutated in place (setStr, clear, deserialize, ...)
+_G1_GENERATOR = __new_g1_generator()
+_G2_GENERATOR = __new_g2_generator()
+
+# the public getters return copies of the shared generators, which callers are free to
+# mutate. the points are ctypes structures, copying their memory does not parse them again.
+def get_g1_generator() -> G1:
+  return G1.from_buffer_copy(_G1_GENERATOR)
+
+def get_g2_generator() -> G2:
+  return G2.from_buffer_copy(_G2_GENERATOR)
+
 def mul_by_generator_g1(a: Fr) -> G1:
-  return get_g1_generator() * a
+  return _G1_GENERATOR * a
 
 def mul_by_generator_g2(a: Fr) -> G2:
-  return get_g2_generator() * a
\ No newline at end of file
+  return _G2_GENERATOR * a
@@ -0,0 +1,222 @@
+import os
+import timeit
+import unittest
+from unittest import mock
+from eigensdk.crypto.bls.attestation import KeyPair
+from eigensdk.crypto.bn256 import utils as bn256Utils
+
+
+class TestBatchVerification(unittest.TestCase):
+    msg = b"\x01" * 32
+
+    def setUp(self):
+        self.key_pairs = [KeyPair.from_string(f"{i:02x}") for i in range(1, 6)]
+        self.pub_keys = [kp.pub_g2 for kp in self.key_pairs]
+        self.sigs = [kp.sign_message(self.msg) for kp in self.key_pairs]
+
+    def test_valid_batch(self):
+        """a batch of correct signatures over the same message should verify"""
+
+        self.assertTrue(bn256Utils.verify_sig_batch(self.sigs, self.pub_keys, self.msg))
+        self.assertEqual(
+            bn256Utils.find_invalid_sigs(self.sigs, self.pub_keys, self.msg), []
+        )
+
+    def test_invalid_signatures_are_found(self):
+        """bisection should report exactly the bad signatures"""
+
+        other_msg = b"\x02" * 32
+        self.sigs[1] = self.key_pairs[1].sign_message(other_msg)
+        self.sigs[4] = self.key_pairs[0].sign_message(self.msg)
+
+        self.assertFalse(
+            bn256Utils.verify_sig_batch(self.sigs, self.pub_keys, self.msg)
+        )
+        self.assertEqual(
+            bn256Utils.find_invalid_sigs(self.sigs, self.pub_keys, self.msg), [1, 4]
+        )
+
+    def test_empty_batch(self):
+        self.assertTrue(bn256Utils.verify_sig_batch([], [], self.msg))
+        self.assertEqual(bn256Utils.find_invalid_sigs([], [], self.msg), [])
+
+
+class TestHashToCurveCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        """the mapping of a digest should be computed once and then served from the cache"""
+
+        cache = bn256Utils.HashToCurveCache(maxsize=2)
+        msg = b"\x03" * 32
+
+        p1 = cache.get(msg)
+        p2 = cache.get(msg)
+        self.assertEqual(p1, bn256Utils.map_to_curve(msg))
+        self.assertIs(p1, p2)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_lru_eviction(self):
+        cache = bn256Utils.HashToCurveCache(maxsize=2)
+        msgs = [bytes([i]) * 32 for i in range(3)]
+        for msg in msgs:
+            cache.get(msg)
+        cache.get(msgs[0])
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (0, 4))
+
+
+def _expmod_reference(a: int, b: int, m: int) -> int:
+    # the square-and-multiply loop map_to_curve used before switching to the builtin pow
+    result = 1
+    while b > 0:
+        if b & 1:
+            result = (result * a) % m
+        b >>= 1
+        a = (a * a) % m
+    return result
+
+
+class TestMapToCurve(unittest.TestCase):
+    # (message, expected x, expected y) generated with the original square-and-multiply
+    # implementation, which follows the try-and-increment of BN254.hashToG1 onchain
+    golden_vectors = [
+        ("00" * 32, 1, 2),
+        (
+            "01" * 32,
+            454086624460063511464984254936031011189294057512315937409637584344757371137,
+            3254172176129410938999735103599485175172243500426467808914178278315093891640,
+        ),
+        (
+            "ff" * 32,
+            6350874878119819312338956282401532409788428879151445726012394534686998597020,
+            9382425333525343773979589293970912874995880615911074345993039062358358671562,
+        ),
+        (
+            "aa9ee544b2d8ced2294e0030ef4f0e9aea3e01ec7f37c0a691b7523b50ea92e8",
+            11509199831897010997690673801920391054180983414029962403663866575536826587923,
+            16958697154700263126862710127277616816995520461619130593360210671216942192334,
+        ),
+        (
+            # equal to the field modulus, so it reduces to x = 0
+            "30644e72e131a029b85045b68181585d97816a916871ca8d3c208c16d87cfd47",
+            1,
+            2,
+        ),
+        (
+            "1234",
+            4662,
+            2408763709132694883945566010502560930633385839290741009289617375526630087394,
+        ),
+    ]
+
+    def test_golden_vectors(self):
+        for msg_hex, x, y in self.golden_vectors:
+            with self.subTest(msg=msg_hex):
+                point = bn256Utils.map_to_curve(bytes.fromhex(msg_hex))
+                self.assertEqual(int(point.getX().getStr()), x)
+                self.assertEqual(int(point.getY().getStr()), y)
+
+    def test_sqrt_matches_reference(self):
+        find_y_from_x = getattr(bn256Utils, "__find_y_from_x")
+        for x in range(1, 50):
+            beta, y = find_y_from_x(x)
+            self.assertEqual(
+                y,
+                _expmod_reference(
+                    beta, bn256Utils._SQRT_EXPONENT, bn256Utils._FP_MODULUS
+                ),
+            )
+
+    def test_sqrt_matches_reference_on_large_input(self):
+        beta = 2**250 + 12345
+        self.assertEqual(
+            pow(beta, bn256Utils._SQRT_EXPONENT, bn256Utils._FP_MODULUS),
+            _expmod_reference(beta, bn256Utils._SQRT_EXPONENT, bn256Utils._FP_MODULUS),
+        )
+
+    @unittest.skipUnless(
+        os.environ.get("EIGENSDK_BENCHMARKS"), "set EIGENSDK_BENCHMARKS to run benchmarks"
+    )
+    def test_sqrt_benchmark(self):
+        """builtin pow against the pure python square-and-multiply loop, timings only"""
+
+        beta = 2**250 + 12345
+        reference = timeit.timeit(
+            lambda: _expmod_reference(
+                beta, bn256Utils._SQRT_EXPONENT, bn256Utils._FP_MODULUS
+            ),
+            number=500,
+        )
+        fast = timeit.timeit(
+            lambda: pow(beta, bn256Utils._SQRT_EXPONENT, bn256Utils._FP_MODULUS),
+            number=500,
+        )
+        print(
+            f"sqrt over F_p: reference {reference * 2:.3f}ms, pow {fast * 2:.3f}ms per call"
+        )
+
+
+class TestMultiPairingCheck(unittest.TestCase):
+    def test_bilinearity(self):
+        """e(a*G1, b*G2) * e(-(a*b)*G1, G2) should be one"""
+
+        a = KeyPair.from_string("05").priv_key
+        b = KeyPair.from_string("07").priv_key
+        ab = KeyPair.from_string("23").priv_key
+        g1 = bn256Utils.get_g1_generator()
+        g2 = bn256Utils.get_g2_generator()
+
+        self.assertTrue(
+            bn256Utils.multi_pairing_check([(g1 * a, g2 * b), (-(g1 * ab), g2)])
+        )
+        self.assertTrue(
+            bn256Utils.multi_pairing_check(
+                [(g1 * a, g2 * b), (-(g1 * a), g2 * a), (g1 * a, g2 * a), (-(g1 * ab), g2)]
+            )
+        )
+        self.assertFalse(
+            bn256Utils.multi_pairing_check([(g1 * a, g2 * b), (-(g1 * a), g2)])
+        )
+
+    def test_empty(self):
+        self.assertTrue(bn256Utils.multi_pairing_check([]))
+
+    def pairing_cases(self):
+        a = KeyPair.from_string("05").priv_key
+        b = KeyPair.from_string("07").priv_key
+        ab = KeyPair.from_string("23").priv_key
+        a_plus_b = KeyPair.from_string("0c").priv_key
+        g1 = bn256Utils.get_g1_generator()
+        g2 = bn256Utils.get_g2_generator()
+        return [
+            ([(g1 * a, g2 * b), (-(g1 * ab), g2)], True),
+            ([(g1 * a, g2 * b), (-(g1 * a), g2)], False),
+            ([(g1 * a, g2), (g1 * b, g2), (-(g1 * a_plus_b), g2)], True),
+            ([(g1 * a, g2 * b), (g1 * a, g2), (-(g1 * ab), g2), (-(g1 * a), g2)], True),
+            ([(g1 * a, g2 * b), (g1 * b, g2 * a), (-(g1 * ab), g2 * a)], False),
+        ]
+
+    def test_folded_pairs(self):
+        """without the native miller loop, pairs sharing a point should be merged"""
+
+        with mock.patch.object(bn256Utils, "_NATIVE_PAIRING", None):
+            for pairs, expected in self.pairing_cases():
+                with self.subTest(pairs=len(pairs), expected=expected):
+                    self.assertEqual(bn256Utils.multi_pairing_check(pairs), expected)
+
+            a = KeyPair.from_string("05").priv_key
+            b = KeyPair.from_string("07").priv_key
+            g1 = bn256Utils.get_g1_generator()
+            g2 = bn256Utils.get_g2_generator()
+            with self.assertRaises(ValueError):
+                bn256Utils.multi_pairing_check(
+                    [(g1, g2 * a), (g1 * a, g2 * b), (g1 * b, g2)]
+                )
+
+    @unittest.skipIf(
+        bn256Utils._NATIVE_PAIRING is None, "the mcl library has no native miller loop"
+    )
+    def test_native_miller_loop(self):
+        for pairs, expected in self.pairing_cases():
+            with self.subTest(pairs=len(pairs), expected=expected):
+                self.assertEqual(bn256Utils.multi_pairing_check(pairs), expected)
@@ -1,13 +1,24 @@
 import logging
-from typing import Dict, List, Union
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Tuple, Union
 
-from eigensdk._types import OperatorAvsState, OperatorInfo
+from eigensdk._types import (
+    OperatorAvsState,
+    OperatorInfo,
+    OperatorStateRetrieverCheckSignaturesIndices,
+    QuorumAvsState,
+)
 from eigensdk.chainio.clients.avsregistry.reader import AvsRegistryReader
-from eigensdk.crypto.bls.attestation import G1Point, new_zero_g1_point
+from eigensdk.crypto.bls.attestation import new_zero_g1_point
 from eigensdk.services.operatorsinfo.operatorsinfo_inmemory import (
     OperatorsInfoServiceInMemory,
 )
 
+# (block number, sorted quorum numbers)
+_StateKey = Tuple[int, Tuple[int, ...]]
+
 
 class AvsRegistryService:
     def __init__(
@@ -15,14 +26,66 @@ class AvsRegistryService:
         avs_registry_reader: AvsRegistryReader,
         operator_info_service: OperatorsInfoServiceInMemory,
         logger: logging.Logger,
+        state_cache_size: int = 128,
     ):
         self.avs_registry_reader: AvsRegistryReader = avs_registry_reader
         self.operator_info_service: OperatorsInfoServiceInMemory = operator_info_service
         self.logger: logging.Logger = logger
 
+        # operator state snapshots keyed by (block number, quorum set). tasks created at the
+        # same block share one snapshot, and concurrent requests for a snapshot that is being
+        # fetched wait for that fetch instead of starting their own.
+        # cached snapshots are shared between callers and must not be mutated. snapshots
+        # missing operators whose info could not be found are returned but not cached, so
+        # the next request looks them up again.
+        self.state_cache_size: int = state_cache_size
+        self._state_cache: "OrderedDict[_StateKey, Dict[bytes, OperatorAvsState]]" = (
+            OrderedDict()
+        )
+        self._state_in_flight: Dict[_StateKey, Future] = {}
+        self._state_cache_lock = threading.Lock()
+
     def get_operators_avs_state_at_block(
         self, quorum_numbers: List[int], block_number: int
     ) -> Dict[bytes, OperatorAvsState]:
+        key = (block_number, tuple(sorted(set(quorum_numbers))))
+        with self._state_cache_lock:
+            operators_avs_state = self._state_cache.get(key)
+            if operators_avs_state is not None:
+                self._state_cache.move_to_end(key)
+                return operators_avs_state
+            future = self._state_in_flight.get(key)
+            fetching = future is None
+            if fetching:
+                future = Future()
+                self._state_in_flight[key] = future
+
+        if not fetching:
+            return future.result()
+
+        try:
+            operators_avs_state, complete = self.__fetch_operators_avs_state_at_block(
+                list(key[1]), block_number
+            )
+        except BaseException as e:
+            with self._state_cache_lock:
+                del self._state_in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._state_cache_lock:
+            del self._state_in_flight[key]
+            if complete:
+                self._state_cache[key] = operators_avs_state
+                while len(self._state_cache) > self.state_cache_size:
+                    self._state_cache.popitem(last=False)
+        future.set_result(operators_avs_state)
+        return operators_avs_state
+
+    def __fetch_operators_avs_state_at_block(
+        self, quorum_numbers: List[int], block_number: int
+    ) -> Tuple[Dict[bytes, OperatorAvsState], bool]:
+        # also returns whether the info of every operator was found
         operators_avs_state: Dict[bytes, OperatorAvsState] = {}
 
         operators_stakes_in_quorums = (
@@ -37,12 +100,19 @@ class AvsRegistryService:
                 extra={"service": "AvsRegistryServiceChainCaller"},
             )
 
+        operator_ids = list(
+            dict.fromkeys(
+                operator.operator_id
+                for quorum_operators in operators_stakes_in_quorums
+                for operator in quorum_operators
+            )
+        )
+        operator_infos = self.__get_operator_infos(operator_ids)
+
         for quorum_idx, quorum_num in enumerate(quorum_numbers):
             for operator in operators_stakes_in_quorums[quorum_idx]:
-                try:
-                    info = self.get_operator_info(operator.operator_id)
-                except:
-                    self.logger.error(f"Operator {operator.operator_id} info not found. The operator is skipped.")
+                info = operator_infos.get(operator.operator_id)
+                if info is None:
                     continue
 
                 if operator.operator_id not in operators_avs_state:
@@ -56,16 +126,16 @@ class AvsRegistryService:
                 operators_avs_state[operator.operator_id].stake_per_quorum[
                     quorum_num
                 ] = operator.stake
-        return operators_avs_state
+        return operators_avs_state, len(operator_infos) == len(operator_ids)
 
     def get_quorums_avs_state_at_block(
         self, quorum_numbers: List[int], block_number: int
-    ) -> Dict[int, Dict[str, Union[int, G1Point]]]:
+    ) -> Dict[int, QuorumAvsState]:
         operators_avs_state = self.get_operators_avs_state_at_block(
             quorum_numbers, block_number
         )
 
-        quorums_avs_state: Dict[int, Dict[str, Union[int, G1Point]]] = {}
+        quorums_avs_state: Dict[int, QuorumAvsState] = {}
         for quorum_num in quorum_numbers:
             agg_pubkey_g1 = new_zero_g1_point()
             total_stake = 0
@@ -78,15 +148,72 @@ class AvsRegistryService:
                     stake = operator_state.stake_per_quorum[quorum_num]
                     total_stake += stake
 
-            quorums_avs_state[quorum_num] = {
-                "quorum_number": quorum_num,
-                "agg_pubkey_g1": agg_pubkey_g1,
-                "total_stake": total_stake,
-                "block_number": block_number,
-            }
+            quorums_avs_state[quorum_num] = QuorumAvsState(
+                quorum_number=quorum_num,
+                total_stake=total_stake,
+                agg_pub_key_g1=agg_pubkey_g1,
+                block_number=block_number,
+            )
 
         return quorums_avs_state
 
+    def get_check_signatures_indices(
+        self,
+        reference_block_number: int,
+        quorum_numbers: List[int],
+        non_signer_operator_ids: List[Union[int, str]],
+    ) -> OperatorStateRetrieverCheckSignaturesIndices:
+        # operator ids of the avs state are hex strings, the reader expects integers
+        return self.avs_registry_reader.get_check_signatures_indices(
+            reference_block_number,
+            quorum_numbers,
+            [
+                int(operator_id, 16) if isinstance(operator_id, str) else operator_id
+                for operator_id in non_signer_operator_ids
+            ],
+        )
+
     def get_operator_info(self, operator_id: bytes) -> OperatorInfo:
+        try:
+            return self.operator_info_service.get_operator_info_by_id(operator_id)
+        except Exception:
+            pass
+        # the in memory service has not seen the registration yet, resolve the address onchain
         operator_addr = self.avs_registry_reader.get_operator_from_id(operator_id)
         return self.operator_info_service.get_operator_info(operator_addr)
+
+    def __get_operator_infos(
+        self, operator_ids: List[bytes]
+    ) -> Dict[bytes, OperatorInfo]:
+        # operators are resolved once per snapshot, even if they are staked in several quorums.
+        # the in memory service indexes operators by id, so only unknown ids cost chain reads.
+        operator_infos: Dict[bytes, OperatorInfo] = {}
+        unknown_operator_ids: List[bytes] = []
+        for operator_id in dict.fromkeys(operator_ids):
+            try:
+                operator_infos[operator_id] = (
+                    self.operator_info_service.get_operator_info_by_id(operator_id)
+                )
+            except Exception:
+                unknown_operator_ids.append(operator_id)
+        if not unknown_operator_ids:
+            return operator_infos
+
+        # registrations the in memory service has not seen yet, their addresses are resolved
+        # with a single multicall
+        try:
+            operator_addrs = self.avs_registry_reader.get_operators_from_ids(
+                unknown_operator_ids
+            )
+        except Exception as e:
+            self.logger.error(f"Resolving operator addresses failed: {e}")
+            operator_addrs = [None] * len(unknown_operator_ids)
+
+        for operator_id, operator_addr in zip(unknown_operator_ids, operator_addrs):
+            try:
+                operator_infos[operator_id] = (
+                    self.operator_info_service.get_operator_info(operator_addr)
+                )
+            except:
+                self.logger.error(f"Operator {operator_id} info not found. The operator is skipped.")
+        return operator_infos
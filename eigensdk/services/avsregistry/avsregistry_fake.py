@@ -1,10 +1,9 @@
 from .avsregistry import AvsRegistryService as ARSInterface
-from .avsregistry import (
+from eigensdk._types import (
     OperatorAvsState,
     OperatorInfo,
     OperatorPubkeys,
     QuorumAvsState,
-    CallOpts,
     OperatorStateRetrieverCheckSignaturesIndices,
 )
 
@@ -71,7 +70,6 @@ class FakeAvsRegistryService(ARSInterface):
 
     async def get_check_signatures_indices(
         self,
-        opts: CallOpts,
         reference_block_number: int,
         quorum_numbers: list[int],
         non_nigner_operator_ids: list[int],
@@ -82,4 +80,4 @@ class FakeAvsRegistryService(ARSInterface):
             total_stake_indices=[],
             non_signer_stake_indices=[],
         )
-        return result, None
+        return result
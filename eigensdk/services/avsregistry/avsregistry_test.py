@@ -0,0 +1,136 @@
+import logging
+import threading
+import unittest
+from eigensdk._types import OperatorInfo, OperatorPubkeys, OperatorStateRetrieverOperator
+from eigensdk.crypto.bls.attestation import KeyPair
+from .avsregistry import AvsRegistryService
+
+
+class CountingAvsRegistryReader:
+    def __init__(self, operators: list[OperatorStateRetrieverOperator]) -> None:
+        self.operators = operators
+        self.stake_calls = 0
+        self.operator_from_id_calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_operators_stake_in_quorums_at_block(self, quorum_numbers, block_number):
+        self.stake_calls += 1
+        self.release.wait(5)
+        return [list(self.operators) for _ in quorum_numbers]
+
+    def get_operators_from_ids(self, operator_ids, block_number=None):
+        self.operator_from_id_calls += 1
+        addrs = {operator.operator_id: operator.operator for operator in self.operators}
+        return [addrs.get(operator_id) for operator_id in operator_ids]
+
+
+class FakeOperatorsInfoService:
+    def __init__(self, infos: dict, indexed_ids: dict) -> None:
+        self.infos = infos
+        # operator id -> address of the registrations the service has already indexed
+        self.indexed_ids = indexed_ids
+
+    def get_operator_info(self, operator_addr):
+        return self.infos[operator_addr]
+
+    def get_operator_info_by_id(self, operator_id):
+        if operator_id not in self.indexed_ids:
+            raise Exception("Not found")
+        return self.infos[self.indexed_ids[operator_id]]
+
+
+class TestOperatorsAvsStateCache(unittest.TestCase):
+    def setUp(self):
+        self.key_pairs = [KeyPair.from_string(f"{i:02x}") for i in range(1, 4)]
+        operators = [
+            OperatorStateRetrieverOperator(
+                operator=f"0x{i:040x}", operator_id=f"0x{i:064x}", stake=100 * i
+            )
+            for i in range(1, 4)
+        ]
+        infos = {
+            operator.operator: OperatorInfo(
+                socket="localhost:9090",
+                pub_keys=OperatorPubkeys(
+                    g1_pub_key=key_pair.pub_g1, g2_pub_key=key_pair.pub_g2
+                ),
+            )
+            for operator, key_pair in zip(operators, self.key_pairs)
+        }
+        self.reader = CountingAvsRegistryReader(operators)
+        # the last registration has not been indexed yet
+        indexed_ids = {
+            operator.operator_id: operator.operator for operator in operators[:2]
+        }
+        self.service = AvsRegistryService(
+            self.reader,
+            FakeOperatorsInfoService(infos, indexed_ids),
+            logging.getLogger(__name__),
+            state_cache_size=2,
+        )
+
+    def test_quorum_state_reuses_operator_snapshot(self):
+        """operator and quorum state of a task should cost one stake query"""
+
+        operators_state = self.service.get_operators_avs_state_at_block([0, 1], 10)
+        quorums_state = self.service.get_quorums_avs_state_at_block([1, 0], 10)
+
+        self.assertEqual(self.reader.stake_calls, 1)
+        self.assertEqual(len(operators_state), 3)
+        # only the operator unknown to the in memory service is resolved onchain, once
+        self.assertEqual(self.reader.operator_from_id_calls, 1)
+        self.assertEqual(quorums_state[0].total_stake, 600)
+        self.assertEqual(
+            quorums_state[1].agg_pub_key_g1,
+            self.key_pairs[0].pub_g1 + self.key_pairs[1].pub_g1 + self.key_pairs[2].pub_g1,
+        )
+
+    def test_concurrent_requests_are_coalesced(self):
+        self.reader.release.clear()
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.service.get_operators_avs_state_at_block([0], 10)
+                )
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        self.reader.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.reader.stake_calls, 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_lru_eviction(self):
+        for block_number in (10, 11, 12, 10):
+            self.service.get_operators_avs_state_at_block([0], block_number)
+        self.assertEqual(self.reader.stake_calls, 4)
+
+        self.service.get_operators_avs_state_at_block([0], 12)
+        self.assertEqual(self.reader.stake_calls, 4)
+
+    def test_incomplete_snapshot_is_not_cached(self):
+        """a snapshot missing an operator should be fetched again on the next request"""
+
+        get_operators_from_ids = self.reader.get_operators_from_ids
+        self.reader.get_operators_from_ids = lambda operator_ids, block_number=None: [
+            None
+        ] * len(operator_ids)
+        self.assertEqual(
+            len(self.service.get_operators_avs_state_at_block([0], 10)), 2
+        )
+
+        self.reader.get_operators_from_ids = get_operators_from_ids
+        self.assertEqual(
+            len(self.service.get_operators_avs_state_at_block([0], 10)), 3
+        )
+        self.assertEqual(self.reader.stake_calls, 2)
+
+        self.service.get_operators_avs_state_at_block([0], 10)
+        self.assertEqual(self.reader.stake_calls, 2)
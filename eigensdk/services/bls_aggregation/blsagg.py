@@ -1,15 +1,24 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from eigensdk.crypto.bls.attestation import G1Point, G2Point, Signature
 import eigensdk.crypto.bls.attestation as bls
+from eigensdk.crypto.bn256 import utils as bn256Utils
 from eigensdk.services.avsregistry.avsregistry import AvsRegistryService
 from eigensdk._types import (
     OperatorAvsState,
     QuorumAvsState,
     SignedTaskResponseDigest
 )
+from eigensdk.services.bls_aggregation.verifier import (
+    InlineSignatureVerifier,
+    SignatureVerifier,
+)
+import asyncio
+import inspect
 import json
-import queue
+import logging
+from collections import OrderedDict
+from typing import AsyncIterator, Optional
 
 
 def is_json_serializable(obj):
@@ -22,8 +31,19 @@ def is_json_serializable(obj):
         return False
 
 
+def _g1_to_json(p: G1Point) -> dict:
+    x, y = bls.g1_to_tupple(p)
+    return {"X": f"{x:x}", "Y": f"{y:x}"}
+
+
+def _g2_to_json(p: G2Point) -> dict:
+    (xa, xb), (ya, yb) = bls.g2_to_tupple(p)
+    return {"X": [f"{xa:x}", f"{xb:x}"], "Y": [f"{ya:x}", f"{yb:x}"]}
+
+
 @dataclass
 class BlsAggregationServiceResponse:
+    err: Exception = None  # if Err is not None, the other fields hold at most the partial aggregate of an expired task
     task_index: int = None  # unique identifier of the task
     task_response: any = None  # the task response that was signed
     task_response_digest: any = None  # digest of the task response that was signed
@@ -41,9 +61,14 @@ class BlsAggregationServiceResponse:
     non_signer_stake_indices: list[list[int]] = None
 
     def to_json(self, indent=None) -> str:
+        if self.err is not None:
+            # a failed aggregation can not be submitted onchain, so only the error is serialized
+            return json.dumps({"err": str(self.err)}, indent=indent)
         if not is_json_serializable(self.task_response):
             raise ValueError("Task response is not json serializable.")
 
+        # coordinates are read from the normalized points, so equal points serialize to
+        # the same json
         return json.dumps(
             {
                 "err": str(self.err),
@@ -51,33 +76,11 @@ class BlsAggregationServiceResponse:
                 "task_response": self.task_response,
                 "task_response_digest": self.task_response_digest.hex(),
                 "non_signers_pubkeys_g1": [
-                    {
-                        "X": p.getX().getStr(16).decode("utf-8"),
-                        "Y": p.getY().getStr(16).decode("utf-8"),
-                    }
-                    for p in self.non_signers_pubkeys_g1
-                ],
-                "quorum_apks_g1": [
-                    {
-                        "X": p.getX().getStr(16).decode("utf-8"),
-                        "Y": p.getY().getStr(16).decode("utf-8"),
-                    }
-                    for p in self.quorum_apks_g1
+                    _g1_to_json(p) for p in self.non_signers_pubkeys_g1
                 ],
-                "signers_apk_g2": {
-                    "X": [
-                        self.signers_apk_g2.getX().get_a().getStr(16).decode("utf-8"),
-                        self.signers_apk_g2.getX().get_b().getStr(16).decode("utf-8"),
-                    ],
-                    "Y": [
-                        self.signers_apk_g2.getY().get_a().getStr(16).decode("utf-8"),
-                        self.signers_apk_g2.getY().get_b().getStr(16).decode("utf-8"),
-                    ],
-                },
-                "signers_agg_sig_g1": {
-                    "X": self.signers_agg_sig_g1.getX().getStr(16).decode("utf-8"),
-                    "Y": self.signers_agg_sig_g1.getY().getStr(16).decode("utf-8"),
-                },
+                "quorum_apks_g1": [_g1_to_json(p) for p in self.quorum_apks_g1],
+                "signers_apk_g2": _g2_to_json(self.signers_apk_g2),
+                "signers_agg_sig_g1": _g1_to_json(self.signers_agg_sig_g1),
                 "non_signer_quorum_bitmap_indices": self.non_signer_quorum_bitmap_indices,
                 "quorum_apk_indices": self.quorum_apk_indices,
                 "total_stake_indices": self.total_stake_indices,
@@ -97,6 +100,8 @@ class AggregatedOperators:
     signers_total_stake_per_quorum: dict[int, int]
     # set of OperatorId of operators who signed on this header
     signers_operator_ids_set: dict[int, bool]
+    # the same set as a bitmap over the task's operators in ascending OperatorId order
+    signers_bitmap: int = 0
 
 
 # BlsAggregationService is the interface provided to avs aggregator code for doing bls aggregation
@@ -107,8 +112,9 @@ class BlsAggregationServiceInterface(ABC):
     # quorumNumbers and quorumThresholdPercentages set the requirements for this task to be considered complete, which happens
     # when a particular TaskResponseDigest (received via the a.taskChans[taskIndex]) has been signed by signers whose stake
     # in each of the listed quorums adds up to at least quorumThresholdPercentages[i] of the total stake in that quorum
+    # If the task is not complete after time_to_expiry seconds, an expiry response is sent for it instead.
     @abstractmethod
-    def initialize_new_task(
+    async def initialize_new_task(
         task_index: int,
         task_created_block: int,
         quorum_numbers: list[int],
@@ -122,20 +128,29 @@ class BlsAggregationServiceInterface(ABC):
     # Note: This function currently only verifies signatures over the taskResponseDigest directly, so avs code needs to verify that the digest
     # passed to ProcessNewSignature is indeed the digest of a valid taskResponse (that is, BlsAggregationService does not verify semantic integrity of the taskResponses)
     @abstractmethod
-    def process_new_signature(
+    async def process_new_signature(
         taskIndex: int,
         taskResponse: any,
         blsSignature: Signature,
         operatorId: int,
     ): ...
 
-    # GetResponseChannel returns the single channel that meant to be used as the response channel
-    # Any task that is completed (see the completion criterion in the comment above InitializeNewTask)
-    # will be sent on this channel along with all the necessary information to call BLSSignatureChecker onchain
+    # GetAggregatedResponse waits for the response of a single task (see the completion criterion in the comment above
+    # InitializeNewTask) and returns it together with an error if the task is unknown
+    @abstractmethod
+    async def get_aggregated_response(
+        task_index: int,
+    ) -> tuple[BlsAggregationServiceResponse, Exception]: ...
+
+    # GetAggregatedResponses returns an async iterator over the responses of all tasks in the order they complete or expire
+    # Any task that is completed will be sent on it along with all the necessary information to call BLSSignatureChecker onchain
     @abstractmethod
-    def get_aggregated_responses() -> BlsAggregationServiceResponse: ...
+    def get_aggregated_responses() -> AsyncIterator[BlsAggregationServiceResponse]: ...
 
 
+# BlsAggregationService runs on the asyncio event loop of its caller. Chain reads of the
+# AvsRegistryService run in worker threads and pairing checks run on the SignatureVerifier
+# backend, so a single aggregator can follow thousands of concurrent tasks.
 class BlsAggregationService(BlsAggregationServiceInterface):
     @dataclass
     class TaskListItem:
@@ -150,26 +165,95 @@ class BlsAggregationService(BlsAggregationServiceInterface):
         aggregated_operators_dict: dict
         timeout: int
         signatures: dict
+        # signatures waiting for batch verification, per taskResponseDigest
+        pending_signatures: dict[any, list[SignedTaskResponseDigest]] = field(
+            default_factory=dict
+        )
+        # verification result of each signature waiting in a batch, per OperatorId. the
+        # caller that submitted the signature waits on it.
+        pending_results: dict[int, asyncio.Future] = field(default_factory=dict)
+        # timer flushing each partial batch once it waited verification_batch_linger seconds
+        batch_timers: dict[any, asyncio.TimerHandle] = field(default_factory=dict)
+        # signatures aggregated without verification in optimistic mode, per taskResponseDigest
+        unverified_signatures: dict[any, list[SignedTaskResponseDigest]] = field(
+            default_factory=dict
+        )
+        # check of the aggregate running in optimistic mode, per taskResponseDigest. it
+        # resolves to the signatures it evicted.
+        aggregate_checks: dict[any, asyncio.Future] = field(default_factory=dict)
+        # task response of each taskResponseDigest, used to build expiry responses
+        task_responses: dict[any, any] = field(default_factory=dict)
+        expiry_timer: asyncio.TimerHandle = None
+        # OperatorIds in ascending order, operator i is bit i of the signer bitmaps
+        sorted_operator_ids: list[int] = field(default_factory=list)
+        operator_bits: dict[int, int] = field(default_factory=dict)
+        # indices of a response without non-signers, fetched while signatures come in
+        all_signed_indices: asyncio.Future = None
 
     avs_registry_service: AvsRegistryService
     responses: dict[int, TaskListItem]
-    aggregated_responses: queue.Queue
+    aggregated_responses: asyncio.Queue
 
 
     def __init__(
         self,
         avs_registry_service: AvsRegistryService,
         hash_function: any,
-        # logger: any
+        verification_batch_size: int = 1,
+        optimistic_verification: bool = False,
+        signature_verifier: SignatureVerifier = None,
+        prefetch_all_signed_indices: bool = True,
+        completion_concurrency: int = 8,
+        completion_retries: int = 3,
+        completion_retry_delay: float = 0.5,
+        completed_responses_size: int = 1024,
+        verification_batch_linger: float = 0.05,
+        logger: Optional[logging.Logger] = None,
     ) -> None:
         super().__init__()
+        if optimistic_verification and verification_batch_size > 1:
+            raise ValueError(
+                "Optimistic verification and batch verification can not be combined"
+            )
         self.responses = {}
-        self.aggregated_responses = queue.Queue()
+        # responses waiting to be streamed, the oldest are dropped once there are more
+        # than completed_responses_size, so nothing piles up if nobody iterates
+        self.aggregated_responses = asyncio.Queue(maxsize=completed_responses_size)
         self.avs_registry_service = avs_registry_service
-        # self.logger = logger
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
         self.hash_function = hash_function
+        # number of signatures over the same taskResponseDigest that are buffered and
+        # verified together with a single randomized pairing check. 1 disables batching.
+        self.verification_batch_size = verification_batch_size
+        # seconds a batch that is not full waits for more signatures before it is verified
+        # anyway, so that its callers do not wait for the task to expire
+        self.verification_batch_linger = verification_batch_linger
+        # aggregate signatures without checking them and verify only the aggregate once the
+        # stake thresholds are met. signers are checked one by one only if that check fails.
+        self.optimistic_verification = optimistic_verification
+        # backend running the pairing checks
+        self.signature_verifier = signature_verifier or InlineSignatureVerifier()
+        # fetch the check signatures indices for the case where every operator signs when the
+        # task is initialized, so that such a task completes without waiting on a chain read
+        self.prefetch_all_signed_indices = prefetch_all_signed_indices
+        # tasks that met their thresholds are completed by background tasks, so signature
+        # processing never waits on the check signatures indices chain read. at most
+        # completion_concurrency reads run at once and a failed read is retried
+        # completion_retries times, with an exponential backoff starting at completion_retry_delay.
+        self._completion_semaphore = asyncio.Semaphore(completion_concurrency)
+        self.completion_retries = completion_retries
+        self.completion_retry_delay = completion_retry_delay
+        # response of each task that is not completed yet
+        self._response_futures: dict[int, asyncio.Future] = {}
+        # responses of completed tasks until they are retrieved, the oldest are dropped once
+        # there are more than completed_responses_size
+        self.completed_responses_size = completed_responses_size
+        self._completed_responses: OrderedDict[int, BlsAggregationServiceResponse] = (
+            OrderedDict()
+        )
+        self._background_tasks: set[asyncio.Task] = set()
 
-    def initialize_new_task(
+    async def initialize_new_task(
         self,
         task_index: int,
         task_created_block: int,
@@ -184,27 +268,35 @@ class BlsAggregationService(BlsAggregationServiceInterface):
         for i, qn in enumerate(quorum_numbers):
             quorum_threshold_percentages_map[qn] = quorum_threshold_percentages[i]
 
-        operators_avs_state_dict = (
-            self.avs_registry_service.get_operators_avs_state_at_block(
-                quorum_numbers, task_created_block
-            )
+        operators_avs_state_dict = await self.__call_avs_registry_service(
+            self.avs_registry_service.get_operators_avs_state_at_block,
+            quorum_numbers,
+            task_created_block,
         )
-        quorums_avs_state_dict = (
-            self.avs_registry_service.get_quorums_avs_state_at_block(
-                quorum_numbers, task_created_block
-            )
+        quorums_avs_state_dict = await self.__call_avs_registry_service(
+            self.avs_registry_service.get_quorums_avs_state_at_block,
+            quorum_numbers,
+            task_created_block,
         )
-
+        if task_index in self.responses:
+            raise ValueError("Task alredy initialized")
 
         total_stake_per_quorum = {}
         for quorum_num, quorum_avs_state in quorums_avs_state_dict.items():
-            total_stake_per_quorum[quorum_num] = quorum_avs_state['total_stake']
+            total_stake_per_quorum[quorum_num] = quorum_avs_state.total_stake
 
         quorum_apks_g1 = []
         for i, qn in enumerate(quorum_numbers):
-            quorum_apks_g1.append(quorums_avs_state_dict[qn]['agg_pubkey_g1'])
+            quorum_apks_g1.append(quorums_avs_state_dict[qn].agg_pub_key_g1)
+
+        # the operators are numbered once per task, signers are then tracked as a bitmap and
+        # the non-signers come out of it already sorted
+        sorted_operator_ids = sorted(operators_avs_state_dict)
+        operator_bits = {
+            operator_id: 1 << i for i, operator_id in enumerate(sorted_operator_ids)
+        }
 
-        self.responses[task_index] = self.TaskListItem(
+        cd = self.TaskListItem(
             task_created_block=task_created_block,
             quorum_numbers=quorum_numbers,
             quorum_threshold_percentages=quorum_threshold_percentages,
@@ -216,128 +308,625 @@ class BlsAggregationService(BlsAggregationServiceInterface):
             aggregated_operators_dict={},
             timeout=time_to_expiry,
             signatures={},
+            sorted_operator_ids=sorted_operator_ids,
+            operator_bits=operator_bits,
         )
+        if self.prefetch_all_signed_indices:
+            cd.all_signed_indices = asyncio.ensure_future(
+                self.__get_check_signatures_indices(
+                    task_created_block, quorum_numbers, []
+                )
+            )
+            # a failed prefetch is fetched again when the task completes
+            cd.all_signed_indices.add_done_callback(
+                lambda f: f.cancelled() or f.exception()
+            )
+        loop = asyncio.get_running_loop()
+        cd.expiry_timer = loop.call_later(
+            time_to_expiry, self.__on_task_expired, task_index, cd
+        )
+        self.responses[task_index] = cd
+        self._response_futures[task_index] = loop.create_future()
+        self._completed_responses.pop(task_index, None)
 
-    def process_new_signature(
+    async def process_new_signature(
         self, task_index: int, task_response: str, bls_sign: Signature, operator_id: int
     ):
         if task_index not in self.responses:
             raise ValueError("Task not initialized")
-        if operator_id in self.responses[task_index].signatures:
+        cd = self.responses[task_index]
+        if operator_id in cd.signatures:
             raise ValueError("Operator signature has already been processed")
-        if operator_id not in self.responses[task_index].operators_avs_state_dict:
+        if operator_id not in cd.operators_avs_state_dict:
             raise ValueError("Operator is not registered")
+        # reserve the operator's slot while its signature is being verified
+        cd.signatures[operator_id] = bls_sign
+
+        signed_task_response_digest = SignedTaskResponseDigest(
+            task_response=task_response,
+            bls_signature=bls_sign,
+            operator_id=operator_id,
+        )
+        task_response_digest = self.hash_function(task_response)
+        cd.task_responses.setdefault(task_response_digest, task_response)
 
+        if self.optimistic_verification:
+            self.__aggregate_signature(
+                cd, task_response_digest, signed_task_response_digest
+            )
+            cd.unverified_signatures.setdefault(task_response_digest, []).append(
+                signed_task_response_digest
+            )
+            # signatures arriving while the aggregate is checked wait for that check, it
+            # checks them too before it returns
+            check = cd.aggregate_checks.get(task_response_digest)
+            if check is None or check.done():
+                check = asyncio.ensure_future(
+                    self.__verify_aggregate_if_thresholds_met(
+                        task_index, cd, task_response_digest
+                    )
+                )
+                check.add_done_callback(lambda f: f.cancelled() or f.exception())
+                cd.aggregate_checks[task_response_digest] = check
+            evicted = await asyncio.shield(check)
+            # the other evicted signers were already told their signature was accepted,
+            # only the caller of this signature gets its outcome
+            if any(s is signed_task_response_digest for s in evicted):
+                raise ValueError("Incorrect signature error")
+            return
+
+        if self.verification_batch_size <= 1:
+            try:
+                await self.__verify_signature(
+                    task_index=task_index,
+                    signed_task_response_digest=signed_task_response_digest,
+                    operators_avs_state_dict=cd.operators_avs_state_dict,
+                )
+            except Exception:
+                cd.signatures.pop(operator_id, None)
+                raise
+            if self.responses.get(task_index) is not cd:
+                return
+            self.__aggregate_signature(
+                cd, task_response_digest, signed_task_response_digest
+            )
+            await self.__complete_task_if_thresholds_met(
+                task_index, cd, task_response_digest
+            )
+            return
+
+        # the signature is verified with the rest of its batch, the call returns once that
+        # is done and raises only if this signature is invalid
+        loop = asyncio.get_running_loop()
+        result = loop.create_future()
+        # the result is retrieved even if the caller stops waiting on it
+        result.add_done_callback(lambda f: f.cancelled() or f.exception())
+        cd.pending_results[operator_id] = result
+        pending = cd.pending_signatures.setdefault(task_response_digest, [])
+        pending.append(signed_task_response_digest)
+        if len(pending) >= self.verification_batch_size or self.__stake_thresholds_met(
+            signed_stake_per_quorum=self.__signed_stake_including_pending(
+                cd, task_response_digest
+            ),
+            total_stake_per_quorum=cd.total_stake_per_quorum,
+            quorum_threshold_percentages_map=cd.quorum_threshold_percentages_map,
+        ):
+            try:
+                await self.__flush_pending_signatures(
+                    task_index, cd, task_response_digest
+                )
+            except Exception:
+                # the batch's callers get the error through their results
+                if not result.done():
+                    raise
+        elif task_response_digest not in cd.batch_timers:
+            cd.batch_timers[task_response_digest] = loop.call_later(
+                self.verification_batch_linger,
+                self.__on_batch_linger_expired,
+                task_index,
+                cd,
+                task_response_digest,
+            )
+        await result
+
+    # FlushPendingSignatures verifies and aggregates every signature of the task that is still
+    # waiting in a verification batch. It runs automatically before a task expires.
+    async def flush_pending_signatures(self, task_index: int):
+        if task_index not in self.responses:
+            raise ValueError("Task not initialized")
         cd = self.responses[task_index]
-        operators_avs_state_dict: dict[int, OperatorAvsState] = (
-            cd.operators_avs_state_dict
+        invalid_operator_ids = []
+        for task_response_digest in list(cd.pending_signatures):
+            invalid_operator_ids.extend(
+                await self.__flush_pending_signatures(
+                    task_index, cd, task_response_digest
+                )
+            )
+        if invalid_operator_ids:
+            raise ValueError(
+                f"Incorrect signature error for operators {invalid_operator_ids}",
+                invalid_operator_ids,
+            )
+
+    async def get_aggregated_response(
+        self, task_index: int
+    ) -> tuple[BlsAggregationServiceResponse, Exception]:
+        future = self._response_futures.get(task_index)
+        if future is not None:
+            response = await future
+            self._completed_responses.pop(task_index, None)
+            return response, None
+        response = self._completed_responses.pop(task_index, None)
+        if response is None:
+            return None, ValueError(f"Task {task_index} not found")
+        return response, None
+
+    async def get_aggregated_responses(self) -> AsyncIterator[BlsAggregationServiceResponse]:
+        while True:
+            response = await self.aggregated_responses.get()
+            self._completed_responses.pop(response.task_index, None)
+            yield response
+            self.aggregated_responses.task_done()
+
+    async def __call_avs_registry_service(self, method, *args):
+        # the chain backed AvsRegistryService is synchronous, its calls run in a worker thread
+        # so that they do not block the event loop
+        if inspect.iscoroutinefunction(method):
+            return await method(*args)
+        return await asyncio.to_thread(method, *args)
+
+    async def __call_signature_verifier(self, method, *args):
+        # inline verifiers run the pairing checks on the calling thread, so they are called
+        # from a worker thread. other backends run them elsewhere and are only waited on.
+        if self.signature_verifier.inline:
+            return await asyncio.to_thread(lambda: method(*args).result())
+        return await asyncio.wrap_future(method(*args))
+
+    def __publish_response(self, response: BlsAggregationServiceResponse):
+        future = self._response_futures.pop(response.task_index, None)
+        if future is not None and not future.done():
+            future.set_result(response)
+        self._completed_responses[response.task_index] = response
+        while len(self._completed_responses) > self.completed_responses_size:
+            self._completed_responses.popitem(last=False)
+        if self.aggregated_responses.full():
+            self.aggregated_responses.get_nowait()
+            self.aggregated_responses.task_done()
+        self.aggregated_responses.put_nowait(response)
+
+    def __run_in_background(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def __on_task_expired(self, task_index: int, cd: TaskListItem):
+        self.__run_in_background(self.__expire_task(task_index, cd))
+
+    def __on_batch_linger_expired(
+        self, task_index: int, cd: TaskListItem, task_response_digest: any
+    ):
+        self.__run_in_background(
+            self.__flush_lingering_batch(task_index, cd, task_response_digest)
         )
 
-        err = self.__verify_signature(
+    async def __flush_lingering_batch(
+        self, task_index: int, cd: TaskListItem, task_response_digest: any
+    ):
+        try:
+            await self.__flush_pending_signatures(task_index, cd, task_response_digest)
+        except Exception:
+            # the batch's callers get the error through their results
+            pass
+
+    async def __get_check_signatures_indices(
+        self,
+        task_created_block: int,
+        quorum_numbers: list[int],
+        non_signers_operator_ids: list[int],
+    ):
+        retry_delay = self.completion_retry_delay
+        for attempt in range(self.completion_retries + 1):
+            try:
+                async with self._completion_semaphore:
+                    return await self.__call_avs_registry_service(
+                        self.avs_registry_service.get_check_signatures_indices,
+                        task_created_block,
+                        quorum_numbers,
+                        non_signers_operator_ids,
+                    )
+            except Exception:
+                if attempt == self.completion_retries:
+                    raise
+            # the slot is released while waiting, so other tasks can complete meanwhile
+            await asyncio.sleep(retry_delay)
+            retry_delay *= 2
+
+    async def __expire_task(self, task_index: int, cd: TaskListItem):
+        if self.responses.get(task_index) is not cd:
+            return
+        if any(cd.pending_signatures.values()):
+            # buffered signatures may still complete the task
+            try:
+                await self.flush_pending_signatures(task_index)
+            except Exception:
+                # the callers of the signatures got the errors
+                pass
+            if self.responses.get(task_index) is not cd:
+                return
+        del self.responses[task_index]
+        if cd.all_signed_indices is not None:
+            cd.all_signed_indices.cancel()
+        self.__reject_pending_signatures(
+            cd, ValueError(f"Task {task_index} expired before the signature was verified")
+        )
+
+        # the partial aggregate of the digest with the most signers is attached to the response
+        response = BlsAggregationServiceResponse(
+            err=asyncio.TimeoutError(f"task {task_index} expired"),
             task_index=task_index,
-            signed_task_response_digest=SignedTaskResponseDigest(
-                task_response=task_response,
-                bls_signature=bls_sign,
-                operator_id=operator_id,
-            ),
-            operators_avs_state_dict=operators_avs_state_dict,
+            quorum_apks_g1=cd.quorum_apks_g1,
         )
+        if cd.aggregated_operators_dict:
+            task_response_digest, digest_aggregated_operators = max(
+                cd.aggregated_operators_dict.items(),
+                key=lambda item: len(item[1].signers_operator_ids_set),
+            )
+            response.task_response = cd.task_responses[task_response_digest]
+            response.task_response_digest = task_response_digest
+            response.non_signers_pubkeys_g1 = self.__non_signers_g1_pub_keys(
+                cd, digest_aggregated_operators
+            )[1]
+            response.signers_apk_g2 = digest_aggregated_operators.signers_apk_g2
+            response.signers_agg_sig_g1 = digest_aggregated_operators.signers_agg_sig_g1
+        self.__publish_response(response)
+
+    async def __flush_pending_signatures(
+        self, task_index: int, cd: TaskListItem, task_response_digest: any
+    ) -> list[int]:
+        # the callers that submitted the signatures get their own result, the OperatorIds of
+        # the invalid signatures are returned
+        timer = cd.batch_timers.pop(task_response_digest, None)
+        if timer is not None:
+            timer.cancel()
+        pending = cd.pending_signatures.pop(task_response_digest, [])
+        if not pending:
+            return []
+
+        try:
+            invalid_indices = set(
+                await self.__call_signature_verifier(
+                    self.signature_verifier.find_invalid_sigs,
+                    [s.bls_signature for s in pending],
+                    [
+                        cd.operators_avs_state_dict[
+                            s.operator_id
+                        ].operator_info.pub_keys.g2_pub_key
+                        for s in pending
+                    ],
+                    task_response_digest,
+                )
+            )
+        except Exception as e:
+            # the signatures were not checked, their operators can submit them again
+            for signed_task_response_digest in pending:
+                cd.signatures.pop(signed_task_response_digest.operator_id, None)
+                self.__set_pending_result(cd, signed_task_response_digest, e)
+            raise
+
+        invalid_operator_ids = []
+        for i, signed_task_response_digest in enumerate(pending):
+            if i in invalid_indices:
+                # bad signers are dropped so that they can submit a correct signature again
+                invalid_operator_ids.append(signed_task_response_digest.operator_id)
+                cd.signatures.pop(signed_task_response_digest.operator_id, None)
+                self.__set_pending_result(
+                    cd,
+                    signed_task_response_digest,
+                    ValueError("Incorrect signature error"),
+                )
+            else:
+                self.__set_pending_result(cd, signed_task_response_digest)
+
+        if self.responses.get(task_index) is cd:
+            for i, signed_task_response_digest in enumerate(pending):
+                if i not in invalid_indices:
+                    self.__aggregate_signature(
+                        cd, task_response_digest, signed_task_response_digest
+                    )
+            await self.__complete_task_if_thresholds_met(
+                task_index, cd, task_response_digest
+            )
+        return invalid_operator_ids
+
+    def __reject_pending_signatures(self, cd: TaskListItem, error: Exception):
+        # signatures still waiting in a batch when the task is completed or expires are
+        # never verified, their callers get the error instead of waiting forever
+        for pending in cd.pending_signatures.values():
+            for signed_task_response_digest in pending:
+                self.__set_pending_result(cd, signed_task_response_digest, error)
+        cd.pending_signatures.clear()
+        for timer in cd.batch_timers.values():
+            timer.cancel()
+        cd.batch_timers.clear()
+
+    def __set_pending_result(
+        self,
+        cd: TaskListItem,
+        signed_task_response_digest: SignedTaskResponseDigest,
+        error: Exception = None,
+    ):
+        result = cd.pending_results.pop(signed_task_response_digest.operator_id)
+        # the caller may have been cancelled while it was waiting
+        if result.done():
+            return
+        if error is not None:
+            result.set_exception(error)
+        else:
+            result.set_result(None)
+
+    async def __verify_aggregate_if_thresholds_met(
+        self, task_index: int, cd: TaskListItem, task_response_digest: any
+    ) -> list[SignedTaskResponseDigest]:
+        # the evicted signatures are returned
+        evicted = []
+        while self.responses.get(task_index) is cd:
+            digest_aggregated_operators: AggregatedOperators = (
+                cd.aggregated_operators_dict.get(task_response_digest)
+            )
+            if digest_aggregated_operators is None or not self.__stake_thresholds_met(
+                signed_stake_per_quorum=digest_aggregated_operators.signers_total_stake_per_quorum,
+                total_stake_per_quorum=cd.total_stake_per_quorum,
+                quorum_threshold_percentages_map=cd.quorum_threshold_percentages_map,
+            ):
+                break
+            # signatures stay in the unverified list until a check covering them has finished,
+            # so that a concurrent check never completes the task with an unchecked aggregate
+            unverified = list(cd.unverified_signatures.get(task_response_digest, []))
+            if not unverified:
+                await self.__complete_task_if_thresholds_met(
+                    task_index, cd, task_response_digest
+                )
+                break
+
+            verified = await self.__call_signature_verifier(
+                self.signature_verifier.verify,
+                digest_aggregated_operators.signers_agg_sig_g1,
+                digest_aggregated_operators.signers_apk_g2,
+                task_response_digest,
+            )
+            if not verified:
+                # the aggregate is invalid, so at least one of the signatures that were not
+                # covered by a successful check yet is bad. find and evict those signers.
+                invalid_indices = await self.__call_signature_verifier(
+                    self.signature_verifier.find_invalid_sigs,
+                    [s.bls_signature for s in unverified],
+                    [
+                        cd.operators_avs_state_dict[
+                            s.operator_id
+                        ].operator_info.pub_keys.g2_pub_key
+                        for s in unverified
+                    ],
+                    task_response_digest,
+                )
+                for i in invalid_indices:
+                    if self.__evict_signature(cd, task_response_digest, unverified[i]):
+                        evicted.append(unverified[i])
+
+            checked_operator_ids = {s.operator_id for s in unverified}
+            cd.unverified_signatures[task_response_digest] = [
+                s
+                for s in cd.unverified_signatures.get(task_response_digest, [])
+                if s.operator_id not in checked_operator_ids
+            ]
+
+        if evicted:
+            self.logger.warning(
+                "Evicted signers with an incorrect signature",
+                extra={
+                    "taskIndex": task_index,
+                    "operatorIds": [s.operator_id for s in evicted],
+                },
+            )
+        return evicted
+
+    def __evict_signature(
+        self,
+        cd: TaskListItem,
+        task_response_digest: any,
+        signed_task_response_digest: SignedTaskResponseDigest,
+    ) -> bool:
+        operator_id = signed_task_response_digest.operator_id
+        operator_avs_state = cd.operators_avs_state_dict[operator_id]
+        digest_aggregated_operators: AggregatedOperators = (
+            cd.aggregated_operators_dict.get(task_response_digest)
+        )
+        if (
+            digest_aggregated_operators is None
+            or operator_id not in digest_aggregated_operators.signers_operator_ids_set
+        ):
+            # already evicted by a concurrent check
+            return False
+
+        cd.signatures.pop(operator_id, None)
+        del digest_aggregated_operators.signers_operator_ids_set[operator_id]
+        digest_aggregated_operators.signers_bitmap &= ~cd.operator_bits[operator_id]
+        if not digest_aggregated_operators.signers_operator_ids_set:
+            del cd.aggregated_operators_dict[task_response_digest]
+            return True
+
+        digest_aggregated_operators.signers_agg_sig_g1 = (
+            digest_aggregated_operators.signers_agg_sig_g1
+            - signed_task_response_digest.bls_signature
+        )
+        digest_aggregated_operators.signers_apk_g2 = (
+            digest_aggregated_operators.signers_apk_g2
+            - operator_avs_state.operator_info.pub_keys.g2_pub_key
+        )
+        for quorum_num, stake_amount in operator_avs_state.stake_per_quorum.items():
+            digest_aggregated_operators.signers_total_stake_per_quorum[
+                quorum_num
+            ] -= stake_amount
+        return True
+
+    def __aggregate_signature(
+        self,
+        cd: TaskListItem,
+        task_response_digest: any,
+        signed_task_response_digest: SignedTaskResponseDigest,
+    ):
+        operator_id = signed_task_response_digest.operator_id
+        bls_sign = signed_task_response_digest.bls_signature
+        operator_avs_state = cd.operators_avs_state_dict[operator_id]
 
-        task_response_digest = self.hash_function(task_response)
         if task_response_digest not in cd.aggregated_operators_dict:
-            digest_aggregated_operators: AggregatedOperators = AggregatedOperators(
+            cd.aggregated_operators_dict[task_response_digest] = AggregatedOperators(
                 signers_apk_g2=bls.new_zero_g2_point()
-                + operators_avs_state_dict[
-                    operator_id
-                ].operator_info.pub_keys.g2_pub_key,
+                + operator_avs_state.operator_info.pub_keys.g2_pub_key,
                 signers_agg_sig_g1=bls_sign,
                 signers_operator_ids_set={operator_id: True},
-                signers_total_stake_per_quorum=operators_avs_state_dict[
-                    operator_id
-                ].stake_per_quorum,
-            )
-        else:
-            digest_aggregated_operators: AggregatedOperators = (
-                cd.aggregated_operators_dict[task_response_digest]
+                signers_bitmap=cd.operator_bits[operator_id],
+                signers_total_stake_per_quorum=dict(
+                    operator_avs_state.stake_per_quorum
+                ),
             )
+            return
 
-            digest_aggregated_operators.signers_agg_sig_g1 = (
-                digest_aggregated_operators.signers_agg_sig_g1 + bls_sign
+        digest_aggregated_operators: AggregatedOperators = (
+            cd.aggregated_operators_dict[task_response_digest]
+        )
+        digest_aggregated_operators.signers_agg_sig_g1 = (
+            digest_aggregated_operators.signers_agg_sig_g1 + bls_sign
+        )
+        digest_aggregated_operators.signers_apk_g2 = (
+            digest_aggregated_operators.signers_apk_g2
+            + operator_avs_state.operator_info.pub_keys.g2_pub_key
+        )
+        digest_aggregated_operators.signers_operator_ids_set[operator_id] = True
+        digest_aggregated_operators.signers_bitmap |= cd.operator_bits[operator_id]
+        for quorum_num, stake_amount in operator_avs_state.stake_per_quorum.items():
+            digest_aggregated_operators.signers_total_stake_per_quorum[quorum_num] = (
+                digest_aggregated_operators.signers_total_stake_per_quorum.get(
+                    quorum_num, 0
+                )
+                + stake_amount
             )
-            digest_aggregated_operators.signers_apk_g2 = (
-                digest_aggregated_operators.signers_apk_g2
-                + operators_avs_state_dict[
-                    operator_id
-                ].operator_info.pub_keys.g2_pub_key
+
+    def __signed_stake_including_pending(
+        self, cd: TaskListItem, task_response_digest: any
+    ) -> dict[int, int]:
+        signed_stake_per_quorum = {}
+        if task_response_digest in cd.aggregated_operators_dict:
+            signed_stake_per_quorum.update(
+                cd.aggregated_operators_dict[
+                    task_response_digest
+                ].signers_total_stake_per_quorum
             )
-            digest_aggregated_operators.signers_operator_ids_set[operator_id] = True
-            for quorum_num, stake_amount in operators_avs_state_dict[
-                operator_id
+        for signed_task_response_digest in cd.pending_signatures.get(
+            task_response_digest, []
+        ):
+            for quorum_num, stake_amount in cd.operators_avs_state_dict[
+                signed_task_response_digest.operator_id
             ].stake_per_quorum.items():
-                if (
-                    digest_aggregated_operators.signers_total_stake_per_quorum[
-                        quorum_num
-                    ]
-                    is None
-                ):
-                    digest_aggregated_operators.signers_total_stake_per_quorum[
-                        quorum_num
-                    ] = 0
-                digest_aggregated_operators.signers_total_stake_per_quorum[
-                    quorum_num
-                ] += stake_amount
-        self.responses[task_index].aggregated_operators_dict[
-            task_response_digest
-        ] = digest_aggregated_operators
-
-        self.responses[task_index].signatures[operator_id] = bls_sign
-
-        if self.__stake_thresholds_met(
+                signed_stake_per_quorum[quorum_num] = (
+                    signed_stake_per_quorum.get(quorum_num, 0) + stake_amount
+                )
+        return signed_stake_per_quorum
+
+    def __non_signers_g1_pub_keys(
+        self, cd: TaskListItem, digest_aggregated_operators: AggregatedOperators
+    ) -> tuple[list[int], list[G1Point]]:
+        # non-signers are all operators minus the signers. bit i of the string below is
+        # operator i, so the ids are read in ascending order without sorting.
+        non_signers_bits = format(
+            ~digest_aggregated_operators.signers_bitmap
+            & ((1 << len(cd.sorted_operator_ids)) - 1),
+            "b",
+        )[::-1]
+        non_signers_operator_ids: list[int] = []
+        i = non_signers_bits.find("1")
+        while i >= 0:
+            non_signers_operator_ids.append(cd.sorted_operator_ids[i])
+            i = non_signers_bits.find("1", i + 1)
+
+        non_signers_g1_pub_keys: list[G1Point] = [
+            cd.operators_avs_state_dict[operator_id].operator_info.pub_keys.g1_pub_key
+            for operator_id in non_signers_operator_ids
+        ]
+        return non_signers_operator_ids, non_signers_g1_pub_keys
+
+    async def __complete_task_if_thresholds_met(
+        self, task_index: int, cd: TaskListItem, task_response_digest: any
+    ):
+        if self.responses.get(task_index) is not cd:
+            return
+        digest_aggregated_operators: AggregatedOperators = (
+            cd.aggregated_operators_dict.get(task_response_digest)
+        )
+        if digest_aggregated_operators is None:
+            return
+
+        if not self.__stake_thresholds_met(
             signed_stake_per_quorum=digest_aggregated_operators.signers_total_stake_per_quorum,
             total_stake_per_quorum=cd.total_stake_per_quorum,
             quorum_threshold_percentages_map=cd.quorum_threshold_percentages_map,
         ):
-            non_signers_operator_ids: list[int] = []
-            for operator_id in operators_avs_state_dict:
-                if (
-                    operator_id
-                    not in digest_aggregated_operators.signers_operator_ids_set
-                ):
-                    non_signers_operator_ids.append(operator_id)
-            non_signers_operator_ids.sort()
-
-            non_signers_g1_pub_keys: list[G1Point] = [
-                operators_avs_state_dict[operator_id].operator_info.pub_keys.g1_pub_key
-                for operator_id in non_signers_operator_ids
-            ]
+            return
 
-            indices = self.avs_registry_service.avs_registry_reader.get_check_signatures_indices(
-                cd.task_created_block,
-                cd.quorum_numbers,
-                non_signers_operator_ids,
-            )
+        # the task is done: later signatures are rejected and the expiry timer is stopped
+        del self.responses[task_index]
+        cd.expiry_timer.cancel()
+        self.__reject_pending_signatures(
+            cd, ValueError(f"Task {task_index} completed before the signature was verified")
+        )
+        self.__run_in_background(
+            self.__complete_task(task_index, cd, task_response_digest)
+        )
 
-            result = BlsAggregationServiceResponse(
-                task_index=task_index,
-                task_response=task_response,
-                task_response_digest=task_response_digest,
-                non_signers_pubkeys_g1=non_signers_g1_pub_keys,
-                quorum_apks_g1=cd.quorum_apks_g1,
-                signers_apk_g2=digest_aggregated_operators.signers_apk_g2,
-                signers_agg_sig_g1=digest_aggregated_operators.signers_agg_sig_g1,
-                non_signer_quorum_bitmap_indices=indices.non_signer_quorum_bitmap_indices,
-                quorum_apk_indices=indices.quorum_apk_indices,
-                total_stake_indices=indices.total_stake_indices,
-                non_signer_stake_indices=indices.non_signer_stake_indices,
-            )
-            del self.responses[task_index]
-            self.aggregated_responses.put(result)
+    async def __complete_task(
+        self, task_index: int, cd: TaskListItem, task_response_digest: any
+    ):
+        digest_aggregated_operators: AggregatedOperators = (
+            cd.aggregated_operators_dict[task_response_digest]
+        )
+        non_signers_operator_ids, non_signers_g1_pub_keys = (
+            self.__non_signers_g1_pub_keys(cd, digest_aggregated_operators)
+        )
 
-    def get_aggregated_responses(self):
-        while True:
-            response = self.aggregated_responses.get()
-            yield response
-            self.aggregated_responses.task_done()
+        indices = None
+        if cd.all_signed_indices is not None:
+            if not non_signers_operator_ids:
+                try:
+                    indices = await cd.all_signed_indices
+                except Exception:
+                    pass
+            else:
+                cd.all_signed_indices.cancel()
+        if indices is None:
+            try:
+                indices = await self.__get_check_signatures_indices(
+                    cd.task_created_block, cd.quorum_numbers, non_signers_operator_ids
+                )
+            except Exception as e:
+                self.__publish_response(
+                    BlsAggregationServiceResponse(err=e, task_index=task_index)
+                )
+                return
+
+        result = BlsAggregationServiceResponse(
+            err=None,
+            task_index=task_index,
+            task_response=cd.task_responses[task_response_digest],
+            task_response_digest=task_response_digest,
+            non_signers_pubkeys_g1=non_signers_g1_pub_keys,
+            quorum_apks_g1=cd.quorum_apks_g1,
+            signers_apk_g2=digest_aggregated_operators.signers_apk_g2,
+            signers_agg_sig_g1=digest_aggregated_operators.signers_agg_sig_g1,
+            non_signer_quorum_bitmap_indices=indices.non_signer_quorum_bitmap_indices,
+            quorum_apk_indices=indices.quorum_apk_indices,
+            total_stake_indices=indices.total_stake_indices,
+            non_signer_stake_indices=indices.non_signer_stake_indices,
+        )
+        self.__publish_response(result)
 
     def __stake_thresholds_met(
         self,
@@ -349,10 +938,10 @@ class BlsAggregationService(BlsAggregationServiceInterface):
             quorum_num,
             quorum_threshold_percentage,
         ) in quorum_threshold_percentages_map.items():
-            signed_stake_by_quorum = signed_stake_per_quorum[quorum_num]
+            signed_stake_by_quorum = signed_stake_per_quorum.get(quorum_num)
             if signed_stake_by_quorum is None:
                 return False
-            total_stake_by_quorum = total_stake_per_quorum[quorum_num]
+            total_stake_by_quorum = total_stake_per_quorum.get(quorum_num)
             if total_stake_by_quorum is None:
                 return False
             signed_stake = signed_stake_by_quorum * 100
@@ -361,7 +950,7 @@ class BlsAggregationService(BlsAggregationServiceInterface):
                 return False
         return True
 
-    def __verify_signature(
+    async def __verify_signature(
         self,
         task_index: int,
         signed_task_response_digest: SignedTaskResponseDigest,
@@ -385,6 +974,9 @@ class BlsAggregationService(BlsAggregationServiceInterface):
             )
 
         signature = signed_task_response_digest.bls_signature
-        verified = signature.verify(operator_g2_pub_key, task_response_digest)
+        verified = await self.__call_signature_verifier(
+            self.signature_verifier.verify,
+            signature, operator_g2_pub_key, task_response_digest
+        )
         if not verified:
             raise ValueError("Incorrect signature error")
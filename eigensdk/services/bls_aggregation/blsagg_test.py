@@ -1,4 +1,6 @@
 import asyncio
+import gc
+import threading
 import unittest
 from eigensdk.crypto.bls.attestation import (
     KeyPair,
@@ -6,7 +8,9 @@ from eigensdk.crypto.bls.attestation import (
     new_g1_point,
     new_zero_g1_point,
 )
+from eigensdk.crypto.bn256 import utils as bn256Utils
 from .blsagg import BlsAggregationService, BlsAggregationServiceResponse
+from .verifier import InlineSignatureVerifier
 from eigensdk.services.avsregistry.avsregistry_fake import (
     FakeAvsRegistryService,
     TestOperator,
@@ -30,6 +34,67 @@ async def run_delayed(delay, instance, method_name, *args):
     await method(*args)
 
 
+class RecordingAvsRegistryService(FakeAvsRegistryService):
+    # records the non-signers of every get_check_signatures_indices call
+    def __init__(self, block_number: int, operators: list[TestOperator]) -> None:
+        super().__init__(block_number, operators)
+        self.check_signatures_indices_calls = []
+
+    async def get_check_signatures_indices(
+        self, reference_block_number, quorum_numbers, non_signer_operator_ids
+    ):
+        self.check_signatures_indices_calls.append(list(non_signer_operator_ids))
+        return await super().get_check_signatures_indices(
+            reference_block_number, quorum_numbers, non_signer_operator_ids
+        )
+
+
+class FlakyAvsRegistryService(FakeAvsRegistryService):
+    # fails the first get_check_signatures_indices calls and tracks how many run at once
+    def __init__(
+        self, block_number: int, operators: list[TestOperator], failures: int = 0
+    ) -> None:
+        super().__init__(block_number, operators)
+        self.failures = failures
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_check_signatures_indices(
+        self, reference_block_number, quorum_numbers, non_signer_operator_ids
+    ):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.05)
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("rpc unavailable")
+            return await super().get_check_signatures_indices(
+                reference_block_number, quorum_numbers, non_signer_operator_ids
+            )
+        finally:
+            self.in_flight -= 1
+
+
+class RecordingSignatureVerifier(InlineSignatureVerifier):
+    # records every check with its result and the threads the checks ran on
+    def __init__(self) -> None:
+        self.calls = []
+        self.threads = set()
+
+    def verify(self, signature, pub_key, msg_bytes):
+        future = super().verify(signature, pub_key, msg_bytes)
+        self.calls.append(("verify", future.result()))
+        self.threads.add(threading.current_thread())
+        return future
+
+    def find_invalid_sigs(self, signatures, pub_keys, msg_bytes):
+        future = super().find_invalid_sigs(signatures, pub_keys, msg_bytes)
+        self.calls.append(("find_invalid_sigs", future.result()))
+        self.threads.add(threading.current_thread())
+        return future
+
+
 class TestBlsAggregationService(unittest.IsolatedAsyncioTestCase):
     time_to_expire_task = 3  # secound
 
@@ -640,8 +705,31 @@ class TestBlsAggregationService(unittest.IsolatedAsyncioTestCase):
     # async def test_case_12(self):
     # 	"""2 quorums 2 operators, 1 operator which just stake one quorum; 1 signatures - task expired"""
 
-    # async def test_case_13(self):
-    # 	"""send signature of task that isn't initialized - task not found error"""
+    async def test_case_13(self):
+        """send signature of task that isn't initialized - task not found error"""
+
+        operator_1 = TestOperator(
+            operator_id=1,
+            stake_per_quorum={1: 100, 2: 200},
+            bls_key_pair=KeyPair.from_string("01"),
+        )
+        task_response = "sample text response"
+        fake_avs_registry_service = FakeAvsRegistryService(1, [operator_1])
+        bls_aggregation_service = BlsAggregationService(
+            fake_avs_registry_service, hash_function
+        )
+
+        with self.assertRaises(ValueError):
+            await bls_aggregation_service.process_new_signature(
+                task_index=1,
+                task_response=task_response,
+                bls_sign=operator_1.bls_key_pair.sign_message(
+                    hash_function(task_response)
+                ),
+                operator_id=operator_1.operator_id,
+            )
+        _, err = await bls_aggregation_service.get_aggregated_response(1)
+        self.assertIsInstance(err, ValueError)
 
     # async def test_case_14(self):
     # 	"""send new signedTaskDigest before listen on responseChan - context timeout cancels the request to prevent deadlock"""
@@ -651,3 +739,619 @@ class TestBlsAggregationService(unittest.IsolatedAsyncioTestCase):
 
     # async def test_case_16(self):
     # 	"""1 quorum 1 operator 1 invalid signature (TaskResponseDigest does not match TaskResponse)"""
+
+    async def test_expired_task_partial_aggregate_is_streamed(self):
+        """1 quorum 2 operator 1 correct signature quorumThreshold 100% - expiry response holds the partial aggregate"""
+
+        operator_1 = TestOperator(
+            operator_id=1,
+            stake_per_quorum={1: 100, 2: 200},
+            bls_key_pair=KeyPair.from_string("01"),
+        )
+        operator_2 = TestOperator(
+            operator_id=2,
+            stake_per_quorum={1: 100, 2: 200},
+            bls_key_pair=KeyPair.from_string("02"),
+        )
+        task_index = 1
+        task_response = "sample text response"
+        task_response_digest = hash_function(task_response)
+        bls_sign = operator_1.bls_key_pair.sign_message(task_response_digest)
+
+        fake_avs_registry_service = FakeAvsRegistryService(1, [operator_1, operator_2])
+        bls_aggregation_service = BlsAggregationService(
+            fake_avs_registry_service, hash_function
+        )
+        responses = bls_aggregation_service.get_aggregated_responses()
+        next_response = asyncio.ensure_future(responses.__anext__())
+        await asyncio.sleep(0)
+
+        await bls_aggregation_service.initialize_new_task(
+            task_index=task_index,
+            task_created_block=1,
+            quorum_numbers=[1],
+            quorum_threshold_percentages=[100],
+            time_to_expiry=1,
+        )
+        await bls_aggregation_service.process_new_signature(
+            task_index=task_index,
+            task_response=task_response,
+            bls_sign=bls_sign,
+            operator_id=operator_1.operator_id,
+        )
+
+        response = await asyncio.wait_for(next_response, self.time_to_expire_task)
+        await responses.aclose()
+        self.assertIsInstance(response.err, asyncio.TimeoutError)
+        self.assertEqual(response.task_index, task_index)
+        self.assertEqual(response.task_response, task_response)
+        self.assertEqual(response.signers_agg_sig_g1, bls_sign)
+        self.assertEqual(
+            response.non_signers_pubkeys_g1, [operator_2.bls_key_pair.pub_g1]
+        )
+        with self.assertRaises(ValueError):
+            await bls_aggregation_service.process_new_signature(
+                task_index=task_index,
+                task_response=task_response,
+                bls_sign=operator_2.bls_key_pair.sign_message(task_response_digest),
+                operator_id=operator_2.operator_id,
+            )
+
+    async def test_all_signed_task_uses_prefetched_indices(self):
+        """1 quorum 2 operators 2 signatures - indices are fetched once, at initialization"""
+
+        operators = [
+            TestOperator(
+                operator_id=i,
+                stake_per_quorum={1: 100},
+                bls_key_pair=KeyPair.from_string(f"{i:02x}"),
+            )
+            for i in (1, 2)
+        ]
+        task_response = "sample text response"
+        task_response_digest = hash_function(task_response)
+        fake_avs_registry_service = RecordingAvsRegistryService(1, operators)
+        bls_aggregation_service = BlsAggregationService(
+            fake_avs_registry_service, hash_function
+        )
+
+        await bls_aggregation_service.initialize_new_task(
+            task_index=1,
+            task_created_block=1,
+            quorum_numbers=[1],
+            quorum_threshold_percentages=[100],
+            time_to_expiry=self.time_to_expire_task,
+        )
+        for operator in operators:
+            await bls_aggregation_service.process_new_signature(
+                task_index=1,
+                task_response=task_response,
+                bls_sign=operator.bls_key_pair.sign_message(task_response_digest),
+                operator_id=operator.operator_id,
+            )
+
+        response, err = await bls_aggregation_service.get_aggregated_response(1)
+        self.assertIsNone(err)
+        self.assertIsNone(response.err)
+        self.assertEqual(response.non_signers_pubkeys_g1, [])
+        self.assertEqual(fake_avs_registry_service.check_signatures_indices_calls, [[]])
+
+    async def test_non_signers_are_sorted(self):
+        """1 quorum 4 operators 2 signatures quorumThreshold 50% - non-signers in id order"""
+
+        operators = [
+            TestOperator(
+                operator_id=i,
+                stake_per_quorum={1: 100},
+                bls_key_pair=KeyPair.from_string(f"{i:02x}"),
+            )
+            for i in (4, 1, 3, 2)
+        ]
+        task_response = "sample text response"
+        task_response_digest = hash_function(task_response)
+        fake_avs_registry_service = RecordingAvsRegistryService(1, operators)
+        bls_aggregation_service = BlsAggregationService(
+            fake_avs_registry_service, hash_function
+        )
+
+        await bls_aggregation_service.initialize_new_task(
+            task_index=1,
+            task_created_block=1,
+            quorum_numbers=[1],
+            quorum_threshold_percentages=[50],
+            time_to_expiry=self.time_to_expire_task,
+        )
+        for operator in operators[:3:2]:
+            await bls_aggregation_service.process_new_signature(
+                task_index=1,
+                task_response=task_response,
+                bls_sign=operator.bls_key_pair.sign_message(task_response_digest),
+                operator_id=operator.operator_id,
+            )
+
+        response, err = await bls_aggregation_service.get_aggregated_response(1)
+        self.assertIsNone(err)
+        self.assertIsNone(response.err)
+        self.assertEqual(
+            response.non_signers_pubkeys_g1,
+            [operators[i].bls_key_pair.pub_g1 for i in (1, 3)],
+        )
+        self.assertEqual(
+            fake_avs_registry_service.check_signatures_indices_calls[-1], [1, 2]
+        )
+
+    async def test_completion_is_retried_and_bounded(self):
+        """5 tasks 1 operator - index reads are retried and run at most 2 at once"""
+
+        operator_1 = TestOperator(
+            operator_id=1,
+            stake_per_quorum={1: 100},
+            bls_key_pair=KeyPair.from_string("01"),
+        )
+        fake_avs_registry_service = FlakyAvsRegistryService(1, [operator_1], failures=2)
+        bls_aggregation_service = BlsAggregationService(
+            fake_avs_registry_service,
+            hash_function,
+            prefetch_all_signed_indices=False,
+            completion_concurrency=2,
+            completion_retries=2,
+            completion_retry_delay=0.01,
+        )
+
+        task_indices = range(1, 6)
+        for task_index in task_indices:
+            await bls_aggregation_service.initialize_new_task(
+                task_index=task_index,
+                task_created_block=1,
+                quorum_numbers=[1],
+                quorum_threshold_percentages=[100],
+                time_to_expiry=60,
+            )
+        task_response = "sample text response"
+        bls_sign = operator_1.bls_key_pair.sign_message(hash_function(task_response))
+        for task_index in task_indices:
+            # returns once the signature is aggregated, before the task is completed
+            await bls_aggregation_service.process_new_signature(
+                task_index=task_index,
+                task_response=task_response,
+                bls_sign=bls_sign,
+                operator_id=operator_1.operator_id,
+            )
+
+        for task_index in task_indices:
+            response, err = await bls_aggregation_service.get_aggregated_response(
+                task_index
+            )
+            self.assertIsNone(err)
+            self.assertIsNone(response.err)
+        self.assertEqual(fake_avs_registry_service.failures, 0)
+        self.assertEqual(fake_avs_registry_service.max_in_flight, 2)
+
+    async def test_completion_error_after_retries(self):
+        """1 quorum 1 operator - the error of the last retry is published"""
+
+        operator_1 = TestOperator(
+            operator_id=1,
+            stake_per_quorum={1: 100},
+            bls_key_pair=KeyPair.from_string("01"),
+        )
+        fake_avs_registry_service = FlakyAvsRegistryService(1, [operator_1], failures=3)
+        bls_aggregation_service = BlsAggregationService(
+            fake_avs_registry_service,
+            hash_function,
+            prefetch_all_signed_indices=False,
+            completion_retries=1,
+            completion_retry_delay=0.01,
+        )
+        await bls_aggregation_service.initialize_new_task(
+            task_index=1,
+            task_created_block=1,
+            quorum_numbers=[1],
+            quorum_threshold_percentages=[100],
+            time_to_expiry=self.time_to_expire_task,
+        )
+        task_response = "sample text response"
+        await bls_aggregation_service.process_new_signature(
+            task_index=1,
+            task_response=task_response,
+            bls_sign=operator_1.bls_key_pair.sign_message(hash_function(task_response)),
+            operator_id=operator_1.operator_id,
+        )
+
+        response, err = await bls_aggregation_service.get_aggregated_response(1)
+        self.assertIsNone(err)
+        self.assertIsInstance(response.err, ConnectionError)
+        self.assertEqual(fake_avs_registry_service.failures, 1)
+
+    async def test_batch_error_goes_to_the_bad_signer(self):
+        """1 quorum 4 operators batch of 3 with 1 bad signature - only its caller gets the error"""
+
+        operators = [
+            TestOperator(
+                operator_id=i,
+                stake_per_quorum={1: 100},
+                bls_key_pair=KeyPair.from_string(f"{i:02x}"),
+            )
+            for i in range(1, 5)
+        ]
+        task_response = "sample text response"
+        task_response_digest = hash_function(task_response)
+        bls_aggregation_service = BlsAggregationService(
+            FakeAvsRegistryService(1, operators),
+            hash_function,
+            verification_batch_size=3,
+        )
+        await bls_aggregation_service.initialize_new_task(
+            task_index=1,
+            task_created_block=1,
+            quorum_numbers=[1],
+            quorum_threshold_percentages=[100],
+            time_to_expiry=60,
+        )
+        signatures = [
+            operator.bls_key_pair.sign_message(task_response_digest)
+            for operator in operators
+        ]
+        bad_sign = operators[0].bls_key_pair.sign_message(hash_function("other"))
+
+        # the last call fills the batch and triggers its verification
+        results = await asyncio.gather(
+            *(
+                bls_aggregation_service.process_new_signature(
+                    task_index=1,
+                    task_response=task_response,
+                    bls_sign=bls_sign,
+                    operator_id=operator.operator_id,
+                )
+                for operator, bls_sign in zip(
+                    operators[:3], [signatures[0], bad_sign, signatures[2]]
+                )
+            ),
+            return_exceptions=True,
+        )
+        self.assertIsNone(results[0])
+        self.assertIsInstance(results[1], ValueError)
+        self.assertIsNone(results[2])
+
+        # the bad signer can sign again, the last signature meets the threshold
+        await asyncio.gather(
+            *(
+                bls_aggregation_service.process_new_signature(
+                    task_index=1,
+                    task_response=task_response,
+                    bls_sign=signatures[i],
+                    operator_id=operators[i].operator_id,
+                )
+                for i in (1, 3)
+            )
+        )
+
+        response, err = await bls_aggregation_service.get_aggregated_response(1)
+        self.assertIsNone(err)
+        self.assertIsNone(response.err)
+        self.assertEqual(response.non_signers_pubkeys_g1, [])
+        agg_sig = signatures[0] + signatures[1] + signatures[2] + signatures[3]
+        self.assertEqual(response.signers_agg_sig_g1, agg_sig)
+
+    async def test_partial_batch_is_verified_after_linger(self):
+        """1 quorum 2 operators batch of 3 - a lone signature does not wait for the task to expire"""
+
+        operators = [
+            TestOperator(
+                operator_id=i,
+                stake_per_quorum={1: 100},
+                bls_key_pair=KeyPair.from_string(f"{i:02x}"),
+            )
+            for i in range(1, 3)
+        ]
+        task_response = "sample text response"
+        task_response_digest = hash_function(task_response)
+        signature_verifier = RecordingSignatureVerifier()
+        bls_aggregation_service = BlsAggregationService(
+            FakeAvsRegistryService(1, operators),
+            hash_function,
+            verification_batch_size=3,
+            signature_verifier=signature_verifier,
+            verification_batch_linger=0.01,
+        )
+        await bls_aggregation_service.initialize_new_task(
+            task_index=1,
+            task_created_block=1,
+            quorum_numbers=[1],
+            quorum_threshold_percentages=[100],
+            time_to_expiry=60,
+        )
+        bad_sign = operators[0].bls_key_pair.sign_message(hash_function("other"))
+        with self.assertRaises(ValueError):
+            await asyncio.wait_for(
+                bls_aggregation_service.process_new_signature(
+                    task_index=1,
+                    task_response=task_response,
+                    bls_sign=bad_sign,
+                    operator_id=operators[0].operator_id,
+                ),
+                30,
+            )
+        self.assertEqual(signature_verifier.calls, [("find_invalid_sigs", [0])])
+
+    async def test_batch_verifier_error_is_retrieved(self):
+        """1 quorum 2 operators batch of 2 - every caller gets the error of a failed check"""
+
+        class FailingSignatureVerifier(InlineSignatureVerifier):
+            def find_invalid_sigs(self, signatures, pub_keys, msg_bytes):
+                raise RuntimeError("verifier unavailable")
+
+        operators = [
+            TestOperator(
+                operator_id=i,
+                stake_per_quorum={1: 100},
+                bls_key_pair=KeyPair.from_string(f"{i:02x}"),
+            )
+            for i in range(1, 3)
+        ]
+        task_response = "sample text response"
+        task_response_digest = hash_function(task_response)
+        bls_aggregation_service = BlsAggregationService(
+            FakeAvsRegistryService(1, operators),
+            hash_function,
+            verification_batch_size=2,
+            signature_verifier=FailingSignatureVerifier(),
+        )
+        await bls_aggregation_service.initialize_new_task(
+            task_index=1,
+            task_created_block=1,
+            quorum_numbers=[1],
+            quorum_threshold_percentages=[100],
+            time_to_expiry=60,
+        )
+        loop_errors = []
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: loop_errors.append(context)
+        )
+
+        results = await asyncio.gather(
+            *(
+                bls_aggregation_service.process_new_signature(
+                    task_index=1,
+                    task_response=task_response,
+                    bls_sign=operator.bls_key_pair.sign_message(task_response_digest),
+                    operator_id=operator.operator_id,
+                )
+                for operator in operators
+            ),
+            return_exceptions=True,
+        )
+        self.assertEqual([type(r) for r in results], [RuntimeError] * 2)
+        # let the finished callers release their frames before collecting them
+        del results
+        await asyncio.sleep(0)
+        gc.collect()
+        # no future was left with an exception nobody retrieved
+        self.assertEqual(loop_errors, [])
+
+    async def test_optimistic_verification_evicts_bad_signers(self):
+        """1 quorum 4 operators quorumThreshold 50% with 1 bad signature - the signers are checked one by one"""
+
+        operators = [
+            TestOperator(
+                operator_id=i,
+                stake_per_quorum={1: 100},
+                bls_key_pair=KeyPair.from_string(f"{i:02x}"),
+            )
+            for i in range(1, 5)
+        ]
+        task_response = "sample text response"
+        task_response_digest = hash_function(task_response)
+        signature_verifier = RecordingSignatureVerifier()
+        bls_aggregation_service = BlsAggregationService(
+            FakeAvsRegistryService(1, operators),
+            hash_function,
+            optimistic_verification=True,
+            signature_verifier=signature_verifier,
+        )
+        await bls_aggregation_service.initialize_new_task(
+            task_index=1,
+            task_created_block=1,
+            quorum_numbers=[1],
+            quorum_threshold_percentages=[50],
+            time_to_expiry=60,
+        )
+        signatures = [
+            operator.bls_key_pair.sign_message(task_response_digest)
+            for operator in operators
+        ]
+
+        bad_signs = [
+            operator.bls_key_pair.sign_message(hash_function("other"))
+            for operator in operators
+        ]
+
+        # aggregated without any check, the threshold is not met yet
+        await bls_aggregation_service.process_new_signature(
+            task_index=1,
+            task_response=task_response,
+            bls_sign=bad_signs[0],
+            operator_id=operators[0].operator_id,
+        )
+        self.assertEqual(signature_verifier.calls, [])
+
+        # the aggregate check fails, so the two signers are checked one by one. the bad
+        # signer is evicted without failing the call of the correct one.
+        with self.assertLogs(bls_aggregation_service.logger, "WARNING"):
+            await bls_aggregation_service.process_new_signature(
+                task_index=1,
+                task_response=task_response,
+                bls_sign=signatures[1],
+                operator_id=operators[1].operator_id,
+            )
+        self.assertEqual(
+            signature_verifier.calls, [("verify", False), ("find_invalid_sigs", [0])]
+        )
+
+        # the call of a bad signature checked right away gets the error
+        with self.assertRaises(ValueError):
+            await bls_aggregation_service.process_new_signature(
+                task_index=1,
+                task_response=task_response,
+                bls_sign=bad_signs[2],
+                operator_id=operators[2].operator_id,
+            )
+        self.assertEqual(
+            signature_verifier.calls[2:], [("verify", False), ("find_invalid_sigs", [0])]
+        )
+
+        # the evicted signers do not count toward the threshold anymore, and can sign again
+        await bls_aggregation_service.process_new_signature(
+            task_index=1,
+            task_response=task_response,
+            bls_sign=signatures[0],
+            operator_id=operators[0].operator_id,
+        )
+        self.assertEqual(signature_verifier.calls[4:], [("verify", True)])
+
+        response, err = await bls_aggregation_service.get_aggregated_response(1)
+        self.assertIsNone(err)
+        self.assertIsNone(response.err)
+        self.assertEqual(response.signers_agg_sig_g1, signatures[0] + signatures[1])
+        self.assertEqual(
+            response.non_signers_pubkeys_g1,
+            [operators[i].bls_key_pair.pub_g1 for i in (2, 3)],
+        )
+        self.assertTrue(
+            bn256Utils.verify_sig(
+                response.signers_agg_sig_g1,
+                response.signers_apk_g2,
+                task_response_digest,
+            )
+        )
+
+    async def test_optimistic_verification_checks_the_aggregate_once(self):
+        """1 quorum 3 operators quorumThreshold 50% - signatures arriving together share one check"""
+
+        operators = [
+            TestOperator(
+                operator_id=i,
+                stake_per_quorum={1: 100},
+                bls_key_pair=KeyPair.from_string(f"{i:02x}"),
+            )
+            for i in range(1, 4)
+        ]
+        task_response = "sample text response"
+        task_response_digest = hash_function(task_response)
+        signature_verifier = RecordingSignatureVerifier()
+        bls_aggregation_service = BlsAggregationService(
+            FakeAvsRegistryService(1, operators),
+            hash_function,
+            optimistic_verification=True,
+            signature_verifier=signature_verifier,
+        )
+        await bls_aggregation_service.initialize_new_task(
+            task_index=1,
+            task_created_block=1,
+            quorum_numbers=[1],
+            quorum_threshold_percentages=[50],
+            time_to_expiry=60,
+        )
+        await asyncio.gather(
+            *(
+                bls_aggregation_service.process_new_signature(
+                    task_index=1,
+                    task_response=task_response,
+                    bls_sign=operator.bls_key_pair.sign_message(task_response_digest),
+                    operator_id=operator.operator_id,
+                )
+                for operator in operators
+            )
+        )
+        self.assertEqual(signature_verifier.calls, [("verify", True)])
+
+        response, err = await bls_aggregation_service.get_aggregated_response(1)
+        self.assertIsNone(err)
+        self.assertIsNone(response.err)
+        self.assertEqual(response.non_signers_pubkeys_g1, [])
+
+    async def test_responses_are_streamed_without_a_subscriber(self):
+        """1 quorum 1 operator - a response published before iterating is streamed"""
+
+        operator_1 = TestOperator(
+            operator_id=1,
+            stake_per_quorum={1: 100},
+            bls_key_pair=KeyPair.from_string("01"),
+        )
+        signature_verifier = RecordingSignatureVerifier()
+        bls_aggregation_service = BlsAggregationService(
+            FakeAvsRegistryService(1, [operator_1]),
+            hash_function,
+            signature_verifier=signature_verifier,
+        )
+        await bls_aggregation_service.initialize_new_task(
+            task_index=1,
+            task_created_block=1,
+            quorum_numbers=[1],
+            quorum_threshold_percentages=[100],
+            time_to_expiry=self.time_to_expire_task,
+        )
+        task_response = "sample text response"
+        await bls_aggregation_service.process_new_signature(
+            task_index=1,
+            task_response=task_response,
+            bls_sign=operator_1.bls_key_pair.sign_message(hash_function(task_response)),
+            operator_id=operator_1.operator_id,
+        )
+        # the pairing check did not run on the event loop
+        self.assertNotIn(threading.current_thread(), signature_verifier.threads)
+
+        response, err = await bls_aggregation_service.get_aggregated_response(1)
+        self.assertIsNone(err)
+        self.assertIsNone(response.err)
+        # nothing is kept for the completed task once its response is retrieved
+        self.assertEqual(bls_aggregation_service._response_futures, {})
+        self.assertEqual(len(bls_aggregation_service._completed_responses), 0)
+
+        responses = bls_aggregation_service.get_aggregated_responses()
+        streamed = await asyncio.wait_for(responses.__anext__(), 1)
+        await responses.aclose()
+        self.assertIs(streamed, response)
+
+    async def test_unstreamed_responses_are_bounded(self):
+        """1 quorum 1 operator 3 tasks - only the newest responses are kept for streaming"""
+
+        operator_1 = TestOperator(
+            operator_id=1,
+            stake_per_quorum={1: 100},
+            bls_key_pair=KeyPair.from_string("01"),
+        )
+        bls_aggregation_service = BlsAggregationService(
+            FakeAvsRegistryService(1, [operator_1]),
+            hash_function,
+            completed_responses_size=2,
+        )
+        task_response = "sample text response"
+        for task_index in range(1, 4):
+            await bls_aggregation_service.initialize_new_task(
+                task_index=task_index,
+                task_created_block=1,
+                quorum_numbers=[1],
+                quorum_threshold_percentages=[100],
+                time_to_expiry=self.time_to_expire_task,
+            )
+            await bls_aggregation_service.process_new_signature(
+                task_index=task_index,
+                task_response=task_response,
+                bls_sign=operator_1.bls_key_pair.sign_message(
+                    hash_function(task_response)
+                ),
+                operator_id=operator_1.operator_id,
+            )
+            response, err = await bls_aggregation_service.get_aggregated_response(
+                task_index
+            )
+            self.assertIsNone(response.err)
+
+        self.assertEqual(bls_aggregation_service.aggregated_responses.qsize(), 2)
+        responses = bls_aggregation_service.get_aggregated_responses()
+        streamed = [
+            await asyncio.wait_for(responses.__anext__(), 1) for _ in range(2)
+        ]
+        await responses.aclose()
+        self.assertEqual([r.task_index for r in streamed], [2, 3])
@@ -0,0 +1,110 @@
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+from mcl import G1, G2
+
+from eigensdk.crypto.bls.attestation import (
+    G1Point,
+    G2Point,
+    g1_points_from_bytes,
+    g1_points_to_bytes,
+    g2_points_from_bytes,
+    g2_points_to_bytes,
+)
+from eigensdk.crypto.bn256 import utils as bn256Utils
+
+
+# SignatureVerifier is the backend BlsAggregationService uses for the pairing checks.
+# Every check returns a concurrent.futures.Future so that backends can run them off the
+# caller's thread.
+class SignatureVerifier(ABC):
+    # whether the checks run on the caller's thread, the returned futures are then completed
+    inline: bool = False
+
+    # Verify resolves to whether signature is a valid signature of msg_bytes by pub_key
+    @abstractmethod
+    def verify(self, signature: G1, pub_key: G2, msg_bytes: bytes) -> Future: ...
+
+    # FindInvalidSigs resolves to the indices of the signatures that are not valid signatures
+    # of msg_bytes by the public key at the same index
+    @abstractmethod
+    def find_invalid_sigs(
+        self, signatures: list[G1], pub_keys: list[G2], msg_bytes: bytes
+    ) -> Future: ...
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _completed_future(fn, *args) -> Future:
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+# InlineSignatureVerifier runs the checks on the caller's thread and returns completed futures
+class InlineSignatureVerifier(SignatureVerifier):
+    inline = True
+
+    def verify(self, signature: G1, pub_key: G2, msg_bytes: bytes) -> Future:
+        return _completed_future(bn256Utils.verify_sig, signature, pub_key, msg_bytes)
+
+    def find_invalid_sigs(
+        self, signatures: list[G1], pub_keys: list[G2], msg_bytes: bytes
+    ) -> Future:
+        return _completed_future(
+            bn256Utils.find_invalid_sigs, signatures, pub_keys, msg_bytes
+        )
+
+
+def _verify_serialized(signature: bytes, pub_key: bytes, msg_bytes: bytes) -> bool:
+    return bn256Utils.verify_sig(
+        G1Point.from_bytes(signature), G2Point.from_bytes(pub_key), msg_bytes
+    )
+
+
+def _find_invalid_sigs_serialized(
+    signatures: bytes, pub_keys: bytes, msg_bytes: bytes
+) -> list[int]:
+    return bn256Utils.find_invalid_sigs(
+        g1_points_from_bytes(signatures), g2_points_from_bytes(pub_keys), msg_bytes
+    )
+
+
+# ProcessPoolSignatureVerifier runs the checks in a pool of worker processes so that
+# verification throughput scales with the number of cores. Points cross the process
+# boundary in their compressed binary encoding, a batch as a single bytes object.
+class ProcessPoolSignatureVerifier(SignatureVerifier):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        executor: Optional[ProcessPoolExecutor] = None,
+    ) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = executor or ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def verify(self, signature: G1, pub_key: G2, msg_bytes: bytes) -> Future:
+        return self.executor.submit(
+            _verify_serialized,
+            signature.serialize(),
+            pub_key.serialize(),
+            bytes(msg_bytes),
+        )
+
+    def find_invalid_sigs(
+        self, signatures: list[G1], pub_keys: list[G2], msg_bytes: bytes
+    ) -> Future:
+        return self.executor.submit(
+            _find_invalid_sigs_serialized,
+            g1_points_to_bytes(signatures),
+            g2_points_to_bytes(pub_keys),
+            bytes(msg_bytes),
+        )
+
+    def shutdown(self) -> None:
+        self.executor.shutdown()
@@ -0,0 +1,37 @@
+import unittest
+from eigensdk.crypto.bls.attestation import KeyPair
+from .verifier import InlineSignatureVerifier, ProcessPoolSignatureVerifier
+
+
+class TestSignatureVerifiers(unittest.TestCase):
+    msg = b"\x01" * 32
+
+    def setUp(self):
+        self.key_pairs = [KeyPair.from_string(f"{i:02x}") for i in range(1, 4)]
+        self.pub_keys = [kp.pub_g2 for kp in self.key_pairs]
+        self.sigs = [kp.sign_message(self.msg) for kp in self.key_pairs]
+        self.sigs[2] = self.key_pairs[2].sign_message(b"\x02" * 32)
+
+    def check_verifier(self, verifier):
+        self.assertTrue(
+            verifier.verify(self.sigs[0], self.pub_keys[0], self.msg).result()
+        )
+        self.assertFalse(
+            verifier.verify(self.sigs[0], self.pub_keys[1], self.msg).result()
+        )
+        self.assertEqual(
+            verifier.find_invalid_sigs(self.sigs, self.pub_keys, self.msg).result(),
+            [2],
+        )
+
+    def test_inline_verifier(self):
+        self.check_verifier(InlineSignatureVerifier())
+
+    def test_process_pool_verifier(self):
+        """points should survive serialization across the process boundary"""
+
+        verifier = ProcessPoolSignatureVerifier(max_workers=2)
+        try:
+            self.check_verifier(verifier)
+        finally:
+            verifier.shutdown()
@@ -0,0 +1,242 @@
+import json
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from eth_typing import Address
+
+from eigensdk._types import OperatorPubkeys
+from eigensdk.crypto.bls.attestation import (
+    G1Point,
+    G2Point,
+    g1_to_bytes,
+    g2_to_bytes,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS operator_pubkeys (
+    operator_id BLOB PRIMARY KEY,
+    operator_addr TEXT NOT NULL,
+    g1_pub_key BLOB NOT NULL,
+    g2_pub_key BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS operator_sockets (
+    operator_id BLOB PRIMARY KEY,
+    socket TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scan_state (
+    name TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scanned_ranges (
+    from_block INTEGER PRIMARY KEY,
+    to_block INTEGER NOT NULL,
+    to_block_hash BLOB NOT NULL,
+    pubkey_undo TEXT NOT NULL,
+    socket_undo TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class _ScannedRange:
+    # blocks indexed by one scan, with what is needed to undo it if the range is reorged out
+    from_block: int
+    to_block: int
+    to_block_hash: bytes
+    # (operator address, previous operator id, previous pubkeys of the new operator id, new operator id)
+    pubkey_undo: List[Tuple[Address, Optional[bytes], Optional[OperatorPubkeys], bytes]] = field(
+        default_factory=list
+    )
+    # (operator id, previous socket)
+    socket_undo: List[Tuple[bytes, Optional[str]]] = field(default_factory=list)
+
+
+class OperatorsInfoCheckpoint:
+    # OperatorsInfoCheckpoint persists the operator registrations indexed by
+    # OperatorsInfoServiceInMemory in a SQLite file, together with the next blocks to scan,
+    # so that a restarted service only has to scan the blocks produced since.
+    # pubkeys are stored in their uncompressed binary encoding, which does not depend on
+    # mcl's serialization format, and operator ids are stored instead of being derived
+    # again from the G1 pubkeys.
+    # the undo data of the recent scans is stored as well, so that a restarted service
+    # still rolls back the blocks indexed before the restart if they are reorged out.
+    def __init__(self, path: str):
+        self.path: str = path
+        with closing(self.__connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def __connect(self) -> sqlite3.Connection:
+        # a connection per call, the service updates the checkpoint from its own thread
+        return sqlite3.connect(self.path)
+
+    def load(
+        self,
+    ) -> Tuple[
+        Dict[bytes, OperatorPubkeys], Dict[Address, bytes], Dict[bytes, str], int, int
+    ]:
+        pubkey_dict: Dict[bytes, OperatorPubkeys] = {}
+        operator_addr_to_id: Dict[Address, bytes] = {}
+        socket_dict: Dict[bytes, str] = {}
+        with closing(self.__connect()) as conn:
+            for operator_id, operator_addr, g1, g2 in conn.execute(
+                "SELECT operator_id, operator_addr, g1_pub_key, g2_pub_key FROM operator_pubkeys"
+            ):
+                pubkey_dict[operator_id] = OperatorPubkeys(
+                    g1_pub_key=G1Point.from_bytes(g1),
+                    g2_pub_key=G2Point.from_bytes(g2),
+                )
+                operator_addr_to_id[operator_addr] = operator_id
+            for operator_id, socket in conn.execute(
+                "SELECT operator_id, socket FROM operator_sockets"
+            ):
+                socket_dict[operator_id] = socket
+            scan_state = dict(
+                conn.execute("SELECT name, block_number FROM scan_state").fetchall()
+            )
+        return (
+            pubkey_dict,
+            operator_addr_to_id,
+            socket_dict,
+            scan_state.get("pubkeys", 0),
+            scan_state.get("sockets", 0),
+        )
+
+    def load_scanned_ranges(self) -> List[_ScannedRange]:
+        # oldest first, like OperatorsInfoServiceInMemory.scanned_ranges
+        with closing(self.__connect()) as conn:
+            rows = conn.execute(
+                "SELECT from_block, to_block, to_block_hash, pubkey_undo, socket_undo "
+                "FROM scanned_ranges ORDER BY from_block"
+            ).fetchall()
+        return [
+            _ScannedRange(
+                from_block=from_block,
+                to_block=to_block,
+                to_block_hash=to_block_hash,
+                pubkey_undo=[
+                    (
+                        operator_addr,
+                        _from_hex(prev_operator_id),
+                        _pub_keys_from_hex(prev_pub_keys),
+                        bytes.fromhex(operator_id),
+                    )
+                    for operator_addr, prev_operator_id, prev_pub_keys, operator_id in (
+                        json.loads(pubkey_undo)
+                    )
+                ],
+                socket_undo=[
+                    (bytes.fromhex(operator_id), prev_socket)
+                    for operator_id, prev_socket in json.loads(socket_undo)
+                ],
+            )
+            for from_block, to_block, to_block_hash, pubkey_undo, socket_undo in rows
+        ]
+
+    def save(
+        self,
+        operator_pubkeys: Dict[Address, Tuple[bytes, OperatorPubkeys]],
+        operator_sockets: Dict[bytes, str],
+        start_block_pub: int,
+        start_block_socket: int,
+        removed_operator_addrs: Iterable[Address] = (),
+        removed_socket_ids: Iterable[bytes] = (),
+        scanned_ranges: Optional[Iterable[_ScannedRange]] = None,
+    ) -> None:
+        # stores the registrations and socket updates of one scan and the next blocks to
+        # scan atomically, so a crash never leaves a checkpoint that skips events.
+        # the removed entries are those of registrations rolled back by a reorg.
+        # scanned_ranges, if given, replaces the stored undo data of the recent scans.
+        with closing(self.__connect()) as conn, conn:
+            if scanned_ranges is not None:
+                conn.execute("DELETE FROM scanned_ranges")
+                conn.executemany(
+                    "INSERT INTO scanned_ranges VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            scanned_range.from_block,
+                            scanned_range.to_block,
+                            bytes(scanned_range.to_block_hash),
+                            json.dumps(
+                                [
+                                    (
+                                        operator_addr,
+                                        _to_hex(prev_operator_id),
+                                        _pub_keys_to_hex(prev_pub_keys),
+                                        bytes(operator_id).hex(),
+                                    )
+                                    for operator_addr, prev_operator_id, prev_pub_keys, operator_id in (
+                                        scanned_range.pubkey_undo
+                                    )
+                                ]
+                            ),
+                            json.dumps(
+                                [
+                                    (bytes(operator_id).hex(), prev_socket)
+                                    for operator_id, prev_socket in (
+                                        scanned_range.socket_undo
+                                    )
+                                ]
+                            ),
+                        )
+                        for scanned_range in scanned_ranges
+                    ],
+                )
+            conn.executemany(
+                "DELETE FROM operator_pubkeys WHERE operator_addr = ?",
+                [(operator_addr,) for operator_addr in removed_operator_addrs],
+            )
+            conn.executemany(
+                "DELETE FROM operator_sockets WHERE operator_id = ?",
+                [(bytes(operator_id),) for operator_id in removed_socket_ids],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO operator_pubkeys VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        bytes(operator_id),
+                        operator_addr,
+                        g1_to_bytes(pub_keys.g1_pub_key, compressed=False),
+                        g2_to_bytes(pub_keys.g2_pub_key, compressed=False),
+                    )
+                    for operator_addr, (operator_id, pub_keys) in operator_pubkeys.items()
+                ],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO operator_sockets VALUES (?, ?)",
+                [
+                    (bytes(operator_id), socket)
+                    for operator_id, socket in operator_sockets.items()
+                ],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO scan_state VALUES (?, ?)",
+                [("pubkeys", start_block_pub), ("sockets", start_block_socket)],
+            )
+
+
+def _to_hex(data: Optional[bytes]) -> Optional[str]:
+    return None if data is None else bytes(data).hex()
+
+
+def _from_hex(data: Optional[str]) -> Optional[bytes]:
+    return None if data is None else bytes.fromhex(data)
+
+
+def _pub_keys_to_hex(pub_keys: Optional[OperatorPubkeys]) -> Optional[List[str]]:
+    if pub_keys is None:
+        return None
+    return [
+        g1_to_bytes(pub_keys.g1_pub_key, compressed=False).hex(),
+        g2_to_bytes(pub_keys.g2_pub_key, compressed=False).hex(),
+    ]
+
+
+def _pub_keys_from_hex(pub_keys: Optional[List[str]]) -> Optional[OperatorPubkeys]:
+    if pub_keys is None:
+        return None
+    return OperatorPubkeys(
+        g1_pub_key=G1Point.from_bytes(bytes.fromhex(pub_keys[0])),
+        g2_pub_key=G2Point.from_bytes(bytes.fromhex(pub_keys[1])),
+    )
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from eigensdk._types import OperatorPubkeys
+from eigensdk.crypto.bls.attestation import KeyPair
+from .operatorsinfo_checkpoint import OperatorsInfoCheckpoint
+
+
+class TestOperatorsInfoCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "operators.sqlite")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def pub_keys(self, key_pair: KeyPair) -> OperatorPubkeys:
+        return OperatorPubkeys(g1_pub_key=key_pair.pub_g1, g2_pub_key=key_pair.pub_g2)
+
+    def test_empty_checkpoint(self):
+        self.assertEqual(OperatorsInfoCheckpoint(self.path).load(), ({}, {}, {}, 0, 0))
+
+    def test_incremental_saves_are_reloaded(self):
+        """registrations of several scans should survive a restart"""
+
+        key_pairs = [KeyPair.from_string(f"{i:02x}") for i in range(1, 4)]
+        operator_ids = [bytes([i]) * 32 for i in range(1, 4)]
+        operator_addrs = [f"0x{i:040x}" for i in range(1, 4)]
+
+        checkpoint = OperatorsInfoCheckpoint(self.path)
+        checkpoint.save(
+            {operator_addrs[0]: (operator_ids[0], self.pub_keys(key_pairs[0]))},
+            {operator_ids[0]: "localhost:9000"},
+            100,
+            100,
+        )
+        checkpoint.save(
+            {
+                operator_addrs[i]: (operator_ids[i], self.pub_keys(key_pairs[i]))
+                for i in (1, 2)
+            },
+            {operator_ids[0]: "localhost:9001", operator_ids[2]: "localhost:9002"},
+            200,
+            210,
+        )
+
+        pubkey_dict, operator_addr_to_id, socket_dict, block_pub, block_socket = (
+            OperatorsInfoCheckpoint(self.path).load()
+        )
+        self.assertEqual((block_pub, block_socket), (200, 210))
+        self.assertEqual(operator_addr_to_id, dict(zip(operator_addrs, operator_ids)))
+        self.assertEqual(
+            socket_dict,
+            {operator_ids[0]: "localhost:9001", operator_ids[2]: "localhost:9002"},
+        )
+        for operator_id, key_pair in zip(operator_ids, key_pairs):
+            self.assertEqual(pubkey_dict[operator_id].g1_pub_key, key_pair.pub_g1)
+            self.assertEqual(pubkey_dict[operator_id].g2_pub_key, key_pair.pub_g2)
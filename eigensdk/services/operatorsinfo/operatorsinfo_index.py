@@ -0,0 +1,41 @@
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+
+from eth_typing import Address
+
+from eigensdk._types import OperatorInfo, OperatorPubkeys
+
+
+class OperatorsIndex:
+    # OperatorsIndex is an immutable snapshot of the operators indexed by
+    # OperatorsInfoServiceInMemory. The service never mutates a published snapshot, it
+    # builds a new one for every update and swaps it in with a single assignment, so
+    # readers take no lock and always see the complete result of one update.
+    # version is incremented by every update, readers can use it to cache derived data.
+    __slots__ = ("version", "pubkeys", "operator_ids", "sockets")
+
+    def __init__(
+        self,
+        pubkeys: Dict[bytes, OperatorPubkeys],
+        operator_ids: Dict[Address, bytes],
+        sockets: Dict[bytes, str],
+        version: int = 0,
+    ):
+        # the dicts are owned by the snapshot and must not be modified after this call
+        self.version: int = version
+        self.pubkeys: Mapping[bytes, OperatorPubkeys] = MappingProxyType(pubkeys)
+        self.operator_ids: Mapping[Address, bytes] = MappingProxyType(operator_ids)
+        self.sockets: Mapping[bytes, str] = MappingProxyType(sockets)
+
+    def get_operator_info(self, operator_addr: Address) -> Optional[OperatorInfo]:
+        operator_id = self.operator_ids.get(operator_addr)
+        if operator_id is None:
+            return None
+        return self.get_operator_info_by_id(operator_id)
+
+    def get_operator_info_by_id(self, operator_id: bytes) -> Optional[OperatorInfo]:
+        pub_keys = self.pubkeys.get(operator_id)
+        if pub_keys is None:
+            return None
+        # an operator can be registered before its first socket update is indexed
+        return OperatorInfo(socket=self.sockets.get(operator_id, ""), pub_keys=pub_keys)
@@ -1,15 +1,33 @@
+import json
 import logging
-import time
-from threading import Thread
-from typing import Any, Dict, Optional
+from collections import deque
+from threading import Event, Lock, Thread
+from typing import Any, Deque, List, Mapping, Optional, Union
 
 from eth_typing import Address
-from eth_utils.encoding import int_to_big_endian
 from web3 import Web3
+from websockets.sync.client import ClientConnection, connect
 
 from eigensdk._types import OperatorInfo, OperatorPubkeys
 from eigensdk.chainio.clients.avsregistry.reader import AvsRegistryReader
-from eigensdk.crypto.bls.attestation import G1Point
+from eigensdk.crypto.bls.attestation import G1Point, g1_to_bytes
+from eigensdk.services.operatorsinfo.operatorsinfo_checkpoint import (
+    OperatorsInfoCheckpoint,
+    _ScannedRange,
+)
+from eigensdk.services.operatorsinfo.operatorsinfo_index import OperatorsIndex
+
+# topics of the events the index is built from, subscribed to in push mode
+NEW_PUBKEY_REGISTRATION_TOPIC = Web3.to_hex(
+    Web3.keccak(
+        text="NewPubkeyRegistration(address,(uint256,uint256),(uint256[2],uint256[2]))"
+    )
+)
+OPERATOR_SOCKET_UPDATE_TOPIC = Web3.to_hex(
+    Web3.keccak(text="OperatorSocketUpdate(bytes32,string)")
+)
+# upper bound of the delay between websocket reconnection attempts, in seconds
+MAX_RECONNECT_DELAY = 30
 
 
 class OperatorsInfoServiceInMemory:
@@ -21,69 +39,368 @@ class OperatorsInfoServiceInMemory:
         check_interval: int = 10,
         log_filter_query_block_range: int = 10000,
         logger: Optional[logging.Logger] = None,
+        checkpoint_path: Optional[str] = None,
+        confirmations: int = 0,
+        reorg_window: int = 64,
+        eth_ws_url: Optional[str] = None,
     ):
         self.avs_registry_reader: AvsRegistryReader = avs_registry_reader
         self.start_block_pub: int = start_block_pub
         self.start_block_socket: int = start_block_socket
         self.check_interval: int = check_interval
         self.log_filter_query_block_range: int = log_filter_query_block_range
+        # blocks newer than head - confirmations are not indexed yet
+        self.confirmations: int = confirmations
+        # number of recent scans whose end block hash is checked to detect reorgs
+        self.reorg_window: int = reorg_window
+        self.scanned_ranges: Deque[_ScannedRange] = deque()
         self.logger: Optional[logging.Logger] = logger or logging.getLogger(__name__)
         self.eth_http_client: Any = self.avs_registry_reader.eth_http_client
+        # when set, the index is updated on eth_subscribe notifications instead of polling
+        self.eth_ws_url: Optional[str] = eth_ws_url
+
+        # readers only ever load self.index, which is replaced by a new snapshot after
+        # every update. _update_lock serializes the updaters, never the readers.
+        self.index: OperatorsIndex = OperatorsIndex({}, {}, {})
+        self._update_lock: Lock = Lock()
 
-        self.pubkey_dict: Dict[bytes, OperatorPubkeys] = {}
-        self.operator_addr_to_id: Dict[Address, bytes] = {}
-        self.socket_dict: Dict[bytes, str] = {}
+        # registrations indexed by a previous run are loaded from the checkpoint, so only
+        # the blocks produced since have to be scanned
+        self.checkpoint: Optional[OperatorsInfoCheckpoint] = None
+        if checkpoint_path:
+            self.checkpoint = OperatorsInfoCheckpoint(checkpoint_path)
+            (
+                pubkey_dict,
+                operator_addr_to_id,
+                socket_dict,
+                checkpoint_block_pub,
+                checkpoint_block_socket,
+            ) = self.checkpoint.load()
+            self.index = OperatorsIndex(pubkey_dict, operator_addr_to_id, socket_dict)
+            self.start_block_pub = max(self.start_block_pub, checkpoint_block_pub)
+            self.start_block_socket = max(
+                self.start_block_socket, checkpoint_block_socket
+            )
+            # scans of the previous run are still checked for reorgs
+            self.scanned_ranges.extend(
+                self.checkpoint.load_scanned_ranges()[-self.reorg_window :]
+            )
 
         # Start the service in a separate thread
         self.get_events()
-        self.thread = Thread(target=self._service_thread)
+        self._stop_event = Event()
+        self.thread = Thread(
+            target=(
+                self._subscription_thread if self.eth_ws_url else self._service_thread
+            )
+        )
         self.thread.start()
 
     @staticmethod
     def operator_id_from_g1_pubkey(g1: G1Point) -> bytes:
-        x_bytes = int_to_big_endian(int(g1.x.getStr()))
-        y_bytes = int_to_big_endian(int(g1.y.getStr()))
-        concatenated = x_bytes + y_bytes
-        return Web3.keccak(concatenated)
+        # keccak256(abi.encodePacked(x, y)), both coordinates padded to 32 bytes as in
+        # BN254.hashG1Point
+        return Web3.keccak(g1_to_bytes(g1, compressed=False))
+
+    # read-only views of the current snapshot
+    @property
+    def pubkey_dict(self) -> Mapping[bytes, OperatorPubkeys]:
+        return self.index.pubkeys
+
+    @property
+    def operator_addr_to_id(self) -> Mapping[Address, bytes]:
+        return self.index.operator_ids
+
+    @property
+    def socket_dict(self) -> Mapping[bytes, str]:
+        return self.index.sockets
 
     def _service_thread(self) -> None:
-        while True:
+        while not self._stop_event.wait(self.check_interval):
             try:
                 self.get_events()
             except Exception as e:
                 self.logger.error(f"Get event Error: {e}")
                 pass
-            time.sleep(self.check_interval)
+
+    def _subscription_thread(self) -> None:
+        # push mode: new heads and the registration logs are streamed over eth_subscribe, and
+        # the index is only updated by the usual incremental scan once a log was emitted.
+        # every (re)connection starts with a scan that fills the gap left while disconnected.
+        reconnect_delay = 1
+        while not self._stop_event.is_set():
+            try:
+                with connect(self.eth_ws_url) as ws:
+                    heads_subscription = self.__subscribe(ws, 1, ["newHeads"])
+                    logs_subscription = self.__subscribe(
+                        ws,
+                        2,
+                        [
+                            "logs",
+                            {
+                                "address": [
+                                    self.avs_registry_reader.bls_apk_registry_addr,
+                                    self.avs_registry_reader.registry_coordinator_addr,
+                                ],
+                                "topics": [
+                                    [
+                                        NEW_PUBKEY_REGISTRATION_TOPIC,
+                                        OPERATOR_SOCKET_UPDATE_TOPIC,
+                                    ]
+                                ],
+                            },
+                        ],
+                    )
+                    self.get_events()
+                    reconnect_delay = 1
+                    self.__process_notifications(
+                        ws, heads_subscription, logs_subscription
+                    )
+            except Exception as e:
+                self.logger.error(f"Subscription Error: {e}")
+            if self._stop_event.wait(reconnect_delay):
+                break
+            reconnect_delay = min(reconnect_delay * 2, MAX_RECONNECT_DELAY)
+
+    def __subscribe(self, ws: ClientConnection, request_id: int, params: list) -> str:
+        ws.send(
+            json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": "eth_subscribe",
+                    "params": params,
+                }
+            )
+        )
+        while True:
+            # notifications received before all subscriptions are set up are covered by
+            # the catch-up scan
+            message = json.loads(ws.recv(timeout=MAX_RECONNECT_DELAY))
+            if message.get("id") == request_id:
+                if "error" in message:
+                    raise Exception(f"eth_subscribe failed: {message['error']}")
+                return message["result"]
+
+    def __process_notifications(
+        self, ws: ClientConnection, heads_subscription: str, logs_subscription: str
+    ) -> None:
+        head = 0
+        # oldest block that may hold logs which are not indexed yet. Unconfirmed blocks
+        # skipped by the catch-up scan may have been produced before the logs subscription
+        # was set up, so they are scanned once confirmed.
+        pending_block = (
+            min(self.start_block_pub, self.start_block_socket)
+            if self.confirmations
+            else None
+        )
+        while not self._stop_event.is_set():
+            try:
+                message = json.loads(ws.recv(timeout=1))
+            except TimeoutError:
+                continue
+            params = message.get("params") or {}
+            result = params.get("result")
+            if message.get("method") != "eth_subscription" or result is None:
+                continue
+            if params.get("subscription") == heads_subscription:
+                head = max(head, int(result["number"], 16))
+            elif params.get("subscription") == logs_subscription:
+                # logs removed by a reorg are notified again with removed set, the scan
+                # they trigger rolls the index back
+                block_number = int(result["blockNumber"], 16)
+                head = max(head, block_number)
+                pending_block = (
+                    block_number
+                    if pending_block is None
+                    else min(pending_block, block_number)
+                )
+
+            if pending_block is not None and pending_block <= head - self.confirmations:
+                self.get_events()
+                if min(self.start_block_pub, self.start_block_socket) > pending_block:
+                    pending_block = None
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.thread.join()
 
     def get_events(self) -> None:
-        operator_addresses, operator_pubkeys, to_block_pub = (
+        with self._update_lock:
+            self.__update_index()
+
+    def __update_index(self) -> None:
+        # indexes [start_block, head - confirmations]. start_block_pub/socket are the next
+        # blocks to scan, so every block is scanned once unless it is reorged out.
+        self.__rollback_reorged_ranges()
+
+        to_block = self.eth_http_client.eth.block_number - self.confirmations
+        from_block = min(self.start_block_pub, self.start_block_socket)
+        if from_block > to_block:
+            return
+        # the hash is read before the logs: if a reorg happens in between, the next tick
+        # sees a different hash and scans the range again
+        to_block_hash = self.eth_http_client.eth.get_block(to_block)["hash"]
+
+        operator_addresses, operator_pubkeys, _ = (
             self.avs_registry_reader.query_existing_registered_operator_pubkeys(
-                start_block=self.start_block_pub
+                start_block=self.start_block_pub,
+                stop_block=to_block,
+                block_range=self.log_filter_query_block_range,
             )
         )
-        operator_sockets, to_block_socket = (
+        operator_sockets, _ = (
             self.avs_registry_reader.query_existing_registered_operator_sockets(
-                start_block=self.start_block_socket
+                start_block=self.start_block_socket,
+                stop_block=to_block,
+                block_range=self.log_filter_query_block_range,
             )
         )
 
-        for i, operator_addr in enumerate(operator_addresses):
-            operator_pubkeys = operator_pubkeys[i]
-            operator_id = self.operator_id_from_g1_pubkey(operator_pubkeys.g1_pub_key)
-            self.pubkey_dict[operator_id] = operator_pubkeys
-            self.operator_addr_to_id[operator_addr] = operator_id
+        scanned_range = _ScannedRange(
+            from_block=from_block, to_block=to_block, to_block_hash=to_block_hash
+        )
+        new_operator_pubkeys = {}
+        if operator_addresses or operator_sockets:
+            # copy on write: the published snapshot is left untouched for its readers
+            index = self.index
+            pubkey_dict = dict(index.pubkeys)
+            operator_addr_to_id = dict(index.operator_ids)
+            socket_dict = dict(index.sockets)
+            for operator_addr, pub_keys in zip(operator_addresses, operator_pubkeys):
+                operator_id = self.operator_id_from_g1_pubkey(pub_keys.g1_pub_key)
+                scanned_range.pubkey_undo.append(
+                    (
+                        operator_addr,
+                        operator_addr_to_id.get(operator_addr),
+                        pubkey_dict.get(operator_id),
+                        operator_id,
+                    )
+                )
+                pubkey_dict[operator_id] = pub_keys
+                operator_addr_to_id[operator_addr] = operator_id
+                new_operator_pubkeys[operator_addr] = (operator_id, pub_keys)
+
+            for operator_id, socket in operator_sockets.items():
+                scanned_range.socket_undo.append(
+                    (operator_id, socket_dict.get(operator_id))
+                )
+                socket_dict[operator_id] = socket
+            self.index = OperatorsIndex(
+                pubkey_dict, operator_addr_to_id, socket_dict, version=index.version + 1
+            )
+        self.logger.debug(
+            f"Indexed {len(new_operator_pubkeys)} operator registrations and {len(operator_sockets)} socket updates up to block {to_block}"
+        )
+
+        self.start_block_pub = max(self.start_block_pub, to_block + 1)
+        self.start_block_socket = max(self.start_block_socket, to_block + 1)
+        self.scanned_ranges.append(scanned_range)
+        while len(self.scanned_ranges) > self.reorg_window:
+            self.scanned_ranges.popleft()
+
+        if self.checkpoint is not None:
+            self.checkpoint.save(
+                new_operator_pubkeys,
+                operator_sockets,
+                self.start_block_pub,
+                self.start_block_socket,
+                scanned_ranges=self.scanned_ranges,
+            )
+
+    def __rollback_reorged_ranges(self) -> None:
+        # undoes the scans whose end block is no longer part of the canonical chain,
+        # newest first, until a scan whose end block hash still matches
+        reorged_ranges: List[_ScannedRange] = []
+        while self.scanned_ranges:
+            scanned_range = self.scanned_ranges[-1]
+            block_hash = self.eth_http_client.eth.get_block(scanned_range.to_block)[
+                "hash"
+            ]
+            if block_hash == scanned_range.to_block_hash:
+                break
+            reorged_ranges.append(self.scanned_ranges.pop())
+        if not reorged_ranges:
+            return
+        if not self.scanned_ranges:
+            self.logger.warning(
+                f"Reorg deeper than the last {self.reorg_window} scans, events before block {reorged_ranges[-1].from_block} are kept"
+            )
+
+        index = self.index
+        pubkey_dict = dict(index.pubkeys)
+        operator_addr_to_id = dict(index.operator_ids)
+        socket_dict = dict(index.sockets)
+        removed_operator_addrs = set()
+        restored_operator_pubkeys = {}
+        removed_socket_ids = set()
+        restored_sockets = {}
+        for scanned_range in reorged_ranges:
+            for operator_addr, prev_operator_id, prev_pub_keys, operator_id in reversed(
+                scanned_range.pubkey_undo
+            ):
+                if prev_pub_keys is None:
+                    pubkey_dict.pop(operator_id, None)
+                else:
+                    pubkey_dict[operator_id] = prev_pub_keys
+                if prev_operator_id is None:
+                    operator_addr_to_id.pop(operator_addr, None)
+                    removed_operator_addrs.add(operator_addr)
+                    restored_operator_pubkeys.pop(operator_addr, None)
+                else:
+                    operator_addr_to_id[operator_addr] = prev_operator_id
+                    removed_operator_addrs.discard(operator_addr)
+                    restored_operator_pubkeys[operator_addr] = (
+                        prev_operator_id,
+                        pubkey_dict[prev_operator_id],
+                    )
+            for operator_id, prev_socket in reversed(scanned_range.socket_undo):
+                if prev_socket is None:
+                    socket_dict.pop(operator_id, None)
+                    removed_socket_ids.add(operator_id)
+                    restored_sockets.pop(operator_id, None)
+                else:
+                    socket_dict[operator_id] = prev_socket
+                    removed_socket_ids.discard(operator_id)
+                    restored_sockets[operator_id] = prev_socket
 
-        self.socket_dict.update(operator_sockets)
-        self.logger.debug(f"Queried operator registration events: {operator_pubkeys}")
+        self.index = OperatorsIndex(
+            pubkey_dict, operator_addr_to_id, socket_dict, version=index.version + 1
+        )
+
+        fork_block = reorged_ranges[-1].from_block
+        self.start_block_pub = min(self.start_block_pub, fork_block)
+        self.start_block_socket = min(self.start_block_socket, fork_block)
+        self.logger.warning(f"Reorg detected, operator index rolled back to block {fork_block}")
 
-        self.start_block_pub = to_block_pub
-        self.start_block_socket = to_block_socket
+        if self.checkpoint is not None:
+            self.checkpoint.save(
+                restored_operator_pubkeys,
+                restored_sockets,
+                self.start_block_pub,
+                self.start_block_socket,
+                removed_operator_addrs=removed_operator_addrs,
+                removed_socket_ids=removed_socket_ids,
+                scanned_ranges=self.scanned_ranges,
+            )
 
     def get_operator_info(self, operator_addr: Address) -> OperatorInfo:
-        operator_id = self.operator_addr_to_id.get(operator_addr)
-        if not operator_id:
+        operator_info = self.index.get_operator_info(operator_addr)
+        if operator_info is None:
             raise Exception("Not found")
-        return OperatorInfo(
-            socket=self.socket_dict[operator_id],
-            pub_keys=self.pubkey_dict[operator_id],
-        )
+        return operator_info
+
+    def get_operator_info_by_id(self, operator_id: Union[bytes, str]) -> OperatorInfo:
+        # the avs registry reader reports operator ids as 0x prefixed hex strings
+        if isinstance(operator_id, str):
+            operator_id = bytes.fromhex(
+                operator_id[2:] if operator_id.startswith("0x") else operator_id
+            )
+        operator_info = self.index.get_operator_info_by_id(operator_id)
+        if operator_info is None:
+            raise Exception("Not found")
+        return operator_info
+
+    def get_operator_info_by_pubkey(self, g1_pub_key: G1Point) -> OperatorInfo:
+        # the operator id is the hash of the G1 pubkey, no separate map is needed
+        return self.get_operator_info_by_id(self.operator_id_from_g1_pubkey(g1_pub_key))
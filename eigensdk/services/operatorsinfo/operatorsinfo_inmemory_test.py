@@ -0,0 +1,316 @@
+import json
+import os
+import queue
+import tempfile
+import time
+import unittest
+from threading import Thread
+from web3 import Web3
+from websockets.sync.server import serve
+from eigensdk._types import OperatorPubkeys
+from eigensdk.crypto.bls.attestation import KeyPair
+from .operatorsinfo_inmemory import OperatorsInfoServiceInMemory
+
+
+class FakeChain:
+    # block hashes and registration events of a chain that can be reorganized
+    def __init__(self, head: int) -> None:
+        self.head = head
+        self.fork = 0
+        self.registrations = {}  # block number -> [(operator address, pubkeys)]
+        self.sockets = {}  # block number -> {operator id: socket}
+
+    def reorg(self, from_block: int) -> None:
+        self.fork += 1
+        self.reorged_from = from_block
+        for events in (self.registrations, self.sockets):
+            for block_number in [b for b in events if b >= from_block]:
+                del events[block_number]
+
+    def block_hash(self, block_number: int) -> bytes:
+        fork = self.fork if block_number >= getattr(self, "reorged_from", 0) else 0
+        return f"{fork}-{block_number}".encode()
+
+
+class FakeEth:
+    def __init__(self, chain: FakeChain) -> None:
+        self.chain = chain
+
+    @property
+    def block_number(self) -> int:
+        return self.chain.head
+
+    def get_block(self, block_number: int) -> dict:
+        return {"hash": self.chain.block_hash(block_number)}
+
+
+class FakeEthClient:
+    def __init__(self, chain: FakeChain) -> None:
+        self.eth = FakeEth(chain)
+
+
+class FakeAvsRegistryReader:
+    def __init__(self, chain: FakeChain) -> None:
+        self.chain = chain
+        self.eth_http_client = FakeEthClient(chain)
+        self.bls_apk_registry_addr = "0x00000000000000000000000000000000000000b1"
+        self.registry_coordinator_addr = "0x00000000000000000000000000000000000000c1"
+        self.pubkey_queries = []
+
+    def query_existing_registered_operator_pubkeys(
+        self, start_block=0, stop_block=None, block_range=10_000
+    ):
+        self.pubkey_queries.append((start_block, stop_block))
+        events = [
+            event
+            for block_number in sorted(self.chain.registrations)
+            if start_block <= block_number <= stop_block
+            for event in self.chain.registrations[block_number]
+        ]
+        return [e[0] for e in events], [e[1] for e in events], stop_block
+
+    def query_existing_registered_operator_sockets(
+        self, start_block=0, stop_block=None, block_range=10_000
+    ):
+        sockets = {}
+        for block_number in sorted(self.chain.sockets):
+            if start_block <= block_number <= stop_block:
+                sockets.update(self.chain.sockets[block_number])
+        return sockets, stop_block
+
+
+class EthSubscribeStandIn:
+    # local websocket server answering eth_subscribe, the test pushes notifications to the
+    # connected clients
+    def __init__(self) -> None:
+        self.connections = queue.Queue()
+        self.server = serve(self.handler, "127.0.0.1", 0)
+        self.url = f"ws://127.0.0.1:{self.server.socket.getsockname()[1]}"
+        self.thread = Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def handler(self, ws) -> None:
+        subscriptions = {}
+        for message in ws:
+            request = json.loads(message)
+            subscriptions[request["params"][0]] = hex(len(subscriptions) + 1)
+            ws.send(
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": request["id"],
+                        "result": subscriptions[request["params"][0]],
+                    }
+                )
+            )
+            if len(subscriptions) == 2:
+                self.connections.put((ws, subscriptions))
+
+    def notify(self, connection, kind: str, result: dict) -> None:
+        ws, subscriptions = connection
+        ws.send(
+            json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "eth_subscription",
+                    "params": {"subscription": subscriptions[kind], "result": result},
+                }
+            )
+        )
+
+    def shutdown(self) -> None:
+        self.server.shutdown()
+        self.thread.join()
+
+
+def wait_until(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def pub_keys(key_pair: KeyPair) -> OperatorPubkeys:
+    return OperatorPubkeys(g1_pub_key=key_pair.pub_g1, g2_pub_key=key_pair.pub_g2)
+
+
+class TestIncrementalIndexing(unittest.TestCase):
+    def setUp(self):
+        self.key_pairs = [KeyPair.from_string(f"{i:02x}") for i in range(1, 5)]
+        self.addrs = [f"0x{i:040x}" for i in range(1, 5)]
+        self.chain = FakeChain(head=20)
+        # two registrations in one scan
+        self.chain.registrations[3] = [(self.addrs[0], pub_keys(self.key_pairs[0]))]
+        self.chain.registrations[8] = [
+            (self.addrs[1], pub_keys(self.key_pairs[1])),
+            (self.addrs[2], pub_keys(self.key_pairs[2])),
+        ]
+        self.reader = FakeAvsRegistryReader(self.chain)
+        self.service = OperatorsInfoServiceInMemory(
+            self.reader, check_interval=3600, confirmations=5
+        )
+        self.addCleanup(self.service.stop)
+
+    def operator_id(self, i: int) -> bytes:
+        return self.service.operator_id_from_g1_pubkey(self.key_pairs[i].pub_g1)
+
+    def test_blocks_are_scanned_once(self):
+        self.chain.head = 30
+        self.service.get_events()
+        self.service.get_events()
+
+        self.assertEqual(self.reader.pubkey_queries, [(0, 15), (16, 25)])
+        self.assertEqual(len(self.service.operator_addr_to_id), 3)
+        for i in range(3):
+            self.assertEqual(
+                self.service.operator_addr_to_id[self.addrs[i]], self.operator_id(i)
+            )
+
+    def test_reorg_is_rolled_back(self):
+        """registrations of reorged blocks should be removed and the blocks scanned again"""
+
+        self.chain.head = 30
+        self.chain.registrations[20] = [(self.addrs[3], pub_keys(self.key_pairs[3]))]
+        self.chain.sockets[20] = {self.operator_id(0): "localhost:9000"}
+        self.service.get_events()
+        self.assertIn(self.addrs[3], self.service.operator_addr_to_id)
+        self.assertEqual(self.service.socket_dict[self.operator_id(0)], "localhost:9000")
+
+        self.chain.reorg(from_block=18)
+        self.chain.sockets[19] = {self.operator_id(0): "localhost:9001"}
+        self.service.get_events()
+
+        self.assertNotIn(self.addrs[3], self.service.operator_addr_to_id)
+        self.assertNotIn(self.operator_id(3), self.service.pubkey_dict)
+        self.assertEqual(self.service.socket_dict[self.operator_id(0)], "localhost:9001")
+        self.assertEqual(self.reader.pubkey_queries[-1], (16, 25))
+        self.assertEqual(len(self.service.operator_addr_to_id), 3)
+
+    def test_reorg_after_restart_is_rolled_back(self):
+        """blocks indexed before a restart should be rolled back if they are reorged out"""
+
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        path = os.path.join(tmp_dir.name, "operators.sqlite")
+        service = OperatorsInfoServiceInMemory(
+            self.reader, check_interval=3600, confirmations=5, checkpoint_path=path
+        )
+        self.chain.head = 30
+        self.chain.registrations[20] = [(self.addrs[3], pub_keys(self.key_pairs[3]))]
+        service.get_events()
+        service.stop()
+        self.assertIn(self.addrs[3], service.operator_addr_to_id)
+
+        self.chain.reorg(from_block=18)
+        restarted = OperatorsInfoServiceInMemory(
+            self.reader, check_interval=3600, confirmations=5, checkpoint_path=path
+        )
+        self.addCleanup(restarted.stop)
+
+        self.assertNotIn(self.addrs[3], restarted.operator_addr_to_id)
+        self.assertNotIn(self.operator_id(3), restarted.pubkey_dict)
+        self.assertEqual(len(restarted.operator_addr_to_id), 3)
+        self.assertEqual(self.reader.pubkey_queries[-1], (16, 25))
+
+    def test_updates_publish_new_snapshots(self):
+        """readers holding a snapshot should not see later updates"""
+
+        snapshot = self.service.index
+        self.chain.head = 30
+        self.chain.registrations[20] = [(self.addrs[3], pub_keys(self.key_pairs[3]))]
+        self.chain.sockets[20] = {self.operator_id(3): "localhost:9003"}
+        self.service.get_events()
+
+        self.assertEqual(len(snapshot.operator_ids), 3)
+        self.assertIsNone(snapshot.get_operator_info(self.addrs[3]))
+        self.assertEqual(self.service.index.version, snapshot.version + 1)
+        info = self.service.get_operator_info_by_pubkey(self.key_pairs[3].pub_g1)
+        self.assertEqual(info.socket, "localhost:9003")
+        self.assertEqual(info, self.service.get_operator_info(self.addrs[3]))
+        self.assertEqual(info, self.service.get_operator_info_by_id(self.operator_id(3)))
+
+        # scans without events keep the snapshot
+        snapshot = self.service.index
+        self.chain.head = 40
+        self.service.get_events()
+        self.assertIs(self.service.index, snapshot)
+
+    def test_operator_without_socket_update(self):
+        self.chain.head = 30
+        self.chain.registrations[20] = [(self.addrs[3], pub_keys(self.key_pairs[3]))]
+        self.service.get_events()
+
+        info = self.service.get_operator_info(self.addrs[3])
+        self.assertEqual(info.socket, "")
+        self.assertEqual(info, self.service.get_operator_info_by_id(self.operator_id(3)))
+
+    def test_operator_id_is_hash_of_padded_coordinates(self):
+        g1 = self.key_pairs[0].pub_g1
+        self.assertEqual(
+            self.service.operator_id_from_g1_pubkey(g1),
+            Web3.keccak(
+                int(g1.x.getStr()).to_bytes(32, "big")
+                + int(g1.y.getStr()).to_bytes(32, "big")
+            ),
+        )
+
+
+class TestSubscriptionMode(unittest.TestCase):
+    def setUp(self):
+        self.key_pairs = [KeyPair.from_string(f"{i:02x}") for i in range(1, 5)]
+        self.addrs = [f"0x{i:040x}" for i in range(1, 5)]
+        self.chain = FakeChain(head=20)
+        self.chain.registrations[3] = [(self.addrs[0], pub_keys(self.key_pairs[0]))]
+        self.reader = FakeAvsRegistryReader(self.chain)
+        self.node = EthSubscribeStandIn()
+        self.addCleanup(self.node.shutdown)
+        self.service = OperatorsInfoServiceInMemory(
+            self.reader, check_interval=3600, eth_ws_url=self.node.url
+        )
+        self.addCleanup(self.service.stop)
+        self.connection = self.node.connections.get(timeout=5)
+
+    def emit_registration(self, block_number: int, i: int) -> None:
+        self.chain.registrations[block_number] = [
+            (self.addrs[i], pub_keys(self.key_pairs[i]))
+        ]
+        operator_id = self.service.operator_id_from_g1_pubkey(self.key_pairs[i].pub_g1)
+        self.chain.sockets[block_number] = {operator_id: f"localhost:{9000 + i}"}
+        self.chain.head = block_number
+        self.node.notify(self.connection, "logs", {"blockNumber": hex(block_number)})
+
+    def test_logs_are_indexed_when_pushed(self):
+        self.emit_registration(21, 1)
+        self.assertTrue(
+            wait_until(lambda: self.addrs[1] in self.service.operator_addr_to_id)
+        )
+        queries = len(self.reader.pubkey_queries)
+
+        # new heads without registration logs do not cause any scan
+        for block_number in (22, 23):
+            self.chain.head = block_number
+            self.node.notify(self.connection, "newHeads", {"number": hex(block_number)})
+        self.emit_registration(24, 2)
+        self.assertTrue(
+            wait_until(lambda: len(self.service.socket_dict) == 2)
+        )
+        self.assertEqual(self.reader.pubkey_queries[queries:], [(22, 24)])
+        info = self.service.get_operator_info(self.addrs[2])
+        self.assertEqual(info.socket, "localhost:9002")
+        self.assertEqual(info.pub_keys.g1_pub_key, self.key_pairs[2].pub_g1)
+
+    def test_gap_is_filled_on_reconnect(self):
+        """registrations emitted while disconnected should be indexed after reconnecting"""
+
+        ws, _ = self.connection
+        ws.close()
+        self.chain.registrations[25] = [(self.addrs[3], pub_keys(self.key_pairs[3]))]
+        self.chain.head = 25
+
+        self.connection = self.node.connections.get(timeout=5)
+        self.assertTrue(
+            wait_until(lambda: self.addrs[3] in self.service.operator_addr_to_id)
+        )
+        self.assertIn(self.addrs[0], self.service.operator_addr_to_id)
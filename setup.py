@@ -7,6 +7,8 @@ setup(
     install_requires=[
         "mcl @ git+https://github.com/sadeghte/mcl-python.git",
         "web3",
+        "requests",
+        "websockets",
         "python-dotenv==1.0.1",
         "fastapi",
         "pydantic",